@@ -0,0 +1,88 @@
+# backend/app/config.py
+from pathlib import Path
+from typing import Optional
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+BASE_DIR = Path(__file__).parent.parent
+
+
+class Settings(BaseSettings):
+    """Application settings read from the environment and backend/.env"""
+    model_config = SettingsConfigDict(
+        env_file=BASE_DIR / ".env",
+        env_file_encoding="utf-8",
+        extra="ignore"
+    )
+
+    # Storage
+    database_type: str = "json"
+    database_url: Optional[str] = None
+    data_dir: Path = BASE_DIR / "data"
+    report_log_compact_every: int = 1000
+    db_io_workers: int = 8
+    # How often JSON files are stat()ed for edits made outside the app
+    file_check_interval_ms: int = 1000
+    # Serve JSON catalogs from binary snapshots (see app/storage/snapshot.py)
+    catalog_snapshots: bool = True
+
+    # Report ingestion: write-ahead log plus group commit
+    report_wal_enabled: bool = True
+    report_commit_interval_ms: int = 50
+    report_commit_batch_size: int = 500
+
+    # Bulk catalog uploads (disabled unless an admin key is set)
+    admin_api_key: Optional[str] = None
+    bulk_batch_size: int = 50000
+    # The JSON store rewrites its file once per group of batches; a group
+    # ends at this many rows or this long after its first batch arrived
+    bulk_json_commit_rows: int = 500000
+    bulk_json_commit_interval_s: float = 10.0
+
+    # Medicine verification: serve results prepared once per catalog
+    # version (about 150 bytes per medicine) instead of per scan
+    verify_payloads: bool = True
+
+    # Identical concurrent verify and nearby requests share one computation
+    single_flight_enabled: bool = True
+    # Most coalesced keys exported on /metrics
+    single_flight_top_keys: int = 10
+
+    # Batch-code Bloom filter
+    bloom_error_rate: float = 0.001
+
+    # Spatial index
+    pharmacy_grid_cell_deg: float = 0.05
+
+    # Nearby-search candidate cache
+    nearby_cache_enabled: bool = True
+    nearby_cache_size: int = 1024
+    nearby_cache_ttl_s: float = 300.0
+    nearby_cache_cell_deg: float = 0.01
+    nearby_cache_radius_step_km: float = 1.0
+
+    # Observability
+    metrics_enabled: bool = True
+
+    # Logging
+    log_level: str = "INFO"
+    log_async: bool = True
+    log_queue_size: int = 10000
+    log_batch_size: int = 256
+    log_flush_interval_ms: int = 200
+    log_info_sample_rate: float = 1.0
+
+    @property
+    def sqlite_path(self) -> Path:
+        """Resolve the SQLite database file from DATABASE_URL"""
+        url = self.database_url or ""
+        if not url.startswith("sqlite:///"):
+            return self.data_dir / "medicines.db"
+
+        path = Path(url[len("sqlite:///"):])
+        if not path.is_absolute():
+            path = BASE_DIR / path
+        return path
+
+
+settings = Settings()
@@ -1,118 +1,587 @@
 # backend/app/database.py
-import json
-import os
+import asyncio
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Callable, Iterable, Sequence, Tuple, Hashable, Union
 import uuid
 
+from app.config import settings
+from app.models import REPORT_STATUSES
+from app.storage.base import StorageBackend, UpsertResult, normalize_batch_code
+from app.storage.json_store import JSONStorage
+from app.storage.records import RECORD_CODECS, MedicineTable
+from app.storage.report_wal import ReportIngestor
+from app.storage.sqlite_store import SQLiteStorage
+from app.utils.distance import PharmacyCoordinates, find_nearest_pharmacies
+from app.utils.bloom import BloomFilter
+from app.utils.bulk_ingest import BulkIngestStats, parse_upload
+from app.utils.fast_json import dumps
+from app.utils.http_cache import CachedBody, serialize_ndjson, serialize_records
+from app.utils.metrics import metrics
+from app.utils.nearby_cache import CachedGridIndex, NearbyCache
+from app.utils.search import MedicineSearchIndex
+from app.utils.single_flight import SingleFlight
+from app.utils.spatial import GridIndex
+from app.utils.verify_payloads import Prepared, VerifyPayloads, prepare, today_ordinal, verify_response
+
+logger = logging.getLogger(__name__)
+
+def create_storage(database_type: str) -> StorageBackend:
+    """Create the storage backend selected by DATABASE_TYPE"""
+    database_type = database_type.lower()
+    if database_type == "json":
+        return JSONStorage(
+            settings.data_dir,
+            report_compact_every=settings.report_log_compact_every,
+            check_interval=settings.file_check_interval_ms / 1000,
+            use_snapshots=settings.catalog_snapshots,
+            bulk_commit_rows=settings.bulk_json_commit_rows,
+            bulk_commit_interval=settings.bulk_json_commit_interval_s
+        )
+    if database_type == "sqlite":
+        return SQLiteStorage(settings.sqlite_path, import_from=settings.data_dir)
+    raise ValueError(f"Unsupported DATABASE_TYPE: {database_type}")
+
+
 class Database:
-    def __init__(self):
-        # Set up data directory
-        self.base_dir = Path(__file__).parent.parent
-        self.data_dir = self.base_dir / "data"
-        self.data_dir.mkdir(exist_ok=True)
+    def __init__(self, storage: Optional[StorageBackend] = None):
+        self.storage = storage or create_storage(settings.database_type)
+
+        # New reports are acknowledged from the write-ahead log and
+        # group-committed to storage in the background
+        self.report_ingestor: Optional[ReportIngestor] = None
+        if settings.report_wal_enabled:
+            self.report_ingestor = ReportIngestor(
+                self.storage,
+                settings.data_dir / "reports.wal",
+                commit_interval=settings.report_commit_interval_ms / 1000,
+                commit_batch_size=settings.report_commit_batch_size
+            )
+            metrics.register_collector(self._report_ingest_metrics)
         
-        # Define data files
-        self.medicines_file = self.data_dir / "medicines.json"
-        self.pharmacies_file = self.data_dir / "pharmacies.json"
-        self.reports_file = self.data_dir / "reports.json"
+        # Candidate sets of recent nearby searches, flushed when the
+        # pharmacy index is rebuilt
+        self.nearby_cache: Optional[NearbyCache] = None
+        if settings.nearby_cache_enabled:
+            self.nearby_cache = NearbyCache(
+                capacity=settings.nearby_cache_size,
+                ttl=settings.nearby_cache_ttl_s,
+                cell_deg=settings.nearby_cache_cell_deg,
+                radius_step_km=settings.nearby_cache_radius_step_km
+            )
+            metrics.register_collector(self.nearby_cache.collect)
         
-        # Initialize files if they don't exist
-        self._initialize_files()
-    
-    def _initialize_files(self):
-        """Initialize JSON files with empty arrays if they don't exist"""
-        if not self.medicines_file.exists():
-            self._write_json(self.medicines_file, [])
-        if not self.pharmacies_file.exists():
-            self._write_json(self.pharmacies_file, [])
-        if not self.reports_file.exists():
-            self._write_json(self.reports_file, [])
-    
-    def _read_json(self, filepath: Path) -> List[Dict[str, Any]]:
-        """Read JSON file and return data"""
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
-            return []
-    
-    def _write_json(self, filepath: Path, data: List[Dict[str, Any]]):
-        """Write data to JSON file"""
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-    
+        self.bulk_stats = BulkIngestStats()
+        metrics.register_collector(self.bulk_stats.collect)
+        
+        # Structures derived from a dataset, keyed by name and tagged with
+        # the dataset version they were built from
+        self._derived_lock = threading.Lock()
+        self._derived: Dict[str, Tuple[Hashable, Any]] = {}
+
+    normalize_batch_code = staticmethod(normalize_batch_code)
+
+    def dataset_version(self, dataset: str) -> Hashable:
+        """Version token that changes whenever the dataset changes"""
+        if dataset == "reports":
+            self.flush_reports()
+        return self.storage.dataset_version(dataset)
+
+    def _get_derived(self, name: str, dataset: str, build: Callable[[], Any]) -> Any:
+        """Return a cached structure built from a dataset, rebuilding it when the dataset changes"""
+        version = self.dataset_version(dataset)
+        cached = self._derived.get(name)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        with self._derived_lock:
+            cached = self._derived.get(name)
+            if cached is not None and cached[0] == version:
+                return cached[1]
+            value = build()
+            self._derived[name] = (version, value)
+            return value
+
+    def get_listing(self, dataset: str) -> CachedBody:
+        """Serialized body and ETag of a full dataset listing, rebuilt only when the dataset changes"""
+        loaders = {
+            "medicines": self.get_all_medicines,
+            "pharmacies": self.get_all_pharmacies,
+            "reports": self.get_all_reports
+        }
+        return self._get_derived(
+            f"listing:{dataset}",
+            dataset,
+            lambda: serialize_records(loaders[dataset](), RECORD_CODECS[dataset])
+        )
+
+    def _read_page(self, dataset: str, position: int, limit: int) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        if dataset == "reports":
+            self.flush_reports()
+        return self.storage.get_page(dataset, position, limit)
+
+    def get_page(self, dataset: str, position: int, limit: int) -> Tuple[CachedBody, Optional[int]]:
+        """One page of a dataset as a serialized JSON array, and the position of the next page"""
+        records, next_position = self._read_page(dataset, position, limit)
+        return serialize_records(records, RECORD_CODECS[dataset]), next_position
+
+    def get_ndjson_page(self, dataset: str, position: int, limit: int) -> Tuple[bytes, Optional[int]]:
+        """One page of a dataset as NDJSON lines, and the position of the next page"""
+        records, next_position = self._read_page(dataset, position, limit)
+        return serialize_ndjson(records, RECORD_CODECS[dataset]), next_position
+
     # Medicine operations
-    def get_all_medicines(self) -> List[Dict[str, Any]]:
+    def get_all_medicines(self) -> Sequence[Dict[str, Any]]:
         """Get all medicines"""
-        return self._read_json(self.medicines_file)
-    
+        return self.storage.get_all_medicines()
+
+    def _bloom_source_tag(self) -> str:
+        # Tagged with the codes themselves: a dataset version restarts for a
+        # new database or data directory, and a filter built for other codes
+        # would report real medicines as unknown
+        return f"codes:{self.storage.batch_code_digest()}"
+
+    def _build_batch_code_filter(self) -> BloomFilter:
+        """Load the persisted batch-code filter if it matches the catalog, else rebuild and save it"""
+        # Tag before reading the codes: codes are never removed, so a write
+        # in between can only add codes the tag does not cover
+        source_tag = self._bloom_source_tag()
+        bloom_file = settings.data_dir / "medicines.bloom"
+
+        bloom = BloomFilter.load(bloom_file, source_tag)
+        if bloom is not None and bloom.error_rate == settings.bloom_error_rate:
+            return bloom
+
+        batch_codes = MedicineTable.from_records(self.get_all_medicines()).batch_code
+        bloom = BloomFilter.from_items(
+            (normalize_batch_code(batch_code) for batch_code in batch_codes),
+            capacity=max(1000, int(len(batch_codes) * 1.25)),
+            error_rate=settings.bloom_error_rate
+        )
+        bloom.save(bloom_file, source_tag)
+        return bloom
+
+    def get_batch_code_filter(self) -> BloomFilter:
+        """Bloom filter over all known batch codes"""
+        return self._get_derived("batch_code_filter", "medicines", self._build_batch_code_filter)
+
+    def might_contain_batch_code(self, batch_code: str) -> bool:
+        """False means the batch code is definitely not in the catalog"""
+        return normalize_batch_code(batch_code) in self.get_batch_code_filter()
+
+    def get_batch_code_filter_stats(self) -> Dict[str, Any]:
+        """Size and false-positive rate of the batch-code filter"""
+        return self.get_batch_code_filter().stats()
+
     def find_medicine_by_batch_code(self, batch_code: str) -> Optional[Dict[str, Any]]:
         """Find medicine by batch code"""
-        medicines = self.get_all_medicines()
-        for medicine in medicines:
-            if medicine['batch_code'].upper() == batch_code.upper():
-                return medicine
-        return None
-    
+        # Unknown codes are answered by the filter without touching the store
+        if not self.might_contain_batch_code(batch_code):
+            return None
+        return self.storage.find_medicine_by_batch_code(batch_code)
+
+    def find_medicines_by_batch_codes(self, batch_codes: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """Find medicines for many batch codes in one pass, aligned with the input"""
+        bloom = self.get_batch_code_filter()
+        candidates = [code for code in batch_codes if normalize_batch_code(code) in bloom]
+        found = dict(zip(candidates, self.storage.find_medicines_by_batch_codes(candidates)))
+        return [found.get(code) for code in batch_codes]
+
+    # Medicine verification
+    def get_verify_payloads(self) -> VerifyPayloads:
+        """Prepared verification data of every medicine, rebuilt when the catalog changes"""
+        return self._get_derived(
+            "verify_payloads",
+            "medicines",
+            lambda: VerifyPayloads(*self.storage.get_medicines_with_index())
+        )
+
+    def _prepare_verifications(self, batch_codes: List[str]) -> List[Optional[Prepared]]:
+        if settings.verify_payloads:
+            # Unknown codes are answered by the filter, as in find_medicines_by_batch_codes
+            bloom = self.get_batch_code_filter()
+            candidates = [code for code in batch_codes if normalize_batch_code(code) in bloom]
+            found = dict(zip(candidates, self.get_verify_payloads().find_many(candidates)))
+            return [found.get(code) for code in batch_codes]
+        medicines = self.find_medicines_by_batch_codes(batch_codes)
+        return [prepare(medicine) if medicine else None for medicine in medicines]
+
+    def verify_batch_code(self, batch_code: str) -> Tuple[bool, bytes]:
+        """Whether a batch code is known, and its MedicineVerifyResponse body"""
+        if settings.verify_payloads:
+            prepared = None
+            if self.might_contain_batch_code(batch_code):
+                prepared = self.get_verify_payloads().find(batch_code)
+        else:
+            medicine = self.find_medicine_by_batch_code(batch_code)
+            prepared = prepare(medicine) if medicine else None
+        return prepared is not None, verify_response(batch_code, prepared, today_ordinal())
+
+    def verify_batch_codes(self, batch_codes: List[str]) -> Tuple[int, List[bytes]]:
+        """Number of known codes, and a MedicineVerifyResponse body per code in input order"""
+        prepared = self._prepare_verifications(batch_codes)
+        today = today_ordinal()
+        with metrics.span("serialize"):
+            results = [verify_response(code, item, today) for code, item in zip(batch_codes, prepared)]
+        return sum(item is not None for item in prepared), results
+
+    # Bulk catalog ingestion
+    def bulk_upsert(self, dataset: str, chunks: Iterable[bytes], fmt: str) -> Dict[str, Any]:
+        """
+        Stream an NDJSON or CSV upload of medicines or pharmacies into storage
+
+        Rows are parsed as the chunks arrive and validated in batches of
+        BULK_BATCH_SIZE, so memory use is bounded by the batch size. Invalid
+        rows are skipped and counted. Returns the upload's summary.
+        """
+        codec = RECORD_CODECS[dataset]
+        job = self.bulk_stats.start(dataset, fmt)
+
+        def validated(records: List[Dict[str, Any]], lines: List[int]) -> List[Dict[str, Any]]:
+            valid, invalid = codec.check(records)
+            for position, error in invalid.items():
+                job.reject(lines[position], error)
+            return valid
+
+        def batches():
+            records, lines = [], []
+            for line, record, error in parse_upload(chunks, fmt, dataset):
+                if error is not None:
+                    job.reject(line, error)
+                    continue
+                records.append(record)
+                lines.append(line)
+                if len(records) >= settings.bulk_batch_size:
+                    yield validated(records, lines)
+                    records, lines = [], []
+            if records:
+                yield validated(records, lines)
+
+        carried, dropped = [], []
+
+        def on_progress(result: UpsertResult):
+            job.accept(result.inserted, result.updated)
+            if result.version is not None:
+                (dropped if self._carry_over_derived(dataset, result) else carried).append(result.version)
+            logger.info("Bulk %s upload: %s rows, %.0f rows/s", dataset, job.rows, job.rows_per_sec)
+
+        try:
+            self.storage.upsert_batches(dataset, batches(), on_progress)
+        finally:
+            self.bulk_stats.finish(job)
+        if dropped:
+            # Rebuild once for the whole upload, not after every batch
+            self.get_batch_code_filter()
+        elif carried and dataset == "medicines":
+            self._save_carried_filter()
+        if dataset == "medicines" and "verify_payloads" in self._derived and job.rows > job.rejected:
+            # Verifications are being served from prepared payloads; prepare
+            # the new catalog's before the next scan has to wait for them
+            self.get_verify_payloads()
+        return job.summary()
+
+    def _carry_over_derived(self, dataset: str, result: UpsertResult) -> bool:
+        """
+        Move derived structures built on the version a bulk upsert started
+        from to the version it committed, where adding the changes is
+        cheaper than a rebuild
+
+        The batch-code filter only ever gains codes, so the new ones are
+        added while it has capacity left; it is saved once the upload is
+        done, tagged with the final codes. Past capacity it is dropped, and True
+        is returned so the caller can rebuild it (larger) once the upload
+        is done, rather than leave that to the next verification.
+        Everything else (listings, the search and spatial indexes) is
+        rebuilt on next use.
+        """
+        if dataset != "medicines":
+            return False
+        with self._derived_lock:
+            cached = self._derived.get("batch_code_filter")
+            if cached is None or cached[0] != result.previous_version:
+                return False
+            bloom = cached[1]
+            if bloom.count + len(result.new_keys) > bloom.capacity:
+                del self._derived["batch_code_filter"]
+                return True
+            for key in result.new_keys:
+                bloom.add(key)
+            self._derived["batch_code_filter"] = (result.version, bloom)
+            return False
+
+    def _save_carried_filter(self):
+        """
+        Persist a batch-code filter that a bulk upsert carried over, unless
+        the catalog moved past it meanwhile (it is rebuilt on next use then)
+        """
+        cached = self._derived.get("batch_code_filter")
+        if cached is None or cached[0] != self.dataset_version("medicines"):
+            return
+        source_tag = self._bloom_source_tag()
+        # A write while the digest was read would have changed the version
+        if cached[0] == self.dataset_version("medicines"):
+            cached[1].save(settings.data_dir / "medicines.bloom", source_tag)
+
+    # Medicine search
+    def get_search_index(self) -> MedicineSearchIndex:
+        """Prefix, fuzzy and token index over the catalog, rebuilt when it changes"""
+        return self._get_derived(
+            "medicine_search",
+            "medicines",
+            lambda: MedicineSearchIndex(MedicineTable.from_records(self.get_all_medicines()))
+        )
+
+    def search_medicines(self, query: str, limit: int = 10, max_distance: int = 2) -> List[Dict[str, Any]]:
+        """
+        Search the catalog by batch code and by name/company words
+
+        Hits come in order: exact batch code, batch-code prefix, batch codes
+        within `max_distance` edits (closest first, only when there is no
+        exact match), then medicines whose name or company matches every word.
+        """
+        index = self.get_search_index()
+        hits: List[Dict[str, Any]] = []
+        seen = set()
+
+        def add(position: int, match: str, distance: Optional[int] = None):
+            if position not in seen and len(hits) < limit:
+                seen.add(position)
+                hits.append({"match": match, "distance": distance, "medicine": index.medicines[position]})
+
+        exact = index.exact(query)
+        if exact is not None:
+            add(exact, "exact", 0)
+        for position in index.prefix(query, limit + 1):
+            add(position, "prefix")
+        if exact is None and len(hits) < limit and max_distance > 0:
+            for distance, position in index.fuzzy(query, max_distance, limit):
+                add(position, "fuzzy", distance)
+        if len(hits) < limit:
+            for position in index.tokens(query, limit):
+                add(position, "text")
+        return hits
+
     # Pharmacy operations
-    def get_all_pharmacies(self) -> List[Dict[str, Any]]:
+    def get_all_pharmacies(self) -> Sequence[Dict[str, Any]]:
         """Get all pharmacies"""
-        return self._read_json(self.pharmacies_file)
-    
+        return self.storage.get_all_pharmacies()
+
     def find_pharmacy_by_id(self, pharmacy_id: str) -> Optional[Dict[str, Any]]:
         """Find pharmacy by ID"""
-        pharmacies = self.get_all_pharmacies()
-        for pharmacy in pharmacies:
-            if pharmacy['id'] == pharmacy_id:
-                return pharmacy
-        return None
-    
+        return self.storage.find_pharmacy_by_id(pharmacy_id)
+
+    def _build_pharmacy_index(
+        self
+    ) -> Tuple[Sequence[Dict[str, Any]], Union[GridIndex, CachedGridIndex], PharmacyCoordinates]:
+        # Built from coordinate columns, so a snapshot-backed store never
+        # decodes the pharmacy records here
+        pharmacies, latitudes, longitudes = self.storage.get_pharmacy_locations()
+        index = GridIndex.from_columns(latitudes, longitudes, cell_size_deg=settings.pharmacy_grid_cell_deg)
+        coordinates = PharmacyCoordinates(latitudes, longitudes)
+        if self.nearby_cache is not None:
+            index = self.nearby_cache.wrap(index, coordinates)
+        return pharmacies, index, coordinates
+
+    def get_pharmacy_coordinates(self) -> PharmacyCoordinates:
+        """Radian coordinate arrays aligned with get_all_pharmacies(), for bulk distance jobs"""
+        return self._get_derived("pharmacy_index", "pharmacies", self._build_pharmacy_index)[2]
+
+    def find_nearest_pharmacies(
+        self,
+        lat: float,
+        lon: float,
+        radius: float,
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """Page of pharmacies within radius km of (lat, lon), nearest first, plus the total match count"""
+        pharmacies, index, coordinates = self._get_derived(
+            "pharmacy_index", "pharmacies", self._build_pharmacy_index
+        )
+        return find_nearest_pharmacies(
+            pharmacies, lat, lon, radius,
+            limit=limit, offset=offset, index=index, coordinates=coordinates
+        )
+
+    def get_nearby_response(
+        self,
+        lat: float,
+        lon: float,
+        radius: float,
+        limit: Optional[int] = None,
+        offset: int = 0
+    ) -> Tuple[int, bytes]:
+        """Total match count and the PharmacyListResponse body of a nearby search"""
+        nearby, total = self.find_nearest_pharmacies(lat, lon, radius, limit=limit, offset=offset)
+        # Stored pharmacies were validated when loaded, so the page is
+        # encoded directly
+        codec = RECORD_CODECS["pharmacies"]
+        with metrics.span("serialize"):
+            body = dumps({
+                "success": True,
+                "count": len(nearby),
+                "total": total,
+                "pharmacies": [codec.conform(pharmacy) for pharmacy in nearby]
+            })
+        return total, body
+
     # Report operations
+    def flush_reports(self):
+        """Commit acknowledged reports still waiting for the next group commit"""
+        if self.report_ingestor is not None:
+            self.report_ingestor.flush()
+
+    def _report_ingest_metrics(self):
+        stats = self.report_ingestor.stats()
+        yield "# HELP report_ingest_pending Acknowledged reports waiting for a group commit"
+        yield "# TYPE report_ingest_pending gauge"
+        yield f"report_ingest_pending {stats['pending']}"
+        yield "# HELP report_group_commits_total Group commits of reports to storage"
+        yield "# TYPE report_group_commits_total counter"
+        yield f"report_group_commits_total {stats['commits']}"
+        yield "# HELP report_group_committed_total Reports committed to storage by group commits"
+        yield "# TYPE report_group_committed_total counter"
+        yield f"report_group_committed_total {stats['committed']}"
+        yield "# HELP report_ingest_rejected_total Reports the store refused, set aside in the rejected file"
+        yield "# TYPE report_ingest_rejected_total counter"
+        yield f"report_ingest_rejected_total {stats['rejected']}"
+
     def get_all_reports(self) -> List[Dict[str, Any]]:
         """Get all reports"""
-        return self._read_json(self.reports_file)
-    
+        self.flush_reports()
+        return self.storage.get_all_reports()
+
     def find_report_by_id(self, report_id: str) -> Optional[Dict[str, Any]]:
         """Find report by ID"""
-        reports = self.get_all_reports()
-        for report in reports:
-            if report['id'] == report_id:
-                return report
-        return None
-    
+        self.flush_reports()
+        return self.storage.find_report_by_id(report_id)
+
+    def find_reports(self, status: Optional[str] = None, batch_code: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Reports with the given status and/or batch code, from the storage indexes"""
+        self.flush_reports()
+        return self.storage.find_reports(status=status, batch_code=batch_code)
+
+    def _filtered_reports_page(
+        self, status: Optional[str], batch_code: Optional[str], position: int, limit: Optional[int]
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        reports = self.find_reports(status=status, batch_code=batch_code)
+        end = len(reports) if limit is None else min(len(reports), position + limit)
+        return reports[position:end], (end if end < len(reports) else None)
+
+    def get_filtered_reports_page(
+        self, status: Optional[str], batch_code: Optional[str], position: int = 0, limit: Optional[int] = None
+    ) -> Tuple[CachedBody, Optional[int]]:
+        """A page of filtered reports as a serialized JSON array, and where the next page starts"""
+        reports, next_position = self._filtered_reports_page(status, batch_code, position, limit)
+        return serialize_records(reports, RECORD_CODECS["reports"]), next_position
+
+    def get_filtered_reports_ndjson(
+        self, status: Optional[str], batch_code: Optional[str], position: int, limit: int
+    ) -> Tuple[bytes, Optional[int]]:
+        """A page of filtered reports as NDJSON lines, and where the next page starts"""
+        reports, next_position = self._filtered_reports_page(status, batch_code, position, limit)
+        return serialize_ndjson(reports, RECORD_CODECS["reports"]), next_position
+
+    def get_report_stats(self, top: int = 10) -> Dict[str, Any]:
+        """Report totals per status (every status listed) and the most reported batch codes"""
+        self.flush_reports()
+        stats = self.storage.get_report_stats(top)
+        by_status = {status: 0 for status in REPORT_STATUSES}
+        by_status.update(stats['by_status'])
+        return {**stats, "by_status": by_status}
+
     def add_report(self, report_data: Dict[str, Any]) -> Dict[str, Any]:
         """Add new report"""
-        reports = self.get_all_reports()
-        
+        now = datetime.now().isoformat()
         new_report = {
             "id": str(uuid.uuid4()),
             "batch_code": report_data['batch_code'],
             "medicine_name": report_data.get('medicine_name', 'Not specified'),
             "description": report_data['description'],
             "status": "pending",
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat()
+            "created_at": now,
+            "updated_at": now
         }
-        
-        reports.append(new_report)
-        self._write_json(self.reports_file, reports)
-        
-        return new_report
-    
+
+        if self.report_ingestor is not None:
+            return self.report_ingestor.submit(new_report)
+        return self.storage.insert_report(new_report)
+
     def update_report_status(self, report_id: str, status: str) -> Optional[Dict[str, Any]]:
         """Update report status"""
-        reports = self.get_all_reports()
-        
-        for i, report in enumerate(reports):
-            if report['id'] == report_id:
-                reports[i]['status'] = status
-                reports[i]['updated_at'] = datetime.now().isoformat()
-                self._write_json(self.reports_file, reports)
-                return reports[i]
-        
-        return None
+        self.flush_reports()
+        return self.storage.update_report(report_id, {
+            "status": status,
+            "updated_at": datetime.now().isoformat()
+        })
+
+    def close(self):
+        """Commit buffered reports and release storage resources"""
+        if self.report_ingestor is not None:
+            self.report_ingestor.close()
+        self.storage.close()
+
+
+class AsyncDatabase:
+    """
+    Awaitable view of a Database for async route handlers
+
+    Every method of the wrapped Database is available as a coroutine that
+    runs on a bounded thread pool, so file reads, JSON parsing and SQLite
+    queries never block the event loop. The pool size caps how many
+    storage calls run at once.
+
+    coalesce() additionally lets identical concurrent calls share one run.
+    """
+
+    def __init__(self, database: Database, max_workers: int = 8):
+        self.database = database
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="db-io")
+        self.single_flight: Optional[SingleFlight] = None
+        if settings.single_flight_enabled:
+            self.single_flight = SingleFlight(top_keys=settings.single_flight_top_keys)
+            metrics.register_collector(self.single_flight.collect)
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run a blocking callable on the storage thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def coalesce(self, name: str, *args: Hashable) -> Any:
+        """
+        Call a Database method, sharing the result with identical calls
+        (same method and arguments) already in flight
+
+        For read-only calls whose result every caller can use as is, such
+        as many clients verifying the same code during a scan spike.
+        """
+        call = getattr(self, name)
+        if self.single_flight is None:
+            return await call(*args)
+        return await self.single_flight.run(name, args, lambda: call(*args))
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self.database, name)
+        if not callable(attr):
+            return attr
+        timed_attr = metrics.timed(f"db.{name}")(attr)
+
+        async def call(*args, **kwargs):
+            return await self.run(timed_attr, *args, **kwargs)
+
+        call.__name__ = name
+        # Later lookups find the wrapper on the instance and skip __getattr__
+        self.__dict__[name] = call
+        return call
+
+    def close(self):
+        """Wait for in-flight storage calls and release resources"""
+        self._executor.shutdown(wait=True)
+        self.database.close()
 
-# Create global database instance
-db = Database()
\ No newline at end of file
+# Create global database instances
+db = Database()
+async_db = AsyncDatabase(db, max_workers=settings.db_io_workers)
@@ -0,0 +1,188 @@
+# backend/app/logging_config.py
+import logging
+import queue
+import random
+import sys
+import threading
+import time
+from logging.handlers import QueueHandler
+from typing import Iterable, Optional, TextIO, Tuple
+
+from app.config import settings
+from app.utils.metrics import metrics
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
+class SamplingFilter(logging.Filter):
+    """Keep only a fraction of INFO-and-below records from the given loggers"""
+
+    def __init__(self, rate: float, prefixes: Tuple[str, ...]):
+        super().__init__()
+        self.rate = rate
+        self.prefixes = prefixes
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.rate >= 1.0 or record.levelno > logging.INFO:
+            return True
+        if not record.name.startswith(self.prefixes):
+            return True
+        return random.random() < self.rate
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Hands records to a bounded queue without formatting them
+
+    Message formatting happens on the writer thread, so request handlers
+    only pay for creating the record. When the queue is full the record
+    is dropped and counted instead of blocking the caller.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Tracebacks must be rendered before the frames go away
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class BatchingLogWriter(threading.Thread):
+    """Background thread that formats queued records and writes them in batches"""
+
+    def __init__(
+        self,
+        log_queue: queue.Queue,
+        stream: TextIO,
+        formatter: logging.Formatter,
+        batch_size: int = 256,
+        flush_interval: float = 0.2
+    ):
+        super().__init__(name="log-writer", daemon=True)
+        self.queue = log_queue
+        self.stream = stream
+        self.formatter = formatter
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._stopping = False
+
+    def run(self):
+        while True:
+            try:
+                record = self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                if self._stopping:
+                    return
+                continue
+
+            batch = [record]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = any(item is None for item in batch)
+            self._write([item for item in batch if item is not None])
+            if stop:
+                return
+
+    def _write(self, records: Iterable[logging.LogRecord]):
+        lines = []
+        for record in records:
+            try:
+                lines.append(self.formatter.format(record))
+            except Exception:
+                lines.append(f"Unformattable log record from {record.name}: {record.msg!r}")
+        if lines:
+            self.stream.write("\n".join(lines) + "\n")
+            self.stream.flush()
+
+    def stop(self, timeout: float = 5.0):
+        """Write everything still queued, then stop, waiting at most `timeout` seconds"""
+        deadline = time.monotonic() + timeout
+        self._stopping = True
+        try:
+            self.queue.put(None, timeout=timeout)
+        except queue.Full:
+            # Still stops: with _stopping set the writer returns once the queue drains
+            pass
+        self.join(max(0.0, deadline - time.monotonic()))
+
+
+_writer: Optional[BatchingLogWriter] = None
+# The handler configure_logging added to the root logger; other handlers
+# there (uvicorn's, pytest's log capture) are left alone
+_handler: Optional[logging.Handler] = None
+_collector_registered = False
+
+
+def _collect_dropped():
+    dropped = _handler.dropped if isinstance(_handler, NonBlockingQueueHandler) else 0
+    yield "# HELP log_records_dropped_total Log records dropped because the log queue was full"
+    yield "# TYPE log_records_dropped_total counter"
+    yield f"log_records_dropped_total {dropped}"
+
+
+def configure_logging():
+    """
+    Route application logs through a non-blocking, batched pipeline
+
+    With LOG_ASYNC=false this falls back to a plain synchronous stream handler.
+    LOG_INFO_SAMPLE_RATE below 1.0 samples INFO lines from the route modules.
+    Calling it again replaces the handler installed by the previous call.
+    """
+    global _writer, _handler, _collector_registered
+
+    root = logging.getLogger()
+    root.setLevel(settings.log_level.upper())
+    if _handler is not None:
+        root.removeHandler(_handler)
+        _handler = None
+    shutdown_logging()
+
+    formatter = logging.Formatter(LOG_FORMAT)
+    sampling = SamplingFilter(settings.log_info_sample_rate, ("app.routes",))
+
+    if not settings.log_async:
+        _handler = logging.StreamHandler(sys.stderr)
+        _handler.setFormatter(formatter)
+        _handler.addFilter(sampling)
+        root.addHandler(_handler)
+        return
+
+    log_queue: queue.Queue = queue.Queue(maxsize=settings.log_queue_size)
+    _handler = NonBlockingQueueHandler(log_queue)
+    _handler.addFilter(sampling)
+    root.addHandler(_handler)
+
+    _writer = BatchingLogWriter(
+        log_queue,
+        sys.stderr,
+        formatter,
+        batch_size=settings.log_batch_size,
+        flush_interval=settings.log_flush_interval_ms / 1000
+    )
+    _writer.start()
+
+    if not _collector_registered:
+        metrics.register_collector(_collect_dropped)
+        _collector_registered = True
+
+
+def shutdown_logging():
+    """Flush queued log records; call when the worker exits"""
+    global _writer
+    if _writer is not None:
+        _writer.stop()
+        _writer = None
@@ -1,19 +1,19 @@
 # backend/app/main.py
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 import logging
 
 # Import routers correctly
 from app.routes.pharmacies import router as pharmacies_router
 from app.routes.medicines import router as medicines_router
 from app.routes.reports import router as reports_router
+from app.database import async_db
+from app.logging_config import configure_logging, shutdown_logging
+from app.utils.metrics import MetricsMiddleware, metrics
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Configure logging (batched on a background thread, see LOG_* settings)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 # Create FastAPI app
@@ -36,8 +36,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
 
+# Request latency histograms (no-op when METRICS_ENABLED=false)
+app.add_middleware(MetricsMiddleware, metrics=metrics)
+
 # Include routers
 app.include_router(medicines_router, prefix="/api/v1/medicines", tags=["Medicines"])
 app.include_router(pharmacies_router, prefix="/api/v1/pharmacies", tags=["Pharmacies"])
@@ -61,10 +65,24 @@ async def health_check():
         "service": "authentic-med-finder-api"
     }
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Latency histograms per route and per stage, in Prometheus text format"""
+    return PlainTextResponse(
+        metrics.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Drain pending storage calls and queued log records before the worker exits"""
+    async_db.close()
+    shutdown_logging()
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     """Global exception handler"""
-    logger.error(f"Global exception: {str(exc)}")
+    logger.error("Global exception: %s", exc)
     return JSONResponse(
         status_code=500,
         content={
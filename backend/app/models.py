@@ -22,6 +22,54 @@ class MedicineVerifyResponse(BaseModel):
     message: Optional[str] = None
     data: Optional[Dict[str, Any]] = None
 
+class MedicineBatchVerifyRequest(BaseModel):
+    batch_codes: List[str] = Field(
+        ...,
+        min_length=1,
+        max_length=10000,
+        description="Batch/QR codes to verify"
+    )
+
+class MedicineBatchVerifyResponse(BaseModel):
+    count: int
+    valid_count: int
+    results: List[MedicineVerifyResponse]
+
+class BatchCodeFilterStats(BaseModel):
+    items: int
+    capacity: int
+    size_bits: int
+    hash_count: int
+    memory_bytes: int
+    target_false_positive_rate: float
+    false_positive_rate: float
+
+class MedicineSearchHit(BaseModel):
+    match: str = Field(..., description="exact, prefix, fuzzy or text")
+    distance: Optional[int] = Field(None, description="Edit distance for fuzzy batch-code matches")
+    medicine: Medicine
+
+class MedicineSearchResponse(BaseModel):
+    query: str
+    count: int
+    results: List[MedicineSearchHit]
+
+# Bulk upload Models
+class BulkRowError(BaseModel):
+    line: int
+    error: str
+
+class BulkUpsertResponse(BaseModel):
+    dataset: str
+    format: str = Field(..., description="ndjson or csv")
+    rows: int
+    inserted: int
+    updated: int
+    rejected: int
+    elapsed_s: float
+    rows_per_sec: float
+    errors: List[BulkRowError] = Field(..., description="First rejected rows, by line number")
+
 # Pharmacy Models
 class PharmacyLocation(BaseModel):
     latitude: float
@@ -38,9 +86,12 @@ class Pharmacy(BaseModel):
 class PharmacyListResponse(BaseModel):
     success: bool
     count: int
+    total: Optional[int] = None
     pharmacies: List[Pharmacy]
 
 # Report Models
+REPORT_STATUSES = ("pending", "investigating", "resolved", "rejected")
+
 class Report(BaseModel):
     id: str
     batch_code: str
@@ -50,6 +101,15 @@ class Report(BaseModel):
     created_at: str
     updated_at: str
 
+class BatchReportCount(BaseModel):
+    batch_code: str
+    count: int
+
+class ReportStatsResponse(BaseModel):
+    total: int
+    by_status: Dict[str, int]
+    top_batches: List[BatchReportCount]
+
 class ReportCreateRequest(BaseModel):
     batch_code: str = Field(..., min_length=1, description="Batch/QR code being reported")
     medicine_name: Optional[str] = None
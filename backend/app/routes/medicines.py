@@ -1,83 +1,251 @@
 # backend/app/routes/medicines.py
-from fastapi import APIRouter, HTTPException, status
-from typing import List
-from datetime import datetime
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, List, Optional
+import asyncio
 import logging
 
 from app.models import (
     Medicine,
     MedicineVerifyRequest,
-    MedicineVerifyResponse
+    MedicineVerifyResponse,
+    MedicineBatchVerifyRequest,
+    MedicineBatchVerifyResponse,
+    MedicineSearchResponse,
+    BatchCodeFilterStats,
+    BulkUpsertResponse
 )
-from app.database import db
+from app.database import async_db
+from app.utils.admin_auth import require_admin_key
+from app.utils.bulk_ingest import UPLOAD_OPENAPI, UnsupportedUploadError, iter_sync, upload_format
+from app.utils.http_cache import cached_json_response
+from app.utils.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    NDJSON_MEDIA_TYPE,
+    NEXT_CURSOR_HEADER,
+    STREAM_PAGE_SIZE,
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+    stream_pages
+)
+from app.utils.metrics import metrics
+from app.utils.verify_payloads import batch_verify_response
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Codes resolved per chunk when streaming batch results
+BATCH_STREAM_CHUNK = 500
+
 @router.post("/verify", response_model=MedicineVerifyResponse)
 async def verify_medicine(request: MedicineVerifyRequest):
     """
     Verify medicine authenticity by batch code
     
     - **batch_code**: The batch/QR code to verify
+    
+    `data.expired` is true once the expiry date has passed (null if the
+    stored date cannot be read).
     """
     try:
         batch_code = request.batch_code.strip()
-        logger.info(f"Verifying medicine with batch code: {batch_code}")
+        logger.info("Verifying medicine with batch code: %s", batch_code)
         
-        medicine = db.find_medicine_by_batch_code(batch_code)
+        # The body is prepared from the catalog and matches MedicineVerifyResponse;
+        # concurrent scans of the same code share one lookup
+        found, body = await async_db.coalesce("verify_batch_code", batch_code)
         
-        if not medicine:
-            logger.warning(f"Medicine not found: {batch_code}")
-            return MedicineVerifyResponse(
-                is_valid=False,
-                code=batch_code,
-                message="Medicine not found in database"
-            )
+        if not found:
+            logger.warning("Medicine not found: %s", batch_code)
+        else:
+            logger.info("Medicine verified successfully: %s", batch_code)
         
-        # Format expiry date
-        try:
-            expiry_date = datetime.fromisoformat(medicine['expiry_date'])
-            expiry_formatted = expiry_date.strftime("%b %Y")
-        except:
-            expiry_formatted = medicine['expiry_date']
+        return Response(content=body, media_type="application/json")
         
-        logger.info(f"Medicine verified successfully: {batch_code}")
-        return MedicineVerifyResponse(
-            is_valid=True,
-            code=batch_code,
-            data={
-                "name": medicine['name'],
-                "company": medicine['company'],
-                "expiry": expiry_formatted,
-                "status": "Authentic" if medicine['is_authentic'] else "Suspicious",
-                "manufacturing_date": medicine['manufacturing_date']
-            }
+    except Exception as e:
+        logger.error("Error verifying medicine: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error verifying medicine: {str(e)}"
         )
+
+async def _stream_batch_results(batch_codes: List[str]) -> AsyncIterator[bytes]:
+    """Yield one NDJSON line per code, resolving codes chunk by chunk"""
+    for start in range(0, len(batch_codes), BATCH_STREAM_CHUNK):
+        _, lines = await async_db.verify_batch_codes(batch_codes[start:start + BATCH_STREAM_CHUNK])
+        yield b"\n".join(lines) + b"\n"
+
+@router.post("/verify/batch", response_model=MedicineBatchVerifyResponse)
+async def verify_medicines_batch(
+    request: MedicineBatchVerifyRequest,
+    stream: bool = Query(False, description="Stream results as NDJSON, one line per code")
+):
+    """
+    Verify many batch codes in one request
+    
+    - **batch_codes**: Batch/QR codes to verify (up to 10,000)
+    - **stream**: When true, results are streamed as NDJSON (one
+      MedicineVerifyResponse per line, in request order)
+    """
+    try:
+        batch_codes = [batch_code.strip() for batch_code in request.batch_codes]
+        logger.info("Verifying batch of %s codes", len(batch_codes))
+        
+        if stream:
+            return StreamingResponse(
+                _stream_batch_results(batch_codes),
+                media_type="application/x-ndjson"
+            )
+        
+        valid_count, results = await async_db.verify_batch_codes(batch_codes)
+        
+        logger.info("Batch verified: %s/%s codes found", valid_count, len(results))
+        with metrics.span("serialize"):
+            body = batch_verify_response(results, valid_count)
+        return Response(content=body, media_type="application/json")
         
     except Exception as e:
-        logger.error(f"Error verifying medicine: {str(e)}")
+        logger.error("Error verifying batch: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error verifying medicine: {str(e)}"
+            detail=f"Error verifying batch: {str(e)}"
         )
 
 @router.get("/", response_model=List[Medicine])
-async def get_all_medicines():
+async def get_all_medicines(
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; returns one page"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    stream: bool = Query(False, description="Stream medicines as NDJSON"),
+    if_none_match: Optional[str] = Header(None)
+):
     """
     Get all medicines in the database
+    
+    Responses carry an ETag; send it back in If-None-Match to get
+    304 Not Modified while the medicines are unchanged.
+    
+    - **limit** / **cursor**: return one page; the X-Next-Cursor response
+      header holds the cursor of the next page and is absent on the last one
+    - **stream**: send every medicine as NDJSON, read from storage in
+      chunks (starting at **cursor** if given)
     """
     try:
-        medicines = db.get_all_medicines()
-        logger.info(f"Retrieved {len(medicines)} medicines")
-        return medicines
+        position = decode_cursor("medicines", cursor)
+        
+        if stream:
+            return StreamingResponse(
+                stream_pages(lambda at: async_db.get_ndjson_page("medicines", at, STREAM_PAGE_SIZE), position),
+                media_type=NDJSON_MEDIA_TYPE
+            )
+        
+        if limit is None and cursor is None:
+            listing = await async_db.get_listing("medicines")
+            logger.info("Retrieved %s medicines", listing.count)
+            return cached_json_response(listing, if_none_match)
+        
+        page, next_position = await async_db.get_page("medicines", position, limit or DEFAULT_PAGE_SIZE)
+        logger.info("Retrieved page of %s medicines", page.count)
+        response = cached_json_response(page, if_none_match)
+        if next_position is not None:
+            response.headers[NEXT_CURSOR_HEADER] = encode_cursor("medicines", next_position)
+        return response
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
-        logger.error(f"Error fetching medicines: {str(e)}")
+        logger.error("Error fetching medicines: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error fetching medicines: {str(e)}"
         )
 
+@router.post(
+    "/bulk",
+    response_model=BulkUpsertResponse,
+    dependencies=[Depends(require_admin_key)],
+    openapi_extra=UPLOAD_OPENAPI
+)
+async def bulk_upsert_medicines(request: Request):
+    """
+    Insert or update medicines from a streamed NDJSON or CSV upload (admin)
+    
+    - Send the **X-Admin-Key** header and Content-Type application/x-ndjson or text/csv
+    - Records are matched by batch code (case- and whitespace-insensitive); a matching medicine is replaced, others are added
+    - CSV columns: id, batch_code, name, company, expiry_date, is_authentic, manufacturing_date
+    
+    The body is parsed as it arrives and written in batches. Invalid rows,
+    including lines over 1M characters, are skipped and counted; the first
+    ones are listed in `errors`. Batches are committed as they arrive: if
+    the upload fails part way, the rows committed before the failure stay,
+    and sending the upload again completes it. The summary reports
+    rows/sec; progress of running uploads is exported on /metrics.
+    """
+    try:
+        fmt = upload_format(request.headers.get("content-type"))
+    except UnsupportedUploadError as e:
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail=str(e))
+    
+    try:
+        chunks = iter_sync(request.stream(), asyncio.get_running_loop())
+        summary = await async_db.bulk_upsert("medicines", chunks, fmt)
+        logger.info(
+            "Bulk medicine upload: %s inserted, %s updated, %s rejected (%s rows/s)",
+            summary['inserted'], summary['updated'], summary['rejected'], summary['rows_per_sec']
+        )
+        return summary
+    except Exception as e:
+        logger.error("Error uploading medicines: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error uploading medicines: {str(e)}"
+        )
+
+@router.get("/filter/stats", response_model=BatchCodeFilterStats)
+async def get_batch_code_filter_stats():
+    """
+    Introspect the Bloom filter used to reject unknown batch codes
+    
+    Reports the number of codes, bit-array size, hash count, memory
+    footprint and expected false-positive rate.
+    """
+    try:
+        return await async_db.get_batch_code_filter_stats()
+    except Exception as e:
+        logger.error("Error fetching filter stats: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching filter stats: {str(e)}"
+        )
+
+@router.get("/search", response_model=MedicineSearchResponse)
+async def search_medicines(
+    q: str = Query(..., min_length=1, max_length=100, regex=r"\S", description="Batch code, code prefix, or name/company words"),
+    limit: int = Query(10, ge=1, le=50, description="Maximum number of results"),
+    max_distance: int = Query(2, ge=0, le=2, description="Maximum edit distance for batch-code suggestions")
+):
+    """
+    Search medicines by batch code and by name or company
+    
+    Returns the exact batch code first, then codes starting with **q**,
+    then "did you mean" codes within **max_distance** typos (when there is
+    no exact match), then medicines whose name or company has a word
+    starting with each word of **q**.
+    """
+    try:
+        results = await async_db.search_medicines(q.strip(), limit=limit, max_distance=max_distance)
+        logger.info("Search for %r returned %s results", q, len(results))
+        return MedicineSearchResponse(query=q, count=len(results), results=results)
+    except Exception as e:
+        logger.error("Error searching medicines: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error searching medicines: {str(e)}"
+        )
+
 @router.get("/{batch_code}", response_model=Medicine)
 async def get_medicine_by_batch_code(batch_code: str):
     """
@@ -86,7 +254,7 @@ async def get_medicine_by_batch_code(batch_code: str):
     - **batch_code**: The batch/QR code to lookup
     """
     try:
-        medicine = db.find_medicine_by_batch_code(batch_code)
+        medicine = await async_db.find_medicine_by_batch_code(batch_code)
         
         if not medicine:
             raise HTTPException(
@@ -99,7 +267,7 @@ async def get_medicine_by_batch_code(batch_code: str):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error fetching medicine: {str(e)}")
+        logger.error("Error fetching medicine: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error fetching medicine: {str(e)}"
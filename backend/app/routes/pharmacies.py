@@ -1,21 +1,25 @@
 # backend/app/routes/pharmacies.py
-from fastapi import APIRouter, HTTPException, Query, status
-from typing import List
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from typing import List, Optional
+import asyncio
 import logging
 
-from app.models import Pharmacy, PharmacyListResponse
-from app.database import db
-from app.utils.distance import get_pharmacies_within_radius
-
+from app.models import BulkUpsertResponse, Pharmacy, PharmacyListResponse
+from app.database import async_db
+from app.utils.admin_auth import require_admin_key
+from app.utils.bulk_ingest import UPLOAD_OPENAPI, UnsupportedUploadError, iter_sync, upload_format
+from app.utils.http_cache import cached_json_response
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 @router.get("/nearby", response_model=PharmacyListResponse)
 async def get_nearby_pharmacies(
-    lat: float = Query(19.0760, description="User's latitude"),
-    lng: float = Query(72.8777, description="User's longitude"),
-    radius: float = Query(10.0, ge=0.1, le=100, description="Search radius in kilometers")
+    lat: float = Query(19.0760, ge=-90, le=90, description="User's latitude"),
+    lng: float = Query(72.8777, ge=-180, le=180, description="User's longitude"),
+    radius: float = Query(10.0, ge=0.1, le=100, description="Search radius in kilometers"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Maximum number of pharmacies to return"),
+    offset: int = Query(0, ge=0, description="Number of nearest pharmacies to skip")
 ):
     """
     Find pharmacies within specified radius of user's location
@@ -23,47 +27,90 @@ async def get_nearby_pharmacies(
     - **lat**: Latitude of user's location (default: Mumbai coordinates)
     - **lng**: Longitude of user's location
     - **radius**: Search radius in kilometers (default: 10km, max: 100km)
+    - **limit**: Return only the nearest N pharmacies (default: all)
+    - **offset**: Skip the nearest N pharmacies, for paging
+    
+    `count` is the number of pharmacies returned, `total` the number within the radius.
     """
     try:
-        logger.info(f"Searching pharmacies near ({lat}, {lng}) within {radius}km")
+        logger.info("Searching pharmacies near (%s, %s) within %skm", lat, lng, radius)
         
-        # Get all pharmacies
-        all_pharmacies = db.get_all_pharmacies()
+        # Filter by distance, checking only pharmacies near the user; the
+        # body matches PharmacyListResponse and identical concurrent
+        # searches share one computation
+        total, body = await async_db.coalesce("get_nearby_response", lat, lng, radius, limit, offset)
         
-        # Filter by distance
-        nearby = get_pharmacies_within_radius(all_pharmacies, lat, lng, radius)
+        logger.info("Found %s pharmacies within %skm", total, radius)
         
-        logger.info(f"Found {len(nearby)} pharmacies within {radius}km")
-        
-        return PharmacyListResponse(
-            success=True,
-            count=len(nearby),
-            pharmacies=nearby
-        )
+        return Response(content=body, media_type="application/json")
         
     except Exception as e:
-        logger.error(f"Error searching pharmacies: {str(e)}")
+        logger.error("Error searching pharmacies: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error searching pharmacies: {str(e)}"
         )
 
 @router.get("/", response_model=List[Pharmacy])
-async def get_all_pharmacies():
+async def get_all_pharmacies(if_none_match: Optional[str] = Header(None)):
     """
     Get all pharmacies in the database
+    
+    Responses carry an ETag; send it back in If-None-Match to get
+    304 Not Modified while the pharmacies are unchanged.
     """
     try:
-        pharmacies = db.get_all_pharmacies()
-        logger.info(f"Retrieved {len(pharmacies)} pharmacies")
-        return pharmacies
+        listing = await async_db.get_listing("pharmacies")
+        logger.info("Retrieved %s pharmacies", listing.count)
+        return cached_json_response(listing, if_none_match)
     except Exception as e:
-        logger.error(f"Error fetching pharmacies: {str(e)}")
+        logger.error("Error fetching pharmacies: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error fetching pharmacies: {str(e)}"
         )
 
+@router.post(
+    "/bulk",
+    response_model=BulkUpsertResponse,
+    dependencies=[Depends(require_admin_key)],
+    openapi_extra=UPLOAD_OPENAPI
+)
+async def bulk_upsert_pharmacies(request: Request):
+    """
+    Insert or update pharmacies from a streamed NDJSON or CSV upload (admin)
+    
+    - Send the **X-Admin-Key** header and Content-Type application/x-ndjson or text/csv
+    - Records are matched by ID; a matching pharmacy is replaced, others are added
+    - CSV columns: id, name, address, phone, latitude, longitude (NDJSON records may nest them in location instead)
+    
+    The body is parsed as it arrives and written in batches. Invalid rows,
+    including lines over 1M characters, are skipped and counted; the first
+    ones are listed in `errors`. Batches are committed as they arrive: if
+    the upload fails part way, the rows committed before the failure stay,
+    and sending the upload again completes it. The summary reports
+    rows/sec; progress of running uploads is exported on /metrics.
+    """
+    try:
+        fmt = upload_format(request.headers.get("content-type"))
+    except UnsupportedUploadError as e:
+        raise HTTPException(status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE, detail=str(e))
+    
+    try:
+        chunks = iter_sync(request.stream(), asyncio.get_running_loop())
+        summary = await async_db.bulk_upsert("pharmacies", chunks, fmt)
+        logger.info(
+            "Bulk pharmacy upload: %s inserted, %s updated, %s rejected (%s rows/s)",
+            summary['inserted'], summary['updated'], summary['rejected'], summary['rows_per_sec']
+        )
+        return summary
+    except Exception as e:
+        logger.error("Error uploading pharmacies: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error uploading pharmacies: {str(e)}"
+        )
+
 @router.get("/{pharmacy_id}", response_model=Pharmacy)
 async def get_pharmacy_by_id(pharmacy_id: str):
     """
@@ -72,7 +119,7 @@ async def get_pharmacy_by_id(pharmacy_id: str):
     - **pharmacy_id**: The pharmacy ID to lookup
     """
     try:
-        pharmacy = db.find_pharmacy_by_id(pharmacy_id)
+        pharmacy = await async_db.find_pharmacy_by_id(pharmacy_id)
         
         if not pharmacy:
             raise HTTPException(
@@ -85,7 +132,7 @@ async def get_pharmacy_by_id(pharmacy_id: str):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error fetching pharmacy: {str(e)}")
+        logger.error("Error fetching pharmacy: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error fetching pharmacy: {str(e)}"
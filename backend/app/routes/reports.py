@@ -1,18 +1,35 @@
 # backend/app/routes/reports.py
-from fastapi import APIRouter, HTTPException, status, Query
-from typing import List
+from fastapi import APIRouter, Header, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
 import logging
 
 from app.models import (
+    REPORT_STATUSES,
     Report,
     ReportCreateRequest,
-    ReportCreateResponse
+    ReportCreateResponse,
+    ReportStatsResponse
+)
+from app.database import async_db
+from app.utils.http_cache import cached_json_response
+from app.utils.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    NDJSON_MEDIA_TYPE,
+    NEXT_CURSOR_HEADER,
+    STREAM_PAGE_SIZE,
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+    stream_pages
 )
-from app.database import db
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+STATUS_PATTERN = f"^({'|'.join(REPORT_STATUSES)})$"
+
 @router.post("/", response_model=ReportCreateResponse)
 async def create_report(request: ReportCreateRequest):
     """
@@ -23,7 +40,7 @@ async def create_report(request: ReportCreateRequest):
     - **description**: Detailed description of the issue (minimum 10 characters)
     """
     try:
-        logger.info(f"Creating report for batch code: {request.batch_code}")
+        logger.info("Creating report for batch code: %s", request.batch_code)
         
         report_data = {
             "batch_code": request.batch_code.strip(),
@@ -32,9 +49,9 @@ async def create_report(request: ReportCreateRequest):
         }
         
         # Add report to database
-        new_report = db.add_report(report_data)
+        new_report = await async_db.add_report(report_data)
         
-        logger.info(f"Report created successfully with ID: {new_report['id']}")
+        logger.info("Report created successfully with ID: %s", new_report['id'])
         
         return ReportCreateResponse(
             success=True,
@@ -43,28 +60,98 @@ async def create_report(request: ReportCreateRequest):
         )
         
     except Exception as e:
-        logger.error(f"Error creating report: {str(e)}")
+        logger.error("Error creating report: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error creating report: {str(e)}"
         )
 
 @router.get("/", response_model=List[Report])
-async def get_all_reports():
+async def get_all_reports(
+    status_filter: Optional[str] = Query(
+        None, alias="status", regex=STATUS_PATTERN, description="Only reports with this status"
+    ),
+    batch_code: Optional[str] = Query(None, min_length=1, description="Only reports for this batch code"),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="Page size; returns one page"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    stream: bool = Query(False, description="Stream reports as NDJSON"),
+    if_none_match: Optional[str] = Header(None)
+):
     """
     Get all reports (admin endpoint)
+    
+    Responses carry an ETag; send it back in If-None-Match to get
+    304 Not Modified while the reports are unchanged.
+    
+    - **status** / **batch_code**: filter through the report indexes
+      (batch codes compare case-insensitively)
+    - **limit** / **cursor**: return one page; the X-Next-Cursor response
+      header holds the cursor of the next page and is absent on the last one
+    - **stream**: send every report as NDJSON, read from storage in
+      chunks (starting at **cursor** if given)
     """
     try:
-        reports = db.get_all_reports()
-        logger.info(f"Retrieved {len(reports)} reports")
-        return reports
+        filtered = status_filter is not None or batch_code is not None
+        scope = "reports"
+        if filtered:
+            scope = f"reports?status={status_filter or ''}&batch_code={batch_code or ''}"
+        position = decode_cursor(scope, cursor)
+        
+        if stream:
+            if filtered:
+                fetch = lambda at: async_db.get_filtered_reports_ndjson(status_filter, batch_code, at, STREAM_PAGE_SIZE)
+            else:
+                fetch = lambda at: async_db.get_ndjson_page("reports", at, STREAM_PAGE_SIZE)
+            return StreamingResponse(stream_pages(fetch, position), media_type=NDJSON_MEDIA_TYPE)
+        
+        if limit is None and cursor is None:
+            if filtered:
+                listing, _ = await async_db.get_filtered_reports_page(status_filter, batch_code)
+            else:
+                listing = await async_db.get_listing("reports")
+            logger.info("Retrieved %s reports", listing.count)
+            return cached_json_response(listing, if_none_match)
+        
+        if filtered:
+            page, next_position = await async_db.get_filtered_reports_page(
+                status_filter, batch_code, position, limit or DEFAULT_PAGE_SIZE
+            )
+        else:
+            page, next_position = await async_db.get_page("reports", position, limit or DEFAULT_PAGE_SIZE)
+        logger.info("Retrieved page of %s reports", page.count)
+        response = cached_json_response(page, if_none_match)
+        if next_position is not None:
+            response.headers[NEXT_CURSOR_HEADER] = encode_cursor(scope, next_position)
+        return response
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
-        logger.error(f"Error fetching reports: {str(e)}")
+        logger.error("Error fetching reports: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error fetching reports: {str(e)}"
         )
 
+@router.get("/stats", response_model=ReportStatsResponse)
+async def get_report_stats(top: int = Query(10, ge=1, le=100, description="Number of most reported batch codes")):
+    """
+    Report counts for the admin view (admin endpoint)
+    
+    Totals per status and the most reported batch codes, read from
+    counters kept current on every write rather than by scanning reports.
+    """
+    try:
+        return await async_db.get_report_stats(top)
+    except Exception as e:
+        logger.error("Error fetching report stats: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error fetching report stats: {str(e)}"
+        )
+
 @router.get("/{report_id}", response_model=Report)
 async def get_report_by_id(report_id: str):
     """
@@ -73,7 +160,7 @@ async def get_report_by_id(report_id: str):
     - **report_id**: The report ID to lookup
     """
     try:
-        report = db.find_report_by_id(report_id)
+        report = await async_db.find_report_by_id(report_id)
         
         if not report:
             raise HTTPException(
@@ -86,7 +173,7 @@ async def get_report_by_id(report_id: str):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error fetching report: {str(e)}")
+        logger.error("Error fetching report: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error fetching report: {str(e)}"
@@ -95,7 +182,7 @@ async def get_report_by_id(report_id: str):
 @router.patch("/{report_id}/status")
 async def update_report_status(
     report_id: str,
-    status: str = Query(..., regex="^(pending|investigating|resolved|rejected)$")
+    status: str = Query(..., regex=STATUS_PATTERN)
 ):
     """
     Update report status (admin endpoint)
@@ -104,7 +191,7 @@ async def update_report_status(
     - **status**: New status (pending, investigating, resolved, rejected)
     """
     try:
-        updated_report = db.update_report_status(report_id, status)
+        updated_report = await async_db.update_report_status(report_id, status)
         
         if not updated_report:
             raise HTTPException(
@@ -112,7 +199,7 @@ async def update_report_status(
                 detail=f"Report with ID '{report_id}' not found"
             )
         
-        logger.info(f"Updated report {report_id} status to: {status}")
+        logger.info("Updated report %s status to: %s", report_id, status)
         return {
             "success": True,
             "message": "Report status updated successfully",
@@ -122,7 +209,7 @@ async def update_report_status(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error updating report status: {str(e)}")
+        logger.error("Error updating report status: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error updating report status: {str(e)}"
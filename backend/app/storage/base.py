@@ -0,0 +1,217 @@
+# backend/app/storage/base.py
+import hashlib
+from abc import ABC, abstractmethod
+from typing import List, Optional, Dict, Any, Callable, Hashable, Iterable, NamedTuple, Sequence, Tuple, Union
+
+import numpy as np
+
+from app.storage.records import PharmacyTable
+
+# Keys hashed per update() call by KeyDigest
+DIGEST_CHUNK = 65536
+
+
+def normalize_batch_code(batch_code: str) -> str:
+    """Normalize a batch code for case- and whitespace-insensitive lookups"""
+    return batch_code.strip().casefold()
+
+
+class KeyDigest:
+    """
+    Digest of a sorted sequence of unique lookup keys, fed in chunks
+
+    Keys are hashed as UTF-8 lines, so str keys and their UTF-8 bytes give
+    the same digest. It identifies the contents of a catalog, unlike a
+    dataset version, which restarts for a new database or data directory.
+    """
+
+    def __init__(self):
+        self._hash = hashlib.blake2b(digest_size=16)
+
+    def update(self, keys: Sequence[Union[str, bytes]]) -> "KeyDigest":
+        if len(keys):
+            if isinstance(keys[0], str):
+                self._hash.update(("\n".join(keys) + "\n").encode("utf-8"))
+            else:
+                self._hash.update(b"\n".join(keys) + b"\n")
+        return self
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+
+class UpsertResult(NamedTuple):
+    """
+    Outcome of one step of a bulk upsert
+
+    `new_keys` are the lookup keys (normalized batch codes, pharmacy IDs)
+    that did not exist before. The versions are set once the step is
+    committed: the dataset version the changes were applied on top of, and
+    the version after them.
+    """
+    inserted: int
+    updated: int
+    new_keys: List[str]
+    previous_version: Optional[Hashable] = None
+    version: Optional[Hashable] = None
+
+
+class StorageBackend(ABC):
+    """
+    Interface implemented by every storage engine behind Database
+
+    Backends only persist and look up records. Business rules such as
+    generating report IDs and timestamps stay in Database.
+    """
+
+    DATASETS = ("medicines", "pharmacies", "reports")
+
+    @abstractmethod
+    def dataset_version(self, dataset: str) -> Hashable:
+        """
+        Return a token that changes whenever the given dataset changes
+
+        Callers use it to decide when derived structures (indexes, caches)
+        built from a dataset must be rebuilt.
+        """
+
+    # Medicine operations
+    @abstractmethod
+    def get_all_medicines(self) -> Sequence[Dict[str, Any]]:
+        """Get all medicines (a list, or a read-only table such as MedicineTable)"""
+
+    def get_medicines_with_index(self) -> Tuple[Sequence[Dict[str, Any]], Optional[Any]]:
+        """
+        All medicines, and the backend's in-memory index from normalized
+        batch code to position in them if it keeps one (None otherwise)
+
+        The index has position(key) and lookup(keys), like KeyIndex, and is
+        taken from the same catalog version as the medicines.
+        """
+        return self.get_all_medicines(), None
+
+    def batch_code_digest(self) -> str:
+        """KeyDigest of the catalog's normalized batch codes, for tagging structures persisted across restarts"""
+        codes = sorted({normalize_batch_code(medicine['batch_code']) for medicine in self.get_all_medicines()})
+        return KeyDigest().update(codes).hexdigest()
+
+    @abstractmethod
+    def find_medicine_by_batch_code(self, batch_code: str) -> Optional[Dict[str, Any]]:
+        """Find medicine by batch code (case- and whitespace-insensitive)"""
+
+    def find_medicines_by_batch_codes(self, batch_codes: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """Resolve many batch codes at once; results are aligned with the input"""
+        return [self.find_medicine_by_batch_code(batch_code) for batch_code in batch_codes]
+
+    # Pharmacy operations
+    @abstractmethod
+    def get_all_pharmacies(self) -> Sequence[Dict[str, Any]]:
+        """Get all pharmacies (a list, or a read-only table such as PharmacyTable)"""
+
+    @abstractmethod
+    def find_pharmacy_by_id(self, pharmacy_id: str) -> Optional[Dict[str, Any]]:
+        """Find pharmacy by ID"""
+
+    def get_pharmacy_locations(self) -> Tuple[Sequence[Dict[str, Any]], np.ndarray, np.ndarray]:
+        """
+        All pharmacies with latitude and longitude columns (degrees) aligned
+        by position, for long-lived spatial indexes
+
+        This default copies the pharmacies into a compact PharmacyTable, so
+        the index does not keep a dict per pharmacy alive.
+        """
+        pharmacies = PharmacyTable.from_records(self.get_all_pharmacies())
+        return pharmacies, pharmacies.latitude, pharmacies.longitude
+
+    # Bulk catalog writes
+    @abstractmethod
+    def upsert_batches(
+        self,
+        dataset: str,
+        batches: Iterable[List[Dict[str, Any]]],
+        on_progress: Callable[[UpsertResult], None]
+    ):
+        """
+        Insert or replace validated medicines (keyed by normalized batch
+        code) or pharmacies (keyed by ID), reading batches as they come
+
+        Backends call on_progress after each batch and after each commit.
+        Later records win over earlier ones with the same key.
+
+        Batches are committed as they arrive, one or several per
+        transaction, so a large upload never waits in memory for a single
+        commit. If the upload fails part way, what was committed before the
+        failure stays; every row is an upsert, so sending the upload again
+        completes it.
+        """
+
+    # Report operations
+    @abstractmethod
+    def get_all_reports(self) -> List[Dict[str, Any]]:
+        """Get all reports in submission order"""
+
+    @abstractmethod
+    def find_report_by_id(self, report_id: str) -> Optional[Dict[str, Any]]:
+        """Find report by ID"""
+
+    def find_reports(self, status: Optional[str] = None, batch_code: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Reports matching every given filter (batch codes compare normalized), in submission order"""
+        key = normalize_batch_code(batch_code) if batch_code is not None else None
+        return [
+            report for report in self.get_all_reports()
+            if (status is None or report['status'] == status)
+            and (key is None or normalize_batch_code(report['batch_code']) == key)
+        ]
+
+    def get_report_stats(self, top: int = 10) -> Dict[str, Any]:
+        """Total reports, counts per status and the `top` most reported batch codes"""
+        reports = self.get_all_reports()
+        by_status: Dict[str, int] = {}
+        batches: Dict[str, List[Any]] = {}
+        for report in reports:
+            by_status[report['status']] = by_status.get(report['status'], 0) + 1
+            entry = batches.setdefault(normalize_batch_code(report['batch_code']), [report['batch_code'], 0])
+            entry[1] += 1
+        ranked = sorted(batches.values(), key=lambda entry: -entry[1])[:top]
+        return {
+            "total": len(reports),
+            "by_status": by_status,
+            "top_batches": [{"batch_code": code, "count": count} for code, count in ranked]
+        }
+
+    @abstractmethod
+    def insert_report(self, report: Dict[str, Any]) -> Dict[str, Any]:
+        """Persist a fully populated report and return it"""
+
+    def insert_reports(self, reports: List[Dict[str, Any]]):
+        """Durably persist a batch of fully populated reports, skipping IDs already stored"""
+        for report in reports:
+            if self.find_report_by_id(report['id']) is None:
+                self.insert_report(report)
+
+    @abstractmethod
+    def update_report(self, report_id: str, changes: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Apply field changes to a report and return the updated record"""
+
+    # Paging
+    def get_page(self, dataset: str, position: int, limit: int) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        Return up to `limit` records of a dataset starting at `position`,
+        plus the position the next page starts at (None after the last page)
+
+        Position 0 is the start. Positions are opaque to callers; this
+        default uses offsets into the full list, and backends with a
+        cheaper way to seek override it.
+        """
+        loaders = {
+            "medicines": self.get_all_medicines,
+            "pharmacies": self.get_all_pharmacies,
+            "reports": self.get_all_reports
+        }
+        records = loaders[dataset]()
+        page = records[position:position + limit]
+        end = position + len(page)
+        return page, (end if end < len(records) else None)
+
+    def close(self):
+        """Release any resources held by the backend"""
@@ -0,0 +1,422 @@
+# backend/app/storage/json_store.py
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional, Dict, Any, Tuple, Callable, Hashable, Iterable, NamedTuple, Sequence, Type, Union
+
+import numpy as np
+
+from app.storage.base import DIGEST_CHUNK, KeyDigest, StorageBackend, UpsertResult, normalize_batch_code
+from app.storage.records import RECORD_CODECS, KeyIndex, MedicineTable, PharmacyTable, RecordView
+from app.storage.report_log import ReportLog
+from app.storage.shared_state import GenerationCounters, InterProcessLock, atomic_write_bytes, atomic_write_chunks
+from app.storage.snapshot import CATALOGS, CatalogSnapshot, SnapshotRecords, write_snapshot
+from app.utils.fast_json import dumps_indented
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Records encoded at a time when a catalog file is rewritten
+WRITE_CHUNK = 10000
+
+# Lookup keys of every record of a catalog table, in table order
+TABLE_KEYS: Dict[str, Callable[[Any], Sequence[str]]] = {
+    "medicines": lambda medicines: [normalize_batch_code(code) for code in medicines.batch_code],
+    "pharmacies": lambda pharmacies: pharmacies.id
+}
+
+
+class _Catalog(NamedTuple):
+    signature: Optional[Tuple[int, int]]
+    generation: int
+    checked_at: float
+    # Table built from the JSON, or the lazy records of a binary snapshot
+    records: RecordView
+    # Lookup key -> record position (KeyIndex, or the snapshot's key table)
+    index: Union[KeyIndex, CatalogSnapshot]
+    snapshot: Optional[CatalogSnapshot] = None
+
+
+class JSONStorage(StorageBackend):
+    """
+    Storage backend that keeps each dataset in a JSON array file
+
+    Safe to share between worker processes: writes take a file lock and
+    replace files atomically, and every write bumps the dataset's counter
+    in a shared generation file. A cached catalog is reused while its
+    generation is unchanged, and the file is only stat()ed every
+    `check_interval` seconds to catch edits made outside the app.
+
+    With `use_snapshots`, medicines and pharmacies are served from binary
+    snapshots (see app.storage.snapshot) while they match their JSON files,
+    so lookups and nearby searches start without parsing the JSON. A stale
+    or missing snapshot is rebuilt in the background after the JSON is
+    parsed.
+    """
+
+    def __init__(
+        self,
+        data_dir: Path,
+        report_compact_every: int = 1000,
+        check_interval: float = 1.0,
+        use_snapshots: bool = True,
+        bulk_commit_rows: int = 500000,
+        bulk_commit_interval: float = 10.0
+    ):
+        self.data_dir = Path(data_dir)
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.check_interval = check_interval
+        self.use_snapshots = use_snapshots
+        self.bulk_commit_rows = bulk_commit_rows
+        self.bulk_commit_interval = bulk_commit_interval
+        self._snapshot_builds: Dict[Path, threading.Thread] = {}
+
+        # Cross-process write lock and change counters
+        self._write_lock = InterProcessLock(self.data_dir / "catalog.lock")
+        self.generations = GenerationCounters(self.data_dir / "generations", self.DATASETS)
+        
+        # Define data files
+        self.medicines_file = self.data_dir / "medicines.json"
+        self.pharmacies_file = self.data_dir / "pharmacies.json"
+        self.reports_file = self.data_dir / "reports.json"
+        self.reports_log_file = self.data_dir / "reports.jsonl"
+        
+        # Parsed catalogs keyed by file, rebuilt only when the file changes
+        self._catalog_lock = threading.Lock()
+        self._catalogs: Dict[Path, _Catalog] = {}
+        
+        # Initialize files if they don't exist
+        self._initialize_files()
+        
+        # reports.json is the snapshot; new writes go to the append-only log
+        self.reports = ReportLog(
+            self.reports_file,
+            self.reports_log_file,
+            compact_every=report_compact_every,
+            generations=self.generations,
+            check_interval=check_interval
+        )
+    
+    def _initialize_files(self):
+        """Initialize JSON files with empty arrays if they don't exist"""
+        with self._write_lock:
+            if not self.medicines_file.exists():
+                self._write_json(self.medicines_file, [])
+            if not self.pharmacies_file.exists():
+                self._write_json(self.pharmacies_file, [])
+            if not self.reports_file.exists():
+                self._write_json(self.reports_file, [])
+    
+    def _read_json(self, filepath: Path) -> List[Dict[str, Any]]:
+        """Read JSON file and return data"""
+        try:
+            with metrics.span("file_io"):
+                with open(filepath, 'r', encoding='utf-8') as f:
+                    content = f.read()
+            with metrics.span("json_parse"):
+                return json.loads(content)
+        except (json.JSONDecodeError, FileNotFoundError):
+            return []
+    
+    def _write_json(self, filepath: Path, data: List[Dict[str, Any]]):
+        """Atomically replace a JSON file; callers hold the write lock"""
+        atomic_write_bytes(filepath, json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8'))
+    
+    def _write_records(self, filepath: Path, records: Sequence[Dict[str, Any]]):
+        """
+        Atomically replace a JSON file with the same layout and values as
+        _write_json, encoding a chunk of records at a time so large
+        catalogs never exist as one list of dicts or one string
+        """
+        def chunks():
+            yield b"["
+            for start in range(0, len(records), WRITE_CHUNK):
+                data = dumps_indented(records[start:start + WRITE_CHUNK])
+                # The chunk's items without the enclosing "[" and "\n]"
+                yield (b"," if start else b"") + data[1:-2]
+            yield b"\n]" if len(records) else b"]"
+        
+        atomic_write_chunks(filepath, chunks())
+    
+    def _file_signature(self, filepath: Path) -> Optional[Tuple[int, int]]:
+        """Return (mtime_ns, size) of a file, or None if it is missing"""
+        try:
+            stat = filepath.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def _load_catalog(
+        self,
+        filepath: Path,
+        dataset: str,
+        table_type: Type[RecordView],
+        keys: Callable[[Any], Sequence[str]]
+    ) -> "_Catalog":
+        """Return the file as a record table with its key index, reloading if the file changed"""
+        generation = self.generations.get(dataset)
+        catalog = self._catalogs.get(filepath)
+        now = time.monotonic()
+        if catalog is not None and catalog.generation == generation \
+                and now - catalog.checked_at < self.check_interval:
+            return catalog
+        
+        with self._catalog_lock:
+            signature = self._file_signature(filepath)
+            catalog = self._catalogs.get(filepath)
+            if catalog is not None and catalog.signature == signature and catalog.generation == generation:
+                catalog = catalog._replace(checked_at=now)
+                self._catalogs[filepath] = catalog
+                return catalog
+            
+            if self.use_snapshots:
+                with metrics.span("file_io"):
+                    snapshot = CatalogSnapshot.open(filepath, dataset, signature)
+                if snapshot is not None:
+                    catalog = _Catalog(signature, generation, now, snapshot.records, snapshot, snapshot)
+                    self._catalogs[filepath] = catalog
+                    return catalog
+            
+            # Records are validated once here; snapshots are built from the
+            # validated table, so snapshot loads skip this. The parsed dicts
+            # are dropped once their values are in the table
+            with metrics.span("validate"):
+                validated = RECORD_CODECS[dataset].validate(self._read_json(filepath))
+            records = table_type(validated)
+            del validated
+            # First record wins, matching the order of the old linear scan
+            index = KeyIndex(keys(records))
+            
+            if self.use_snapshots and signature is not None and self._file_signature(filepath) == signature:
+                self._build_snapshot(filepath, dataset, records, signature)
+            
+            catalog = _Catalog(signature, generation, now, records, index)
+            self._catalogs[filepath] = catalog
+            return catalog
+    
+    def _build_snapshot(self, filepath: Path, dataset: str, records: RecordView, signature: Tuple[int, int]):
+        """Write a catalog's snapshot on a background thread, at most one build per file at a time"""
+        running = self._snapshot_builds.get(filepath)
+        if running is not None and running.is_alive():
+            return
+        
+        def build():
+            try:
+                write_snapshot(filepath, dataset, records, signature)
+            except OSError as e:
+                logger.warning("Could not write %s snapshot: %s", dataset, e)
+        
+        # Not a daemon thread, so exiting waits for the file instead of leaving a temp file
+        thread = threading.Thread(target=build, name=f"snapshot-{dataset}")
+        self._snapshot_builds[filepath] = thread
+        thread.start()
+    
+    @staticmethod
+    def _all(catalog: "_Catalog") -> RecordView:
+        records = catalog.records
+        return records.all() if isinstance(records, SnapshotRecords) else records
+    
+    @staticmethod
+    def _find(catalog: "_Catalog", key: str) -> Optional[Dict[str, Any]]:
+        position = catalog.index.position(key)
+        return catalog.records[position] if position is not None else None
+    
+    def batch_code_digest(self) -> str:
+        """Digest of the sorted key table the catalog already holds (KeyIndex or snapshot)"""
+        digest = KeyDigest()
+        keys = self._medicines().index.keys
+        for start in range(0, len(keys), DIGEST_CHUNK):
+            digest.update(keys[start:start + DIGEST_CHUNK].tolist())
+        return digest.hexdigest()
+    
+    def _medicines(self) -> "_Catalog":
+        return self._load_catalog(self.medicines_file, "medicines", MedicineTable, TABLE_KEYS["medicines"])
+    
+    def _pharmacies(self) -> "_Catalog":
+        return self._load_catalog(self.pharmacies_file, "pharmacies", PharmacyTable, TABLE_KEYS["pharmacies"])
+    
+    def dataset_version(self, dataset: str) -> Hashable:
+        """Version token derived from the backing files' mtime and size"""
+        if dataset == "medicines":
+            return self._medicines().signature
+        if dataset == "pharmacies":
+            return self._pharmacies().signature
+        if dataset == "reports":
+            return self.reports.version()
+        raise ValueError(f"Unknown dataset: {dataset}")
+    
+    # Medicine operations
+    def get_all_medicines(self) -> MedicineTable:
+        """Get all medicines as a read-only table of records"""
+        return self._all(self._medicines())
+    
+    def get_medicines_with_index(self) -> Tuple[RecordView, Union[KeyIndex, CatalogSnapshot]]:
+        """All medicines and the batch-code index of the same catalog"""
+        catalog = self._medicines()
+        return self._all(catalog), catalog.index
+
+    def find_medicine_by_batch_code(self, batch_code: str) -> Optional[Dict[str, Any]]:
+        """Find medicine by batch code"""
+        return self._find(self._medicines(), normalize_batch_code(batch_code))
+    
+    def find_medicines_by_batch_codes(self, batch_codes: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """Resolve many batch codes against one snapshot of the catalog"""
+        catalog = self._medicines()
+        return [self._find(catalog, normalize_batch_code(batch_code)) for batch_code in batch_codes]
+    
+    # Pharmacy operations
+    def get_all_pharmacies(self) -> PharmacyTable:
+        """Get all pharmacies as a read-only table of records"""
+        return self._all(self._pharmacies())
+    
+    def get_pharmacy_locations(self) -> Tuple[Sequence[Dict[str, Any]], np.ndarray, np.ndarray]:
+        """Coordinate columns of the snapshot or of the pharmacy table"""
+        catalog = self._pharmacies()
+        if catalog.snapshot is not None:
+            return catalog.records, catalog.snapshot.column("latitude"), catalog.snapshot.column("longitude")
+        return catalog.records, catalog.records.latitude, catalog.records.longitude
+    
+    def find_pharmacy_by_id(self, pharmacy_id: str) -> Optional[Dict[str, Any]]:
+        """Find pharmacy by ID"""
+        return self._find(self._pharmacies(), pharmacy_id)
+    
+    # Bulk catalog writes
+    def upsert_batches(
+        self,
+        dataset: str,
+        batches: Iterable[List[Dict[str, Any]]],
+        on_progress: Callable[[UpsertResult], None]
+    ):
+        """
+        Apply batches in groups, rewriting the file once per group
+
+        Rewriting the JSON file costs the same for one record as for all of
+        them, so batches are buffered and committed together: a group ends
+        once it holds `bulk_commit_rows` rows or `bulk_commit_interval`
+        seconds after its first batch arrived. Batches are read without the
+        write lock, which is held only while a group is applied and
+        written, so a slow upload does not block other writers. Each group
+        is one transaction; if the upload fails, groups already committed
+        stay, like the SQLite store's batches.
+
+        Memory is bounded by the group: its buffered records plus one copy
+        of the catalog table while it commits.
+        """
+        group: List[List[Dict[str, Any]]] = []
+        rows = 0
+        started = 0.0
+        for batch in batches:
+            if not group:
+                started = time.monotonic()
+            group.append(batch)
+            rows += len(batch)
+            if rows >= self.bulk_commit_rows or time.monotonic() - started >= self.bulk_commit_interval:
+                self._upsert_group(dataset, group, on_progress)
+                group, rows = [], 0
+        if group:
+            self._upsert_group(dataset, group, on_progress)
+
+    def _upsert_group(
+        self,
+        dataset: str,
+        batches: List[List[Dict[str, Any]]],
+        on_progress: Callable[[UpsertResult], None]
+    ):
+        """
+        Apply batches to a copy of the catalog table, then write the file
+        once
+
+        Existing records are replaced in place, new ones appended. The key
+        index is extended with the new keys rather than rebuilt, and the
+        new table becomes the cached catalog without parsing the file again.
+        """
+        filepath = self.medicines_file if dataset == "medicines" else self.pharmacies_file
+        key = CATALOGS[dataset][0]
+        with self._write_lock:
+            catalog = self._medicines() if dataset == "medicines" else self._pharmacies()
+            table = self._all(catalog).copy()
+            added: Dict[str, int] = {}
+            changed = False
+            
+            for batch in batches:
+                inserted, updated = 0, 0
+                appended: List[Dict[str, Any]] = []
+                keys = [key(record) for record in batch]
+                for record, record_key, existing in zip(batch, keys, catalog.index.lookup(keys)):
+                    position = added.get(record_key, existing)
+                    if position is None:
+                        added[record_key] = len(table) + len(appended)
+                        appended.append(record)
+                        inserted += 1
+                    elif position >= len(table):
+                        appended[position - len(table)] = record
+                        updated += 1
+                    else:
+                        table.assign(position, record)
+                        updated += 1
+                table.extend(appended)
+                changed = changed or bool(batch)
+                on_progress(UpsertResult(inserted, updated, []))
+            
+            if not changed:
+                return
+            with metrics.span("file_io"):
+                self._write_records(filepath, table)
+            signature = self._file_signature(filepath)
+            generation = self.generations.bump(dataset)
+            if isinstance(catalog.index, KeyIndex):
+                index = catalog.index.inserted(list(added), list(added.values()))
+            else:
+                index = KeyIndex(TABLE_KEYS[dataset](table))
+            with self._catalog_lock:
+                self._catalogs[filepath] = _Catalog(signature, generation, time.monotonic(), table, index)
+            if self.use_snapshots:
+                self._build_snapshot(filepath, dataset, table, signature)
+            on_progress(UpsertResult(0, 0, list(added), catalog.signature, signature))
+    
+    # Report operations
+    def get_all_reports(self) -> List[Dict[str, Any]]:
+        """Get all reports"""
+        return self.reports.all()
+    
+    def find_report_by_id(self, report_id: str) -> Optional[Dict[str, Any]]:
+        """Find report by ID"""
+        return self.reports.get(report_id)
+    
+    def find_reports(self, status: Optional[str] = None, batch_code: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Filter reports through the report log's secondary indexes"""
+        return self.reports.find(status=status, batch_code=batch_code)
+    
+    def get_report_stats(self, top: int = 10) -> Dict[str, Any]:
+        """Report counters maintained by the report log"""
+        return self.reports.stats(top)
+    
+    def get_page(self, dataset: str, position: int, limit: int) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """Page through a dataset by list position"""
+        if dataset == "reports":
+            return self.reports.page(position, limit)
+        # Snapshot records decode only the requested slice
+        catalog = self._medicines() if dataset == "medicines" else self._pharmacies()
+        page = catalog.records[position:position + limit]
+        end = position + len(page)
+        return page, (end if end < len(catalog.records) else None)
+    
+    def insert_report(self, report: Dict[str, Any]) -> Dict[str, Any]:
+        """Add new report"""
+        return self.reports.create(report)
+
+    def insert_reports(self, reports: List[Dict[str, Any]]):
+        """Append a batch of reports with one write and one fsync, skipping IDs already stored"""
+        self.reports.create_many(reports)
+    
+    def update_report(self, report_id: str, changes: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Update report fields"""
+        return self.reports.update(report_id, changes)
+    
+    def close(self):
+        """Finish snapshot writes and release the shared generation map"""
+        for thread in list(self._snapshot_builds.values()):
+            thread.join()
+        self.generations.close()
@@ -0,0 +1,240 @@
+# backend/app/storage/records.py
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from app.models import Medicine, Pharmacy, Report
+from app.utils.fast_json import RecordCodec
+
+# Validate stored records once on the way in and serialize them directly
+# on the way out; see RecordCodec
+RECORD_CODECS: Dict[str, RecordCodec] = {
+    "medicines": RecordCodec(Medicine),
+    "pharmacies": RecordCodec(Pharmacy),
+    "reports": RecordCodec(Report)
+}
+
+
+class RecordView(Sequence):
+    """
+    Read-only sequence of records that builds a new dict for each access
+
+    Records are stored compactly and only become dicts at the response
+    boundary, so callers may change a returned dict without affecting the
+    store or other callers.
+    """
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return [self.record(i) for i in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError("record index out of range")
+        return self.record(position)
+
+    def record(self, position: int) -> Dict[str, Any]:
+        raise NotImplementedError
+
+
+class _StringPool:
+    """Share one str object between equal values (names, companies, dates repeat a lot)"""
+
+    def __init__(self):
+        self._pool: Dict[str, str] = {}
+
+    def __call__(self, value: str) -> str:
+        return self._pool.setdefault(value, value)
+
+
+def lookup_positions(sorted_keys: np.ndarray, positions: np.ndarray, query: np.ndarray) -> List[Optional[int]]:
+    """Positions of the query keys in a sorted key array (None where absent)"""
+    if not len(sorted_keys) or not len(query):
+        return [None] * len(query)
+    slots = np.minimum(np.searchsorted(sorted_keys, query), len(sorted_keys) - 1)
+    found = (sorted_keys[slots] == query).tolist()
+    return [int(position) if hit else None for position, hit in zip(positions[slots].tolist(), found)]
+
+
+class KeyIndex:
+    """
+    Exact-match index from string keys to positions
+
+    Keys live in one sorted numpy string array with the position of each,
+    instead of a dict holding a str object per key. The first position
+    wins when a key repeats.
+    """
+
+    def __init__(self, keys: Sequence[str]):
+        if len(keys):
+            unique, first = np.unique(np.array(keys, dtype=str), return_index=True)
+        else:
+            unique, first = np.zeros(0, dtype="U1"), np.zeros(0, dtype=np.int64)
+        self.keys = unique
+        self.positions = first.astype(np.uint32)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def position(self, key: str) -> Optional[int]:
+        if len(key) > self.keys.dtype.itemsize // 4:
+            return None
+        i = int(np.searchsorted(self.keys, key))
+        if i < len(self.keys) and self.keys[i] == key:
+            return int(self.positions[i])
+        return None
+
+    def lookup(self, keys: Sequence[str]) -> List[Optional[int]]:
+        """Positions of many keys in one vectorized search (None where absent)"""
+        return lookup_positions(self.keys, self.positions, np.array(keys, dtype=str))
+
+    def inserted(self, keys: Sequence[str], positions: Sequence[int]) -> "KeyIndex":
+        """
+        A new index with keys added that are not in this one yet
+
+        The new keys are sorted and merged into the existing sorted array,
+        so adding a batch costs one pass instead of a full rebuild.
+        """
+        if not len(keys):
+            return self
+        new_keys = np.array(keys, dtype=str)
+        order = np.argsort(new_keys, kind="stable")
+        new_keys = new_keys[order]
+        width = max(self.keys.dtype.itemsize, new_keys.dtype.itemsize) // 4
+        existing = self.keys.astype(f"U{width}", copy=False)
+        slots = np.searchsorted(existing, new_keys)
+
+        index = KeyIndex.__new__(KeyIndex)
+        index.keys = np.insert(existing, slots, new_keys)
+        index.positions = np.insert(self.positions, slots, np.asarray(positions, dtype=np.uint32)[order])
+        return index
+
+
+class _ColumnTable(RecordView):
+    """Records stored as parallel columns that bulk writes can copy and change"""
+
+    def copy(self) -> "_ColumnTable":
+        """An independent copy, so a writer can change it while readers use this one"""
+        table = type(self).__new__(type(self))
+        for name, column in vars(self).items():
+            setattr(table, name, column.copy())
+        return table
+
+    def extend(self, records: Iterable[Dict[str, Any]]):
+        """Append records"""
+        raise NotImplementedError
+
+    def assign(self, position: int, record: Dict[str, Any]):
+        """Replace the record at a position"""
+        raise NotImplementedError
+
+
+class MedicineTable(_ColumnTable):
+    """Medicines as parallel columns; one dict is built per record returned"""
+
+    def __init__(self, medicines: Iterable[Dict[str, Any]]):
+        self.id: List[str] = []
+        self.batch_code: List[str] = []
+        self.name: List[str] = []
+        self.company: List[str] = []
+        self.expiry_date: List[str] = []
+        self.manufacturing_date: List[str] = []
+        self.is_authentic = bytearray()
+        self.extend(medicines)
+
+    def extend(self, medicines: Iterable[Dict[str, Any]]):
+        """Append medicines"""
+        pool = _StringPool()
+        for medicine in medicines:
+            self.id.append(medicine.get('id'))
+            self.batch_code.append(medicine.get('batch_code'))
+            self.name.append(pool(medicine.get('name')))
+            self.company.append(pool(medicine.get('company')))
+            self.expiry_date.append(pool(medicine.get('expiry_date')))
+            self.manufacturing_date.append(pool(medicine.get('manufacturing_date')))
+            self.is_authentic.append(bool(medicine.get('is_authentic')))
+
+    def assign(self, position: int, medicine: Dict[str, Any]):
+        self.id[position] = medicine.get('id')
+        self.batch_code[position] = medicine.get('batch_code')
+        self.name[position] = medicine.get('name')
+        self.company[position] = medicine.get('company')
+        self.expiry_date[position] = medicine.get('expiry_date')
+        self.manufacturing_date[position] = medicine.get('manufacturing_date')
+        self.is_authentic[position] = bool(medicine.get('is_authentic'))
+
+    @classmethod
+    def from_records(cls, medicines: Sequence[Dict[str, Any]]) -> "MedicineTable":
+        """Reuse a table as is; convert any other sequence of medicine dicts"""
+        return medicines if isinstance(medicines, cls) else cls(medicines)
+
+    def __len__(self) -> int:
+        return len(self.id)
+
+    def record(self, position: int) -> Dict[str, Any]:
+        return {
+            "id": self.id[position],
+            "batch_code": self.batch_code[position],
+            "name": self.name[position],
+            "company": self.company[position],
+            "expiry_date": self.expiry_date[position],
+            "is_authentic": bool(self.is_authentic[position]),
+            "manufacturing_date": self.manufacturing_date[position]
+        }
+
+
+class PharmacyTable(_ColumnTable):
+    """Pharmacies as parallel columns, with coordinates in float64 arrays"""
+
+    def __init__(self, pharmacies: Sequence[Dict[str, Any]]):
+        self.id: List[str] = []
+        self.name: List[str] = []
+        self.address: List[str] = []
+        self.phone: List[str] = []
+        self.latitude = np.zeros(0, dtype=np.float64)
+        self.longitude = np.zeros(0, dtype=np.float64)
+        self.extend(pharmacies)
+
+    def extend(self, pharmacies: Sequence[Dict[str, Any]]):
+        """Append pharmacies, growing the coordinate arrays once"""
+        start = len(self.id)
+        self.latitude = np.concatenate([self.latitude, np.empty(len(pharmacies), dtype=np.float64)])
+        self.longitude = np.concatenate([self.longitude, np.empty(len(pharmacies), dtype=np.float64)])
+        for position, pharmacy in enumerate(pharmacies, start):
+            self.id.append(pharmacy.get('id'))
+            self.name.append(pharmacy.get('name'))
+            self.address.append(pharmacy.get('address'))
+            self.phone.append(pharmacy.get('phone'))
+            self._set_location(position, pharmacy)
+
+    def _set_location(self, position: int, pharmacy: Dict[str, Any]):
+        location = pharmacy.get('location') or {}
+        self.latitude[position] = location.get('latitude', np.nan)
+        self.longitude[position] = location.get('longitude', np.nan)
+
+    def assign(self, position: int, pharmacy: Dict[str, Any]):
+        self.id[position] = pharmacy.get('id')
+        self.name[position] = pharmacy.get('name')
+        self.address[position] = pharmacy.get('address')
+        self.phone[position] = pharmacy.get('phone')
+        self._set_location(position, pharmacy)
+
+    @classmethod
+    def from_records(cls, pharmacies: Sequence[Dict[str, Any]]) -> "PharmacyTable":
+        """Reuse a table as is; convert any other sequence of pharmacy dicts"""
+        return pharmacies if isinstance(pharmacies, cls) else cls(pharmacies)
+
+    def __len__(self) -> int:
+        return len(self.id)
+
+    def record(self, position: int) -> Dict[str, Any]:
+        return {
+            "id": self.id[position],
+            "name": self.name[position],
+            "address": self.address[position],
+            "phone": self.phone[position],
+            "location": {
+                "latitude": float(self.latitude[position]),
+                "longitude": float(self.longitude[position])
+            }
+        }
@@ -0,0 +1,305 @@
+# backend/app/storage/report_log.py
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional, Dict, Any, Tuple
+
+from app.storage.base import normalize_batch_code
+from app.storage.records import RECORD_CODECS
+from app.storage.shared_state import GenerationCounters, InterProcessLock, atomic_write_bytes
+from app.utils.counters import RankedCounter
+from app.utils.metrics import metrics
+
+
+class ReportLog:
+    """
+    Reports kept as a JSON snapshot plus an append-only JSON-lines event log
+
+    Every write appends one event line to the log, so submitting a report
+    costs the same regardless of how many reports exist. State is rebuilt
+    by loading the snapshot and replaying the log; once the log holds
+    `compact_every` events it is folded into a new snapshot and truncated.
+
+    Event lines look like:
+        {"op": "create", "report": {...}}
+        {"op": "update", "id": "...", "changes": {...}}
+
+    Secondary indexes by status and by batch code, and the counters behind
+    stats(), are updated as events are applied, so filtering and stats
+    never scan every report. Readers get copies of the reports, so a
+    concurrent refresh() never changes a dict a caller is holding.
+
+    Writes hold a file lock, so several worker processes can share the
+    files. With `generations`, each write bumps the shared "reports"
+    counter; while it is unchanged, refresh() skips the stat() calls for
+    up to `check_interval` seconds.
+    """
+
+    def __init__(
+        self,
+        snapshot_file: Path,
+        log_file: Path,
+        compact_every: int = 1000,
+        generations: Optional[GenerationCounters] = None,
+        check_interval: float = 1.0
+    ):
+        self.snapshot_file = Path(snapshot_file)
+        self.log_file = Path(log_file)
+        self.compact_every = compact_every
+        self.generations = generations
+        self.check_interval = check_interval
+
+        self._lock = threading.RLock()
+        self._file_lock = InterProcessLock(self.log_file.with_suffix(".lock"))
+        self._seen_generation: Optional[int] = None
+        self._checked_at = float("-inf")
+        self._reports: Dict[str, Dict[str, Any]] = {}
+        # Report IDs in submission order, for paging by position
+        self._order: List[str] = []
+        self._reset_indexes()
+        self._snapshot_signature: Optional[Tuple[int, int]] = None
+        self._log_offset = 0
+        self._log_events = 0
+
+        with self._file_lock:
+            if not self.snapshot_file.exists():
+                self._write_snapshot([])
+
+    @staticmethod
+    def _signature(filepath: Path) -> Optional[Tuple[int, int]]:
+        try:
+            stat = filepath.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _write_snapshot(self, reports: List[Dict[str, Any]]):
+        """Atomically replace the snapshot file"""
+        atomic_write_bytes(
+            self.snapshot_file,
+            json.dumps(reports, indent=2, ensure_ascii=False).encode('utf-8')
+        )
+
+    def _reset_indexes(self):
+        self._rank: Dict[str, int] = {}
+        self._by_status: Dict[str, Dict[str, None]] = {}
+        self._by_batch: Dict[str, Dict[str, None]] = {}
+        self._batch_counts = RankedCounter()
+        # Batch code as first reported, shown in stats for each normalized key
+        self._batch_labels: Dict[str, str] = {}
+
+    def _index(self, report: Dict[str, Any]):
+        report_id = report['id']
+        self._by_status.setdefault(report['status'], {})[report_id] = None
+        key = normalize_batch_code(report['batch_code'])
+        self._by_batch.setdefault(key, {})[report_id] = None
+        self._batch_labels.setdefault(key, report['batch_code'])
+        self._batch_counts.add(key)
+
+    def _unindex(self, report: Dict[str, Any]):
+        report_id = report['id']
+        self._by_status[report['status']].pop(report_id, None)
+        key = normalize_batch_code(report['batch_code'])
+        self._by_batch[key].pop(report_id, None)
+        self._batch_counts.add(key, -1)
+
+    def _load_snapshot(self):
+        try:
+            with metrics.span("file_io"):
+                with open(self.snapshot_file, 'r', encoding='utf-8') as f:
+                    content = f.read()
+            with metrics.span("json_parse"):
+                reports = json.loads(content)
+            with metrics.span("validate"):
+                reports = RECORD_CODECS["reports"].validate(reports)
+        except (json.JSONDecodeError, FileNotFoundError):
+            reports = []
+
+        self._reports = {report['id']: report for report in reports}
+        self._order = list(self._reports)
+        self._reset_indexes()
+        for rank, report in enumerate(self._reports.values()):
+            self._rank[report['id']] = rank
+            self._index(report)
+        self._log_offset = 0
+        self._log_events = 0
+
+    def _apply(self, event: Dict[str, Any]):
+        op = event.get("op")
+        if op == "create":
+            report = event["report"]
+            previous = self._reports.get(report['id'])
+            if previous is None:
+                self._rank[report['id']] = len(self._order)
+                self._order.append(report['id'])
+            else:
+                self._unindex(previous)
+            self._reports[report['id']] = report
+            self._index(report)
+        elif op == "update":
+            report = self._reports.get(event["id"])
+            if report is not None:
+                self._unindex(report)
+                report.update(event["changes"])
+                self._index(report)
+
+    def _replay_log(self):
+        """Apply log events written since the last replay"""
+        try:
+            with metrics.span("file_io"):
+                with open(self.log_file, 'rb') as f:
+                    f.seek(self._log_offset)
+                    data = f.read()
+        except FileNotFoundError:
+            return
+
+        # Only consume complete lines; a partial trailing line is still being written
+        end = data.rfind(b"\n") + 1
+        with metrics.span("json_parse"):
+            for line in data[:end].splitlines():
+                if line.strip():
+                    self._apply(json.loads(line))
+                    self._log_events += 1
+        self._log_offset += end
+
+    def refresh(self):
+        """Bring in-memory state up to date with the snapshot and log on disk"""
+        with self._lock:
+            generation = self.generations.get("reports") if self.generations is not None else None
+            now = time.monotonic()
+            if generation is not None and generation == self._seen_generation \
+                    and now - self._checked_at < self.check_interval:
+                return
+            self._seen_generation = generation
+            self._checked_at = now
+
+            # Held while reading so a compaction cannot replace the snapshot
+            # and truncate the log between the stat() calls and the reads
+            with self._file_lock:
+                snapshot_signature = self._signature(self.snapshot_file)
+                log_signature = self._signature(self.log_file)
+                log_size = log_signature[1] if log_signature else 0
+
+                if snapshot_signature != self._snapshot_signature or log_size < self._log_offset:
+                    # Snapshot replaced or log truncated: rebuild from scratch
+                    self._load_snapshot()
+                    self._snapshot_signature = snapshot_signature
+
+                if log_size > self._log_offset:
+                    self._replay_log()
+
+    def _append(self, *events: Dict[str, Any], sync: bool = False):
+        data = b"".join(json.dumps(event, ensure_ascii=False).encode('utf-8') + b"\n" for event in events)
+        with self._lock, self._file_lock:
+            self.refresh()
+            with open(self.log_file, 'ab') as f:
+                f.write(data)
+                if sync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            self._changed()
+            self.refresh()
+
+            if self._log_events >= self.compact_every:
+                self.compact()
+
+    def compact(self):
+        """Fold the event log into a new snapshot and truncate the log"""
+        with self._lock, self._file_lock:
+            self.refresh()
+            self._write_snapshot(list(self._reports.values()))
+            # Replaying the log again after a crash here is harmless because
+            # create and update events are idempotent
+            with open(self.log_file, 'wb'):
+                pass
+            self._snapshot_signature = self._signature(self.snapshot_file)
+            self._log_offset = 0
+            self._log_events = 0
+            self._changed()
+
+    def _changed(self):
+        """Tell every process, this one included, that the files changed"""
+        if self.generations is not None:
+            self.generations.bump("reports")
+        self._checked_at = float("-inf")
+
+    def version(self) -> Tuple[Optional[Tuple[int, int]], int]:
+        """Version token that changes whenever a report is written"""
+        with self._lock:
+            self.refresh()
+            return (self._snapshot_signature, self._log_offset)
+
+    def all(self) -> List[Dict[str, Any]]:
+        """Get all reports in submission order"""
+        with self._lock:
+            self.refresh()
+            return [dict(report) for report in self._reports.values()]
+
+    def get(self, report_id: str) -> Optional[Dict[str, Any]]:
+        """Get a report by ID"""
+        with self._lock:
+            self.refresh()
+            report = self._reports.get(report_id)
+            return dict(report) if report is not None else None
+
+    def page(self, position: int, limit: int) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """Reports `position` to `position + limit` in submission order, and where the next page starts"""
+        with self._lock:
+            self.refresh()
+            ids = self._order[position:position + limit]
+            end = position + len(ids)
+            return [dict(self._reports[report_id]) for report_id in ids], (end if end < len(self._order) else None)
+
+    def find(self, status: Optional[str] = None, batch_code: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Reports matching every given filter, in submission order"""
+        with self._lock:
+            self.refresh()
+            candidates = []
+            if status is not None:
+                candidates.append(self._by_status.get(status, {}))
+            if batch_code is not None:
+                candidates.append(self._by_batch.get(normalize_batch_code(batch_code), {}))
+            if not candidates:
+                return [dict(report) for report in self._reports.values()]
+
+            candidates.sort(key=len)
+            ids = [report_id for report_id in candidates[0] if all(report_id in other for other in candidates[1:])]
+            ids.sort(key=self._rank.__getitem__)
+            return [dict(self._reports[report_id]) for report_id in ids]
+
+    def stats(self, top: int = 10) -> Dict[str, Any]:
+        """Report counts per status and the most reported batch codes"""
+        with self._lock:
+            self.refresh()
+            return {
+                "total": len(self._reports),
+                "by_status": {status: len(ids) for status, ids in self._by_status.items() if ids},
+                "top_batches": [
+                    {"batch_code": self._batch_labels[key], "count": count}
+                    for key, count in self._batch_counts.top(top)
+                ]
+            }
+
+    def create(self, report: Dict[str, Any]) -> Dict[str, Any]:
+        """Append a create event for a new report"""
+        self._append({"op": "create", "report": report})
+        return report
+
+    def create_many(self, reports: List[Dict[str, Any]]):
+        """Append create events for reports not logged yet and fsync the log once"""
+        with self._lock, self._file_lock:
+            self.refresh()
+            reports = [report for report in reports if report['id'] not in self._reports]
+            if reports:
+                self._append(*({"op": "create", "report": report} for report in reports), sync=True)
+
+    def update(self, report_id: str, changes: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Append an update event if the report exists"""
+        with self._lock:
+            self.refresh()
+            if report_id not in self._reports:
+                return None
+            self._append({"op": "update", "id": report_id, "changes": changes})
+            return dict(self._reports[report_id])
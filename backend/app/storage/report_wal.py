@@ -0,0 +1,298 @@
+# backend/app/storage/report_wal.py
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import uuid
+from pathlib import Path
+from typing import List, Dict, Any, Tuple
+
+from app.storage.base import StorageBackend
+from app.storage.shared_state import try_lock_file
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Errors that mean the store itself is failing, not one report: the whole
+# batch stays queued and is retried
+STORE_ERRORS = (OSError, sqlite3.OperationalError)
+
+
+class ReportIngestor:
+    """
+    Write-ahead, group-committed report ingestion
+
+    submit() appends the report to the current write-ahead segment and
+    returns once the segment has been fsynced. Concurrent submitters share
+    one fsync: whichever caller finds no sync running syncs everything
+    written so far and wakes the others.
+
+    Acknowledged reports wait in memory until a background thread commits
+    them to the storage backend with one insert_reports() call, every
+    `commit_interval` seconds or as soon as `commit_batch_size` reports are
+    pending. Each commit seals the active segment and starts a new one;
+    sealed segments are deleted once their reports are in the store. On
+    startup, segments left by a crashed process are replayed and reports
+    the store does not have yet are inserted.
+
+    insert_reports() skips reports the store already has, so a batch can
+    be committed again after a partial failure. If a group commit fails
+    for any reason other than STORE_ERRORS, its reports are committed one
+    at a time. Reports the store still refuses are appended to
+    <wal_file>.rejected with the error, so they cannot hold back the rest.
+    """
+
+    def __init__(
+        self,
+        storage: StorageBackend,
+        wal_file: Path,
+        commit_interval: float = 0.05,
+        commit_batch_size: int = 500
+    ):
+        self.storage = storage
+        self.wal_file = Path(wal_file)
+        self.commit_interval = commit_interval
+        self.commit_batch_size = commit_batch_size
+
+        # Guards the active segment, the write counter and the pending buffer
+        self._lock = threading.Lock()
+        # Guards the fsync leader election; always taken before _lock
+        self._sync_cond = threading.Condition()
+        # Serializes commits to the storage backend
+        self._commit_lock = threading.Lock()
+
+        self._pending: List[Dict[str, Any]] = []
+        self._written = 0
+        self._synced = 0
+        self._syncing = False
+        self._sealed: List[Path] = []
+
+        self.rejected_file = self.wal_file.with_name(self.wal_file.name + ".rejected")
+        self.commits = 0
+        self.committed = 0
+        self.rejected = 0
+
+        # Each process writes its own segments, named
+        # <wal_file>.<owner>.<sequence>, and holds <wal_file>.<owner>.lock
+        # while it runs; segments whose owner lock is free belong to a
+        # process that died and are replayed here
+        self._recover()
+        self.owner = uuid.uuid4().hex[:12]
+        self._owner_lock_path = self._lock_path(self.owner)
+        self._owner_fd = try_lock_file(self._owner_lock_path)
+        if self._owner_fd is None:
+            raise RuntimeError(f"Write-ahead log lock {self._owner_lock_path} is held by another process")
+        self._sequence = 1
+        self._fd = self._open_segment(self._sequence)
+
+        self._stopping = False
+        self._wakeup = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="report-commit", daemon=True)
+        self._thread.start()
+
+    def _lock_path(self, owner: str) -> Path:
+        return self.wal_file.with_name(f"{self.wal_file.name}.{owner}.lock")
+
+    def _segment_path(self, sequence: int) -> Path:
+        return self.wal_file.with_name(f"{self.wal_file.name}.{self.owner}.{sequence:08d}")
+
+    def _segments_by_owner(self) -> Dict[str, List[Path]]:
+        pattern = re.compile(re.escape(self.wal_file.name) + r"\.([0-9a-f]+)\.(\d+|lock)$")
+        owners: Dict[str, List[Tuple[int, Path]]] = {}
+        for path in self.wal_file.parent.glob(self.wal_file.name + ".*"):
+            match = pattern.match(path.name)
+            if match is None:
+                continue
+            segments = owners.setdefault(match.group(1), [])
+            if match.group(2) != "lock":
+                segments.append((int(match.group(2)), path))
+        return {owner: [path for _, path in sorted(segments)] for owner, segments in owners.items()}
+
+    def _open_segment(self, sequence: int) -> int:
+        return os.open(self._segment_path(sequence), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+
+    def _recover(self):
+        """Replay segments left by processes that are no longer running"""
+        for owner in self._segments_by_owner():
+            lock_path = self._lock_path(owner)
+            fd = try_lock_file(lock_path)
+            if fd is None:
+                continue  # owner is alive
+            try:
+                # Re-list under the lock; another process may have recovered them first
+                segments = self._segments_by_owner().get(owner, [])
+                self._replay(segments)
+                for path in segments:
+                    path.unlink(missing_ok=True)
+                lock_path.unlink(missing_ok=True)
+            finally:
+                os.close(fd)
+
+    def _replay(self, segments: List[Path]):
+        replayed: Dict[str, Dict[str, Any]] = {}
+        for path in segments:
+            try:
+                data = path.read_bytes()
+            except FileNotFoundError:
+                continue
+            # A torn trailing line was never acknowledged
+            end = data.rfind(b"\n") + 1
+            for line in data[:end].splitlines():
+                if line.strip():
+                    report = json.loads(line)
+                    replayed[report['id']] = report
+        if not replayed:
+            return
+
+        missing = [
+            report for report_id, report in replayed.items()
+            if self.storage.find_report_by_id(report_id) is None
+        ]
+        if missing:
+            self._commit(missing)
+        logger.info(
+            "Recovered %s reports from %s write-ahead segments (%s already committed)",
+            len(missing), len(segments), len(replayed) - len(missing)
+        )
+
+    def submit(self, report: Dict[str, Any]) -> Dict[str, Any]:
+        """Durably log a report and queue it for the next group commit"""
+        line = json.dumps(report, ensure_ascii=False).encode('utf-8') + b"\n"
+        with self._lock:
+            os.write(self._fd, line)
+            self._written += 1
+            ticket = self._written
+            self._pending.append(report)
+            if len(self._pending) >= self.commit_batch_size:
+                self._wakeup.set()
+
+        self._wait_durable(ticket)
+        return report
+
+    def _wait_durable(self, ticket: int):
+        with self._sync_cond:
+            while self._synced < ticket:
+                if self._syncing:
+                    self._sync_cond.wait()
+                    continue
+
+                # Become the leader and sync everything written so far
+                self._syncing = True
+                with self._lock:
+                    target = self._written
+                    fd = self._fd
+                self._sync_cond.release()
+                try:
+                    with metrics.span("wal_fsync"):
+                        os.fsync(fd)
+                finally:
+                    self._sync_cond.acquire()
+                    self._syncing = False
+                    self._synced = max(self._synced, target)
+                    self._sync_cond.notify_all()
+
+    def _seal(self) -> List[Dict[str, Any]]:
+        """Take the pending reports and switch writers to a fresh segment"""
+        with self._sync_cond:
+            while self._syncing:
+                self._sync_cond.wait()
+            with self._lock:
+                batch, self._pending = self._pending, []
+                if not batch:
+                    return batch
+                os.fsync(self._fd)
+                os.close(self._fd)
+                self._sealed.append(self._segment_path(self._sequence))
+                self._sequence += 1
+                self._fd = self._open_segment(self._sequence)
+                self._synced = self._written
+            self._sync_cond.notify_all()
+        return batch
+
+    def _commit(self, reports: List[Dict[str, Any]]) -> int:
+        """Insert reports into the store and return how many it rejected"""
+        try:
+            with metrics.span("report_group_commit"):
+                self.storage.insert_reports(reports)
+            return 0
+        except STORE_ERRORS:
+            raise
+        except Exception as e:
+            logger.warning("Group commit of %s reports failed (%s); committing them one at a time", len(reports), e)
+
+        rejected = 0
+        for report in reports:
+            try:
+                self.storage.insert_reports([report])
+            except STORE_ERRORS:
+                raise
+            except Exception as e:
+                self._reject(report, e)
+                rejected += 1
+        return rejected
+
+    def _reject(self, report: Dict[str, Any], error: Exception):
+        """Set aside a report the store refuses, keeping it for inspection"""
+        line = json.dumps({"error": str(error), "report": report}, ensure_ascii=False).encode('utf-8') + b"\n"
+        with open(self.rejected_file, 'ab') as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        logger.error("Report %s rejected by the store: %s (kept in %s)", report.get('id'), error, self.rejected_file)
+
+    def flush(self):
+        """Commit every acknowledged report to the store now"""
+        with self._commit_lock:
+            batch = self._seal()
+            if not batch:
+                return
+            try:
+                rejected = self._commit(batch)
+            except Exception:
+                # Keep the segments; put the batch back for the next attempt
+                with self._lock:
+                    self._pending[:0] = batch
+                raise
+
+            for path in self._sealed:
+                path.unlink(missing_ok=True)
+            self._sealed = []
+            self.commits += 1
+            self.committed += len(batch) - rejected
+            self.rejected += rejected
+
+    def _run(self):
+        while not self._stopping:
+            self._wakeup.wait(self.commit_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error("Report group commit failed: %s", e)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "pending": len(self._pending),
+            "commits": self.commits,
+            "committed": self.committed,
+            "rejected": self.rejected
+        }
+
+    def close(self):
+        """Stop the commit thread and commit what is left"""
+        self._stopping = True
+        self._wakeup.set()
+        self._thread.join()
+        try:
+            self.flush()
+        finally:
+            with self._lock:
+                os.close(self._fd)
+                # With reports left, keep the segments and lock file for the
+                # next startup to replay
+                if not self._pending:
+                    self._segment_path(self._sequence).unlink(missing_ok=True)
+                    self._owner_lock_path.unlink(missing_ok=True)
+                os.close(self._owner_fd)
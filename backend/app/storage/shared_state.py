@@ -0,0 +1,125 @@
+# backend/app/storage/shared_state.py
+import mmap
+import os
+import struct
+import threading
+from pathlib import Path
+from typing import Iterable
+
+try:
+    import fcntl
+except ImportError:  # Windows: locks only cover threads of this process
+    fcntl = None
+
+
+class InterProcessLock:
+    """
+    Exclusive lock shared by the threads of this process and by other processes
+
+    Backed by flock() on a lock file that stays open for the life of the
+    object. Re-entrant within a thread.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+
+    def __enter__(self):
+        self._thread_lock.acquire()
+        if self._depth == 0 and fcntl is not None:
+            try:
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            except BaseException:
+                self._thread_lock.release()
+                raise
+        self._depth += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        self._depth -= 1
+        if self._depth == 0 and fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._thread_lock.release()
+
+    def close(self):
+        os.close(self._fd)
+
+
+def try_lock_file(path: Path):
+    """Open and exclusively lock a file without blocking; return the fd or None if another process holds it"""
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    if fcntl is None:
+        return fd
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        os.close(fd)
+        return None
+    return fd
+
+
+def atomic_write_bytes(filepath: Path, data: bytes):
+    """Replace a file in one step so readers in any process see old or new content, never a mix"""
+    atomic_write_chunks(filepath, (data,))
+
+
+def atomic_write_chunks(filepath: Path, chunks: Iterable[bytes]):
+    """Like atomic_write_bytes, writing the content piece by piece instead of from one buffer"""
+    filepath = Path(filepath)
+    tmp_file = filepath.with_name(f".{filepath.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_file, 'wb') as f:
+            for chunk in chunks:
+                f.write(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+    except BaseException:
+        tmp_file.unlink(missing_ok=True)
+        raise
+    os.replace(tmp_file, filepath)
+
+
+class GenerationCounters:
+    """
+    Per-dataset change counters shared by all worker processes
+
+    The counters live in a small memory-mapped file, so reading one is a
+    memory load rather than a syscall. Writers bump a dataset's counter
+    after changing it; readers compare it with the value they last saw to
+    decide whether their cached copy is still current.
+    """
+
+    SLOT = struct.Struct("<Q")
+    SIZE = 4096
+
+    def __init__(self, path: Path, names: Iterable[str]):
+        self.path = Path(path)
+        self._offsets = {name: i * self.SLOT.size for i, name in enumerate(names)}
+        if len(self._offsets) * self.SLOT.size > self.SIZE:
+            raise ValueError("Too many generation counters")
+        self._lock = InterProcessLock(self.path.with_name(self.path.name + ".lock"))
+
+        with self._lock:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                if os.fstat(fd).st_size < self.SIZE:
+                    os.ftruncate(fd, self.SIZE)
+                self._map = mmap.mmap(fd, self.SIZE)
+            finally:
+                os.close(fd)
+
+    def get(self, name: str) -> int:
+        return self.SLOT.unpack_from(self._map, self._offsets[name])[0]
+
+    def bump(self, name: str) -> int:
+        """Record a change to a dataset and return its new generation"""
+        offset = self._offsets[name]
+        with self._lock:
+            value = self.SLOT.unpack_from(self._map, offset)[0] + 1
+            self.SLOT.pack_into(self._map, offset, value)
+            return value
+
+    def close(self):
+        self._map.close()
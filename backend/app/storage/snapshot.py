@@ -0,0 +1,234 @@
+# backend/app/storage/snapshot.py
+"""
+Compact binary snapshots of the JSON catalogs
+
+A snapshot holds the same records as its JSON source, laid out so a
+worker can start serving without parsing the source:
+
+- the records as one compact JSON array, with the byte bounds of every
+  record, so a single record decodes on its own and the whole catalog
+  decodes with one json.loads
+- a sorted table of lookup keys (normalized batch codes, pharmacy IDs)
+  with the position of the record for each key
+- optional numeric columns, such as pharmacy coordinates
+
+Everything is read through mmap; the key table and columns are numpy
+views of the mapping, so opening a snapshot copies nothing. A snapshot is
+tagged with the (mtime_ns, size) of the JSON file it was built from and is
+only used while that file is unchanged.
+
+Build snapshots ahead of a deploy (from backend/):
+    python -m app.storage.snapshot --data-dir data
+"""
+import argparse
+import json
+import mmap
+import struct
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type
+
+import numpy as np
+
+from app.storage.base import normalize_batch_code
+from app.storage.records import RECORD_CODECS, MedicineTable, PharmacyTable, RecordView, lookup_positions
+from app.storage.shared_state import atomic_write_bytes
+
+MAGIC = b"AMFSNAP1"
+# magic, record count, source mtime_ns, source size, section count
+HEADER = struct.Struct("<8sQqqI4x")
+# name, numpy dtype, offset, element count
+SECTION = struct.Struct("<16s8sQQ")
+ALIGNMENT = 8
+
+# Lookup key and numeric columns of each snapshotted catalog
+CATALOGS: Dict[str, Tuple[Callable[[Dict[str, Any]], str], Dict[str, Callable[[Dict[str, Any]], float]]]] = {
+    "medicines": (lambda medicine: normalize_batch_code(medicine['batch_code']), {}),
+    "pharmacies": (
+        lambda pharmacy: pharmacy['id'],
+        {
+            "latitude": lambda pharmacy: pharmacy['location']['latitude'],
+            "longitude": lambda pharmacy: pharmacy['location']['longitude']
+        }
+    )
+}
+# In-memory table a snapshot's records are loaded into by all()
+TABLES: Dict[str, Type[RecordView]] = {"medicines": MedicineTable, "pharmacies": PharmacyTable}
+
+
+def snapshot_path(source: Path) -> Path:
+    """Snapshot file that belongs to a JSON catalog file"""
+    return Path(source).with_suffix(".snapshot")
+
+
+def build_snapshot(
+    records: Sequence[Dict[str, Any]],
+    key: Callable[[Dict[str, Any]], str],
+    columns: Dict[str, Callable[[Dict[str, Any]], float]],
+    source_signature: Tuple[int, int]
+) -> bytes:
+    """Serialize records, their key table and numeric columns into snapshot bytes"""
+    # Record i is records[bounds[i]:bounds[i + 1] - 1]; the byte after it
+    # is the "," or "]" that follows it in the array
+    # One pass over the records, which may be a table building each dict
+    # on access
+    bounds = np.empty(len(records) + 1, dtype="<u8")
+    values = {name: np.empty(len(records), dtype="<f8") for name in columns}
+    keyed: Dict[bytes, int] = {}
+    parts = []
+    size = 1
+    for position, record in enumerate(records):
+        bounds[position] = size
+        part = json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        parts.append(part)
+        size += len(part) + 1
+        # First record wins, matching the key index built from JSON
+        keyed.setdefault(key(record).encode("utf-8"), position)
+        for name, column in columns.items():
+            values[name][position] = column(record)
+    blob = b"[" + b",".join(parts) + b"]"
+    bounds[len(records)] = len(blob)
+    keys = sorted(keyed)
+    width = max(map(len, keys), default=1)
+
+    sections: List[Tuple[str, np.dtype, bytes, int]] = [
+        ("records", np.dtype("u1"), blob, len(blob)),
+        ("bounds", bounds.dtype, bounds.tobytes(), len(bounds)),
+        ("keys", np.dtype(f"S{width}"), np.array(keys, dtype=f"S{width}").tobytes(), len(keys)),
+        ("key_rows", np.dtype("<u4"), np.fromiter((keyed[k] for k in keys), dtype="<u4", count=len(keys)).tobytes(), len(keys))
+    ]
+    for name, column in values.items():
+        sections.append((name, column.dtype, column.tobytes(), len(column)))
+
+    offset = HEADER.size + SECTION.size * len(sections)
+    table, blobs = [], []
+    for name, dtype, data, count in sections:
+        padding = -offset % ALIGNMENT
+        blobs.append(b"\0" * padding + data)
+        offset += padding
+        table.append(SECTION.pack(name.encode("ascii"), dtype.str.encode("ascii"), offset, count))
+        offset += len(data)
+
+    header = HEADER.pack(MAGIC, len(records), source_signature[0], source_signature[1], len(sections))
+    return b"".join([header, *table, *blobs])
+
+
+def write_snapshot(source: Path, dataset: str, records: Sequence[Dict[str, Any]], source_signature: Tuple[int, int]):
+    """Build and atomically write the snapshot of a catalog file"""
+    key, columns = CATALOGS[dataset]
+    atomic_write_bytes(snapshot_path(source), build_snapshot(records, key, columns, source_signature))
+
+
+class SnapshotRecords(RecordView):
+    """
+    Records of a snapshot, decoded from the mapping on access
+
+    Indexing decodes just that record. all() decodes the whole array with
+    one json.loads into an in-memory table, which then serves indexing too.
+    """
+
+    def __init__(self, data: mmap.mmap, start: int, bounds: np.ndarray, table_type: Type[RecordView]):
+        self._data = data
+        self._start = start
+        self._bounds = bounds
+        self._table_type = table_type
+        self._table: Optional[RecordView] = None
+
+    def __len__(self) -> int:
+        return len(self._bounds) - 1
+
+    def record(self, position: int) -> Dict[str, Any]:
+        if self._table is not None:
+            return self._table.record(position)
+        begin = self._start + int(self._bounds[position])
+        end = self._start + int(self._bounds[position + 1]) - 1
+        return json.loads(self._data[begin:end])
+
+    def all(self) -> RecordView:
+        """Every record, loaded once into a table"""
+        if self._table is None:
+            end = self._start + int(self._bounds[-1])
+            self._table = self._table_type(json.loads(self._data[self._start:end]))
+        return self._table
+
+
+class CatalogSnapshot:
+    """A memory-mapped snapshot: lazy records, key lookups and numeric columns"""
+
+    def __init__(
+        self,
+        data: mmap.mmap,
+        record_count: int,
+        sections: Dict[str, Tuple[str, int, int]],
+        table_type: Type[RecordView]
+    ):
+        self._sections = sections
+        self._data = data
+        self.keys = self._array("keys")
+        self.key_rows = self._array("key_rows")
+        self.records = SnapshotRecords(data, sections["records"][1], self._array("bounds"), table_type)
+        if len(self.records) != record_count or len(self.keys) != len(self.key_rows):
+            raise ValueError("Inconsistent snapshot")
+
+    def _array(self, name: str) -> np.ndarray:
+        dtype, offset, count = self._sections[name]
+        return np.frombuffer(self._data, dtype=np.dtype(dtype), count=count, offset=offset)
+
+    @classmethod
+    def open(cls, source: Path, dataset: str, source_signature: Optional[Tuple[int, int]]) -> Optional["CatalogSnapshot"]:
+        """Map the snapshot of a catalog file, or None if it is missing, corrupt or stale"""
+        if source_signature is None:
+            return None
+        try:
+            with open(snapshot_path(source), "rb") as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            # ValueError: empty file, which cannot be mapped
+            return None
+
+        try:
+            magic, record_count, mtime_ns, size, section_count = HEADER.unpack_from(data)
+            if magic != MAGIC or (mtime_ns, size) != tuple(source_signature):
+                return None
+            sections = {}
+            for i in range(section_count):
+                name, dtype, offset, count = SECTION.unpack_from(data, HEADER.size + i * SECTION.size)
+                sections[name.rstrip(b"\0").decode("ascii")] = (dtype.rstrip(b"\0").decode("ascii"), offset, count)
+            return cls(data, record_count, sections, TABLES[dataset])
+        except (struct.error, KeyError, TypeError, ValueError, UnicodeDecodeError):
+            return None
+
+    def position(self, key: str) -> Optional[int]:
+        """Record position of a lookup key (normalized by the caller)"""
+        encoded = key.encode("utf-8")
+        if len(encoded) > self.keys.dtype.itemsize:
+            return None
+        i = int(np.searchsorted(self.keys, encoded))
+        if i < len(self.keys) and self.keys[i] == encoded:
+            return int(self.key_rows[i])
+        return None
+
+    def lookup(self, keys: Sequence[str]) -> List[Optional[int]]:
+        """Record positions of many lookup keys in one vectorized search (None where absent)"""
+        return lookup_positions(self.keys, self.key_rows, np.array([key.encode("utf-8") for key in keys], dtype=bytes))
+
+    def column(self, name: str) -> np.ndarray:
+        """A numeric column aligned with the records (read-only view of the mapping)"""
+        return self._array(name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build binary snapshots of the JSON catalogs")
+    parser.add_argument("--data-dir", type=Path, required=True, help="Directory holding medicines.json and pharmacies.json")
+    args = parser.parse_args()
+
+    for dataset in CATALOGS:
+        source = args.data_dir / f"{dataset}.json"
+        stat = source.stat()
+        with open(source, "r", encoding="utf-8") as f:
+            records = TABLES[dataset](RECORD_CODECS[dataset].validate(json.load(f)))
+        write_snapshot(source, dataset, records, (stat.st_mtime_ns, stat.st_size))
+        print(json.dumps({"snapshot": str(snapshot_path(source)), "records": len(records)}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,516 @@
+# backend/app/storage/sqlite_store.py
+import argparse
+import json
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import List, Optional, Dict, Any, Callable, Iterable, Hashable, Tuple
+
+from app.storage.base import DIGEST_CHUNK, KeyDigest, StorageBackend, UpsertResult, normalize_batch_code
+from app.storage.records import RECORD_CODECS
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS medicines (
+    id TEXT NOT NULL,
+    batch_code TEXT NOT NULL,
+    batch_code_key TEXT NOT NULL,
+    name TEXT NOT NULL,
+    company TEXT NOT NULL,
+    expiry_date TEXT NOT NULL,
+    is_authentic INTEGER NOT NULL,
+    manufacturing_date TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_medicines_batch_code_key ON medicines (batch_code_key);
+
+CREATE TABLE IF NOT EXISTS pharmacies (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    address TEXT NOT NULL,
+    phone TEXT NOT NULL,
+    latitude REAL NOT NULL,
+    longitude REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS reports (
+    id TEXT PRIMARY KEY,
+    batch_code TEXT NOT NULL,
+    batch_code_key TEXT NOT NULL,
+    medicine_name TEXT NOT NULL,
+    description TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_reports_status ON reports (status);
+CREATE INDEX IF NOT EXISTS idx_reports_batch_code_key ON reports (batch_code_key);
+
+-- Report counters kept current by triggers, so stats never scan reports
+CREATE TABLE IF NOT EXISTS report_status_counts (
+    status TEXT PRIMARY KEY,
+    count INTEGER NOT NULL
+);
+-- batch_code is the code as first reported, shown for the normalized key
+CREATE TABLE IF NOT EXISTS report_batch_counts (
+    batch_code_key TEXT PRIMARY KEY,
+    batch_code TEXT NOT NULL,
+    count INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_report_batch_counts_count ON report_batch_counts (count);
+
+CREATE TRIGGER IF NOT EXISTS reports_count_insert AFTER INSERT ON reports BEGIN
+    INSERT INTO report_status_counts (status, count) VALUES (NEW.status, 1)
+        ON CONFLICT (status) DO UPDATE SET count = count + 1;
+    INSERT INTO report_batch_counts (batch_code_key, batch_code, count) VALUES (NEW.batch_code_key, NEW.batch_code, 1)
+        ON CONFLICT (batch_code_key) DO UPDATE SET count = count + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS reports_count_status AFTER UPDATE OF status ON reports
+WHEN OLD.status IS NOT NEW.status BEGIN
+    UPDATE report_status_counts SET count = count - 1 WHERE status = OLD.status;
+    INSERT INTO report_status_counts (status, count) VALUES (NEW.status, 1)
+        ON CONFLICT (status) DO UPDATE SET count = count + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS reports_count_batch_code AFTER UPDATE OF batch_code_key ON reports
+WHEN OLD.batch_code_key IS NOT NEW.batch_code_key BEGIN
+    UPDATE report_batch_counts SET count = count - 1 WHERE batch_code_key = OLD.batch_code_key;
+    INSERT INTO report_batch_counts (batch_code_key, batch_code, count) VALUES (NEW.batch_code_key, NEW.batch_code, 1)
+        ON CONFLICT (batch_code_key) DO UPDATE SET count = count + 1;
+END;
+
+CREATE TABLE IF NOT EXISTS dataset_versions (
+    name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0
+);
+INSERT OR IGNORE INTO dataset_versions (name) VALUES ('medicines'), ('pharmacies'), ('reports');
+"""
+
+MEDICINE_COLUMNS = "id, batch_code, name, company, expiry_date, is_authentic, manufacturing_date"
+PHARMACY_COLUMNS = "id, name, address, phone, latitude, longitude"
+REPORT_COLUMNS = "id, batch_code, medicine_name, description, status, created_at, updated_at"
+REPORT_FIELDS = ("batch_code", "medicine_name", "description", "status", "created_at", "updated_at")
+# Columns written for a new report: REPORT_COLUMNS, then its normalized batch code
+REPORT_INSERT_COLUMNS = f"{REPORT_COLUMNS}, batch_code_key"
+
+# Stay under SQLite's default limit on bound parameters per statement
+SQLITE_MAX_PARAMS = 900
+
+
+class SQLiteStorage(StorageBackend):
+    """
+    Storage backend on a single SQLite file in WAL mode
+
+    Lookups go through the indexes on medicines.batch_code_key,
+    pharmacies.id, reports.id and reports.batch_code_key, so a request
+    only touches the rows it needs. Batch-code keys are written with
+    normalize_batch_code, so codes match exactly as in the JSON store.
+    Each thread gets its own connection; close() closes all of them.
+    """
+
+    def __init__(self, db_path: Path, import_from: Optional[Path] = None):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        # Every connection opened by any thread, so close() can reach them all
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+
+        is_new = not self.db_path.exists()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+        # Seed a brand-new database from the JSON files so switching
+        # DATABASE_TYPE does not start from an empty catalog
+        if is_new and import_from is not None:
+            counts = self.import_json(import_from)
+            logger.info("Imported JSON data into %s: %s", self.db_path, counts)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Only this thread uses the connection, but close() may run on another
+            conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with self._connections_lock:
+                self._connections.append(conn)
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _medicine_from_row(row: sqlite3.Row) -> Dict[str, Any]:
+        medicine = dict(row)
+        medicine['is_authentic'] = bool(medicine['is_authentic'])
+        return medicine
+
+    @staticmethod
+    def _pharmacy_from_row(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            "id": row['id'],
+            "name": row['name'],
+            "address": row['address'],
+            "phone": row['phone'],
+            "location": {
+                "latitude": row['latitude'],
+                "longitude": row['longitude']
+            }
+        }
+
+    @staticmethod
+    def _bump_version(conn: sqlite3.Connection, dataset: str):
+        """Mark a dataset as changed; call inside the writing transaction"""
+        conn.execute("UPDATE dataset_versions SET version = version + 1 WHERE name = ?", (dataset,))
+
+    def dataset_version(self, dataset: str) -> Hashable:
+        """Counter bumped by every write to the dataset"""
+        row = self._connect().execute(
+            "SELECT version FROM dataset_versions WHERE name = ?",
+            (dataset,)
+        ).fetchone()
+        if row is None:
+            raise ValueError(f"Unknown dataset: {dataset}")
+        return row['version']
+
+    # Import
+    def import_json(self, data_dir: Path) -> Dict[str, int]:
+        """Load medicines.json, pharmacies.json and reports.json into the database"""
+        data_dir = Path(data_dir)
+
+        def read(name: str) -> List[Dict[str, Any]]:
+            filepath = data_dir / name
+            if not filepath.exists():
+                return []
+            with open(filepath, 'r', encoding='utf-8') as f:
+                return RECORD_CODECS[filepath.stem].validate(json.load(f))
+
+        medicines = read("medicines.json")
+        pharmacies = read("pharmacies.json")
+        reports = read("reports.json")
+
+        conn = self._connect()
+        with conn:
+            self._insert_medicines(conn, medicines)
+            self._insert_pharmacies(conn, pharmacies)
+            conn.executemany(
+                f"INSERT OR IGNORE INTO reports ({REPORT_INSERT_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (self._report_params(report) for report in reports)
+            )
+            for dataset in self.DATASETS:
+                self._bump_version(conn, dataset)
+
+        return {
+            "medicines": len(medicines),
+            "pharmacies": len(pharmacies),
+            "reports": len(reports)
+        }
+
+    def _insert_medicines(self, conn: sqlite3.Connection, medicines: Iterable[Dict[str, Any]]):
+        # OR IGNORE keeps the first record for a duplicated batch code
+        conn.executemany(
+            "INSERT OR IGNORE INTO medicines "
+            "(id, batch_code, batch_code_key, name, company, expiry_date, is_authentic, manufacturing_date) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                (
+                    m['id'], m['batch_code'], normalize_batch_code(m['batch_code']),
+                    m['name'], m['company'], m['expiry_date'],
+                    int(m['is_authentic']), m['manufacturing_date']
+                )
+                for m in medicines
+            )
+        )
+
+    def _insert_pharmacies(self, conn: sqlite3.Connection, pharmacies: Iterable[Dict[str, Any]]):
+        conn.executemany(
+            f"INSERT OR REPLACE INTO pharmacies ({PHARMACY_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                (
+                    p['id'], p['name'], p['address'], p['phone'],
+                    p['location']['latitude'], p['location']['longitude']
+                )
+                for p in pharmacies
+            )
+        )
+
+    # Bulk catalog writes
+    def upsert_batches(
+        self,
+        dataset: str,
+        batches: Iterable[List[Dict[str, Any]]],
+        on_progress: Callable[[UpsertResult], None]
+    ):
+        """
+        Upsert each batch in its own transaction
+
+        ON CONFLICT ... DO UPDATE keeps the rowid of an existing record, so
+        updated records keep their place in listing order; SQLite maintains
+        the lookup indexes row by row. Batches committed before a failure
+        stay committed.
+        """
+        if dataset == "medicines":
+            key_column = "batch_code_key"
+            statement = (
+                "INSERT INTO medicines "
+                "(id, batch_code, batch_code_key, name, company, expiry_date, is_authentic, manufacturing_date) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (batch_code_key) DO UPDATE SET "
+                "id = excluded.id, batch_code = excluded.batch_code, name = excluded.name, "
+                "company = excluded.company, expiry_date = excluded.expiry_date, "
+                "is_authentic = excluded.is_authentic, manufacturing_date = excluded.manufacturing_date"
+            )
+
+            def params(m: Dict[str, Any]) -> tuple:
+                return (
+                    m['id'], m['batch_code'], normalize_batch_code(m['batch_code']),
+                    m['name'], m['company'], m['expiry_date'],
+                    int(m['is_authentic']), m['manufacturing_date']
+                )
+        else:
+            key_column = "id"
+            statement = (
+                f"INSERT INTO pharmacies ({PHARMACY_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET "
+                "name = excluded.name, address = excluded.address, phone = excluded.phone, "
+                "latitude = excluded.latitude, longitude = excluded.longitude"
+            )
+
+            def params(p: Dict[str, Any]) -> tuple:
+                return (
+                    p['id'], p['name'], p['address'], p['phone'],
+                    p['location']['latitude'], p['location']['longitude']
+                )
+
+        conn = self._connect()
+        for batch in batches:
+            if not batch:
+                continue
+            rows = [params(record) for record in batch]
+            keys = [row[2] if dataset == "medicines" else row[0] for row in rows]
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                previous_version = conn.execute(
+                    "SELECT version FROM dataset_versions WHERE name = ?", (dataset,)
+                ).fetchone()[0]
+                unique_keys = list(dict.fromkeys(keys))
+                existing = set()
+                for start in range(0, len(unique_keys), SQLITE_MAX_PARAMS):
+                    chunk = unique_keys[start:start + SQLITE_MAX_PARAMS]
+                    placeholders = ", ".join("?" * len(chunk))
+                    existing.update(
+                        row[0] for row in conn.execute(
+                            f"SELECT {key_column} FROM {dataset} WHERE {key_column} IN ({placeholders})",
+                            chunk
+                        )
+                    )
+                conn.executemany(statement, rows)
+                self._bump_version(conn, dataset)
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+
+            new_keys = [key for key in unique_keys if key not in existing]
+            on_progress(UpsertResult(
+                len(new_keys), len(rows) - len(new_keys), new_keys, previous_version, previous_version + 1
+            ))
+
+    @staticmethod
+    def _report_params(report: Dict[str, Any]) -> tuple:
+        return (
+            (report['id'],) + tuple(report[field] for field in REPORT_FIELDS)
+            + (normalize_batch_code(report['batch_code']),)
+        )
+
+    # Medicine operations
+    def get_all_medicines(self) -> List[Dict[str, Any]]:
+        """Get all medicines"""
+        rows = self._connect().execute(f"SELECT {MEDICINE_COLUMNS} FROM medicines ORDER BY rowid")
+        return [self._medicine_from_row(row) for row in rows]
+
+    def batch_code_digest(self) -> str:
+        """Digest of the normalized batch codes, read in order from their unique index"""
+        digest = KeyDigest()
+        cursor = self._connect().execute("SELECT batch_code_key FROM medicines ORDER BY batch_code_key")
+        while True:
+            rows = cursor.fetchmany(DIGEST_CHUNK)
+            if not rows:
+                return digest.hexdigest()
+            digest.update([row[0] for row in rows])
+
+    def find_medicine_by_batch_code(self, batch_code: str) -> Optional[Dict[str, Any]]:
+        """Find medicine by batch code"""
+        row = self._connect().execute(
+            f"SELECT {MEDICINE_COLUMNS} FROM medicines WHERE batch_code_key = ?",
+            (normalize_batch_code(batch_code),)
+        ).fetchone()
+        return self._medicine_from_row(row) if row else None
+
+    def find_medicines_by_batch_codes(self, batch_codes: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """Resolve many batch codes with chunked IN queries"""
+        keys = [normalize_batch_code(batch_code) for batch_code in batch_codes]
+        unique_keys = list(dict.fromkeys(keys))
+        conn = self._connect()
+
+        found: Dict[str, Dict[str, Any]] = {}
+        for start in range(0, len(unique_keys), SQLITE_MAX_PARAMS):
+            chunk = unique_keys[start:start + SQLITE_MAX_PARAMS]
+            placeholders = ", ".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT batch_code_key, {MEDICINE_COLUMNS} FROM medicines "
+                f"WHERE batch_code_key IN ({placeholders})",
+                chunk
+            )
+            for row in rows:
+                medicine = self._medicine_from_row(row)
+                found[medicine.pop('batch_code_key')] = medicine
+
+        return [found.get(key) for key in keys]
+
+    # Pharmacy operations
+    def get_all_pharmacies(self) -> List[Dict[str, Any]]:
+        """Get all pharmacies"""
+        rows = self._connect().execute(f"SELECT {PHARMACY_COLUMNS} FROM pharmacies ORDER BY rowid")
+        return [self._pharmacy_from_row(row) for row in rows]
+
+    def find_pharmacy_by_id(self, pharmacy_id: str) -> Optional[Dict[str, Any]]:
+        """Find pharmacy by ID"""
+        row = self._connect().execute(
+            f"SELECT {PHARMACY_COLUMNS} FROM pharmacies WHERE id = ?",
+            (pharmacy_id,)
+        ).fetchone()
+        return self._pharmacy_from_row(row) if row else None
+
+    # Report operations
+    def get_all_reports(self) -> List[Dict[str, Any]]:
+        """Get all reports"""
+        rows = self._connect().execute(f"SELECT {REPORT_COLUMNS} FROM reports ORDER BY rowid")
+        return [dict(row) for row in rows]
+
+    def find_report_by_id(self, report_id: str) -> Optional[Dict[str, Any]]:
+        """Find report by ID"""
+        row = self._connect().execute(
+            f"SELECT {REPORT_COLUMNS} FROM reports WHERE id = ?",
+            (report_id,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def get_page(self, dataset: str, position: int, limit: int) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """Keyset paging on rowid; the position is the last rowid already returned"""
+        columns, from_row = {
+            "medicines": (MEDICINE_COLUMNS, self._medicine_from_row),
+            "pharmacies": (PHARMACY_COLUMNS, self._pharmacy_from_row),
+            "reports": (REPORT_COLUMNS, dict)
+        }[dataset]
+        rows = self._connect().execute(
+            f"SELECT rowid, {columns} FROM {dataset} WHERE rowid > ? ORDER BY rowid LIMIT ?",
+            (position, limit + 1)
+        ).fetchall()
+        page = rows[:limit]
+        records = []
+        for row in page:
+            record = from_row(row)
+            record.pop('rowid', None)
+            records.append(record)
+        return records, (page[-1]['rowid'] if len(rows) > limit else None)
+
+    def find_reports(self, status: Optional[str] = None, batch_code: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Filter reports through the status and batch-code indexes"""
+        clauses, params = [], []
+        if status is not None:
+            clauses.append("status = ?")
+            params.append(status)
+        if batch_code is not None:
+            clauses.append("batch_code_key = ?")
+            params.append(normalize_batch_code(batch_code))
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        rows = self._connect().execute(
+            f"SELECT {REPORT_COLUMNS} FROM reports {where}ORDER BY rowid",
+            params
+        )
+        return [dict(row) for row in rows]
+
+    def get_report_stats(self, top: int = 10) -> Dict[str, Any]:
+        """Read the trigger-maintained counters"""
+        conn = self._connect()
+        by_status = {
+            row['status']: row['count']
+            for row in conn.execute("SELECT status, count FROM report_status_counts WHERE count > 0")
+        }
+        top_batches = [
+            {"batch_code": row['batch_code'], "count": row['count']}
+            for row in conn.execute(
+                "SELECT batch_code, count FROM report_batch_counts WHERE count > 0 ORDER BY count DESC LIMIT ?",
+                (top,)
+            )
+        ]
+        return {"total": sum(by_status.values()), "by_status": by_status, "top_batches": top_batches}
+
+    def insert_report(self, report: Dict[str, Any]) -> Dict[str, Any]:
+        """Add new report"""
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                f"INSERT INTO reports ({REPORT_INSERT_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                self._report_params(report)
+            )
+            self._bump_version(conn, "reports")
+        return report
+
+    def insert_reports(self, reports: List[Dict[str, Any]]):
+        """Insert a batch of reports in one fully synced transaction, skipping IDs already stored"""
+        if not reports:
+            return
+        conn = self._connect()
+        # NORMAL only syncs at checkpoints; callers drop their own copy after this returns
+        conn.execute("PRAGMA synchronous=FULL")
+        try:
+            with conn:
+                conn.executemany(
+                    f"INSERT OR IGNORE INTO reports ({REPORT_INSERT_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [self._report_params(report) for report in reports]
+                )
+                self._bump_version(conn, "reports")
+        finally:
+            conn.execute("PRAGMA synchronous=NORMAL")
+
+    def update_report(self, report_id: str, changes: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Update report fields"""
+        fields = [field for field in changes if field in REPORT_FIELDS]
+        values = [changes[field] for field in fields]
+        if 'batch_code' in fields:
+            fields.append("batch_code_key")
+            values.append(normalize_batch_code(changes['batch_code']))
+        conn = self._connect()
+        with conn:
+            if fields:
+                assignments = ", ".join(f"{field} = ?" for field in fields)
+                conn.execute(
+                    f"UPDATE reports SET {assignments} WHERE id = ?",
+                    values + [report_id]
+                )
+                self._bump_version(conn, "reports")
+        return self.find_report_by_id(report_id)
+
+    def close(self):
+        """Close the connections opened by every thread"""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local.conn = None
+
+
+if __name__ == "__main__":
+    from app.config import settings
+
+    parser = argparse.ArgumentParser(description="Import the JSON data files into SQLite")
+    parser.add_argument("--data-dir", type=Path, default=settings.data_dir)
+    parser.add_argument("--db", type=Path, default=settings.sqlite_path)
+    args = parser.parse_args()
+
+    storage = SQLiteStorage(args.db)
+    print(json.dumps(storage.import_json(args.data_dir)))
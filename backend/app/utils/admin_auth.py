@@ -0,0 +1,18 @@
+# backend/app/utils/admin_auth.py
+import hmac
+from typing import Optional
+
+from fastapi import Header, HTTPException, status
+
+from app.config import settings
+
+
+async def require_admin_key(x_admin_key: Optional[str] = Header(None)):
+    """Dependency for admin endpoints: the X-Admin-Key header must match ADMIN_API_KEY"""
+    if not settings.admin_api_key:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin endpoints are disabled; set ADMIN_API_KEY to enable them"
+        )
+    if x_admin_key is None or not hmac.compare_digest(x_admin_key.encode("utf-8"), settings.admin_api_key.encode("utf-8")):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid admin key")
@@ -0,0 +1,118 @@
+# backend/app/utils/bloom.py
+import hashlib
+import math
+import os
+import struct
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+MAGIC = b"AMFBLOOM"
+# magic, capacity, count, size_bits, hash_count, target error rate, source tag length
+HEADER = struct.Struct("<8sQQQIdI")
+
+
+class BloomFilter:
+    """
+    Bloom filter over strings
+
+    Answers "definitely absent" or "possibly present". Positions come from
+    one blake2b digest split into two 64-bit hashes (double hashing).
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        capacity = max(1, capacity)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size_bits = max(8, math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size_bits / capacity * math.log(2)))
+        self.count = 0
+        self.bits = bytearray((self.size_bits + 7) // 8)
+
+    @classmethod
+    def from_items(cls, items: Iterable[str], capacity: int, error_rate: float = 0.001) -> "BloomFilter":
+        bloom = cls(capacity, error_rate)
+        for item in items:
+            bloom.add(item)
+        return bloom
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1, h2 = struct.unpack("<QQ", digest)
+        h2 |= 1
+        size = self.size_bits
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % size
+
+    def add(self, item: str):
+        bits = self.bits
+        for position in self._positions(item):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        bits = self.bits
+        for position in self._positions(item):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    @property
+    def memory_bytes(self) -> int:
+        return len(self.bits)
+
+    def false_positive_rate(self) -> float:
+        """Expected false-positive rate at the current fill level"""
+        return (1 - math.exp(-self.hash_count * self.count / self.size_bits)) ** self.hash_count
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "items": self.count,
+            "capacity": self.capacity,
+            "size_bits": self.size_bits,
+            "hash_count": self.hash_count,
+            "memory_bytes": self.memory_bytes,
+            "target_false_positive_rate": self.error_rate,
+            "false_positive_rate": self.false_positive_rate()
+        }
+
+    def save(self, filepath: Path, source_tag: str):
+        """Write the filter to disk, tagged with the data it was built from"""
+        tag = source_tag.encode("utf-8")
+        # Per-process temp name: several workers may save at once
+        tmp_file = Path(filepath).with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_file, "wb") as f:
+            f.write(HEADER.pack(
+                MAGIC, self.capacity, self.count, self.size_bits,
+                self.hash_count, self.error_rate, len(tag)
+            ))
+            f.write(tag)
+            f.write(self.bits)
+        os.replace(tmp_file, filepath)
+
+    @classmethod
+    def load(cls, filepath: Path, source_tag: str) -> Optional["BloomFilter"]:
+        """Load a saved filter, or None if it is missing, corrupt or built from other data"""
+        try:
+            with open(filepath, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+
+        if len(data) < HEADER.size:
+            return None
+        magic, capacity, count, size_bits, hash_count, error_rate, tag_length = HEADER.unpack_from(data)
+        tag_end = HEADER.size + tag_length
+        if magic != MAGIC or data[HEADER.size:tag_end].decode("utf-8", "replace") != source_tag:
+            return None
+        bits = data[tag_end:]
+        if len(bits) != (size_bits + 7) // 8:
+            return None
+
+        bloom = cls.__new__(cls)
+        bloom.capacity = capacity
+        bloom.error_rate = error_rate
+        bloom.size_bits = size_bits
+        bloom.hash_count = hash_count
+        bloom.count = count
+        bloom.bits = bytearray(bits)
+        return bloom
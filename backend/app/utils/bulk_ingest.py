@@ -0,0 +1,293 @@
+# backend/app/utils/bulk_ingest.py
+"""
+Streaming parsers and progress tracking for bulk catalog uploads
+
+Uploads are NDJSON (one record per line) or CSV with a header row. They
+are parsed line by line as the body arrives, so memory use depends on the
+batch size rather than on the size of the upload. Lines longer than the
+limit are dropped as they stream in and their rows rejected, so a body
+without newlines cannot grow one line without bound.
+"""
+import asyncio
+import codecs
+import csv
+import logging
+import threading
+import time
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.utils.fast_json import loads
+
+logger = logging.getLogger(__name__)
+
+NDJSON_TYPES = ("application/x-ndjson", "application/jsonl", "application/json-lines")
+CSV_TYPES = ("text/csv", "application/csv")
+
+# Rejected rows listed in an upload's summary; the rest are only counted
+MAX_REPORTED_ERRORS = 20
+
+# Longest line, in characters, buffered while waiting for its newline
+MAX_LINE_LENGTH = 1 << 20
+
+# Request body of the upload endpoints, which read the raw stream
+UPLOAD_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            NDJSON_TYPES[0]: {"schema": {"type": "string", "description": "One JSON record per line"}},
+            CSV_TYPES[0]: {"schema": {"type": "string", "description": "Header row of field names, then one record per row"}}
+        }
+    }
+}
+
+# (line number, record or None, error or None)
+ParsedRow = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+
+class UnsupportedUploadError(ValueError):
+    """Raised for upload content types other than NDJSON and CSV"""
+
+
+def upload_format(content_type: Optional[str]) -> str:
+    """'ndjson' or 'csv' for a request's Content-Type"""
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type in NDJSON_TYPES:
+        return "ndjson"
+    if media_type in CSV_TYPES:
+        return "csv"
+    raise UnsupportedUploadError(
+        f"Unsupported upload type {media_type or '(none)'}; send {NDJSON_TYPES[0]} or {CSV_TYPES[0]}"
+    )
+
+
+def iter_sync(chunks: AsyncIterator[bytes], loop: asyncio.AbstractEventLoop) -> Iterator[bytes]:
+    """
+    Blocking iterator over an async byte stream, for a worker thread
+
+    Each chunk is awaited on `loop`, so the request body can be consumed
+    from the storage thread pool while the event loop stays free.
+    """
+    while True:
+        try:
+            yield asyncio.run_coroutine_threadsafe(chunks.__anext__(), loop).result()
+        except StopAsyncIteration:
+            return
+
+
+class OverlongLine(str):
+    """Stands in for a line longer than the limit; reads as an empty line"""
+
+    def __new__(cls, limit: int):
+        line = super().__new__(cls, "\n")
+        line.limit = limit
+        return line
+
+    @property
+    def error(self) -> str:
+        return f"Line longer than {self.limit} characters"
+
+
+def iter_lines(chunks: Iterable[bytes], max_length: int = MAX_LINE_LENGTH) -> Iterator[str]:
+    """
+    Decode UTF-8 chunks into lines, each ending with its newline
+
+    A line longer than `max_length` is discarded, up to its newline, as
+    soon as it exceeds the limit and yielded as an OverlongLine.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    # Inside an overlong line: drop text until its newline
+    skipping = False
+    for chunk in chunks:
+        text = decoder.decode(chunk)
+        end = text.rfind("\n") + 1
+        if end:
+            lines = text[:end - 1].split("\n")
+            lines[0] = pending + lines[0]
+            for number, line in enumerate(lines):
+                if (skipping and number == 0) or len(line) > max_length:
+                    yield OverlongLine(max_length)
+                else:
+                    yield line + "\n"
+            pending = ""
+            skipping = False
+        if not skipping:
+            pending += text[end:]
+            if len(pending) > max_length:
+                pending = ""
+                skipping = True
+    pending += decoder.decode(b"", final=True)
+    if skipping or len(pending) > max_length:
+        yield OverlongLine(max_length)
+    elif pending:
+        yield pending
+
+
+def _nest_location(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Flat latitude/longitude columns become the nested location of a pharmacy"""
+    if "location" not in record and ("latitude" in record or "longitude" in record):
+        record["location"] = {"latitude": record.pop("latitude", None), "longitude": record.pop("longitude", None)}
+    return record
+
+
+def _parse_ndjson(lines: Iterator[str]) -> Iterator[ParsedRow]:
+    for number, line in enumerate(lines, 1):
+        if isinstance(line, OverlongLine):
+            yield number, None, line.error
+            continue
+        if not line.strip():
+            continue
+        try:
+            record = loads(line)
+        except ValueError as e:
+            yield number, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(record, dict):
+            yield number, None, "Expected a JSON object"
+            continue
+        yield number, record, None
+
+
+def _parse_csv(lines: Iterator[str]) -> Iterator[ParsedRow]:
+    # Overlong lines reach the reader as empty lines; the row they were
+    # part of is rejected once the reader returns it
+    overlong: List[OverlongLine] = []
+
+    def checked() -> Iterator[str]:
+        for line in lines:
+            if isinstance(line, OverlongLine):
+                overlong.append(line)
+            yield line
+
+    reader = csv.reader(checked())
+    try:
+        header = [name.strip() for name in next(reader)]
+    except StopIteration:
+        return
+    except csv.Error as e:
+        yield reader.line_num, None, f"Invalid CSV header: {e}"
+        return
+    if overlong:
+        yield reader.line_num, None, f"Invalid CSV header: {overlong[0].error}"
+        return
+    while True:
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as e:
+            overlong.clear()
+            yield reader.line_num, None, f"Invalid CSV: {e}"
+            continue
+        if overlong:
+            error = overlong[0].error
+            overlong.clear()
+            yield reader.line_num, None, error
+            continue
+        if not row:
+            continue
+        if len(row) != len(header):
+            yield reader.line_num, None, f"Expected {len(header)} columns, got {len(row)}"
+            continue
+        yield reader.line_num, dict(zip(header, row)), None
+
+
+def parse_upload(
+    chunks: Iterable[bytes],
+    fmt: str,
+    dataset: str,
+    max_line_length: int = MAX_LINE_LENGTH
+) -> Iterator[ParsedRow]:
+    """Records of an NDJSON or CSV upload as they arrive, with their line numbers"""
+    parse = _parse_ndjson if fmt == "ndjson" else _parse_csv
+    for number, record, error in parse(iter_lines(chunks, max_line_length)):
+        if record is not None and dataset == "pharmacies":
+            record = _nest_location(record)
+        yield number, record, error
+
+
+class BulkIngestJob:
+    """Counters and timing of one upload; updated by the thread running it"""
+
+    def __init__(self, dataset: str, fmt: str):
+        self.dataset = dataset
+        self.format = fmt
+        self.started = time.monotonic()
+        self.rows = 0
+        self.inserted = 0
+        self.updated = 0
+        self.rejected = 0
+        self.errors: List[Dict[str, Any]] = []
+
+    def reject(self, line: int, error: str):
+        self.rows += 1
+        self.rejected += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "error": error})
+
+    def accept(self, inserted: int, updated: int):
+        self.rows += inserted + updated
+        self.inserted += inserted
+        self.updated += updated
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    @property
+    def rows_per_sec(self) -> float:
+        elapsed = self.elapsed
+        return self.rows / elapsed if elapsed > 0 else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "dataset": self.dataset,
+            "format": self.format,
+            "rows": self.rows,
+            "inserted": self.inserted,
+            "updated": self.updated,
+            "rejected": self.rejected,
+            "elapsed_s": round(self.elapsed, 3),
+            "rows_per_sec": round(self.rows_per_sec, 1),
+            "errors": self.errors
+        }
+
+
+class BulkIngestStats:
+    """Running uploads and lifetime row counts per dataset, for /metrics"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._active: Dict[int, BulkIngestJob] = {}
+        self._totals: Dict[Tuple[str, str], int] = {}
+
+    def start(self, dataset: str, fmt: str) -> BulkIngestJob:
+        job = BulkIngestJob(dataset, fmt)
+        with self._lock:
+            self._active[id(job)] = job
+        return job
+
+    def finish(self, job: BulkIngestJob):
+        with self._lock:
+            self._active.pop(id(job), None)
+            for outcome in ("inserted", "updated", "rejected"):
+                key = (job.dataset, outcome)
+                self._totals[key] = self._totals.get(key, 0) + getattr(job, outcome)
+
+    def collect(self) -> Iterable[str]:
+        """Prometheus lines for metrics.register_collector"""
+        with self._lock:
+            active = list(self._active.values())
+            totals = sorted(self._totals.items())
+        yield "# HELP bulk_ingest_active_rows Rows processed so far by running bulk uploads"
+        yield "# TYPE bulk_ingest_active_rows gauge"
+        for job in active:
+            yield f'bulk_ingest_active_rows{{dataset="{job.dataset}"}} {job.rows}'
+        yield "# HELP bulk_ingest_active_rows_per_second Throughput of running bulk uploads"
+        yield "# TYPE bulk_ingest_active_rows_per_second gauge"
+        for job in active:
+            yield f'bulk_ingest_active_rows_per_second{{dataset="{job.dataset}"}} {job.rows_per_sec:.1f}'
+        yield "# HELP bulk_ingest_rows_total Rows of finished bulk uploads by outcome"
+        yield "# TYPE bulk_ingest_rows_total counter"
+        for (dataset, outcome), count in totals:
+            yield f'bulk_ingest_rows_total{{dataset="{dataset}",outcome="{outcome}"}} {count}'
@@ -0,0 +1,74 @@
+# backend/app/utils/counters.py
+import bisect
+from typing import Dict, Hashable, List, Tuple
+
+
+class RankedCounter:
+    """
+    Counter that can list its largest counts without scanning every key
+
+    Keys are grouped into buckets by count, and the distinct counts in use
+    are kept sorted. Changing a count moves one key between two buckets;
+    top(n) walks the buckets from the largest count down. Within a bucket,
+    keys keep the order in which they reached that count.
+    """
+
+    def __init__(self):
+        self._counts: Dict[Hashable, int] = {}
+        self._buckets: Dict[int, Dict[Hashable, None]] = {}
+        self._levels: List[int] = []
+
+    def _leave(self, key: Hashable, count: int):
+        bucket = self._buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[count]
+            del self._levels[bisect.bisect_left(self._levels, count)]
+
+    def _enter(self, key: Hashable, count: int):
+        bucket = self._buckets.get(count)
+        if bucket is None:
+            bucket = self._buckets[count] = {}
+            bisect.insort(self._levels, count)
+        bucket[key] = None
+
+    def add(self, key: Hashable, amount: int = 1):
+        """Change a key's count by `amount`; keys reaching zero are dropped"""
+        old = self._counts.get(key, 0)
+        new = old + amount
+        if old:
+            self._leave(key, old)
+        if new > 0:
+            self._counts[key] = new
+            self._enter(key, new)
+        else:
+            self._counts.pop(key, None)
+
+    def __getitem__(self, key: Hashable) -> int:
+        return self._counts.get(key, 0)
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def items(self):
+        return self._counts.items()
+
+    def top(self, n: int) -> List[Tuple[Hashable, int]]:
+        """The n keys with the largest counts, largest first"""
+        result: List[Tuple[Hashable, int]] = []
+        for count in reversed(self._levels):
+            for key in self._buckets[count]:
+                if len(result) >= n:
+                    return result
+                result.append((key, count))
+        return result
+
+    def trim(self, size: int):
+        """Drop the keys with the smallest counts until at most `size` remain"""
+        while len(self._counts) > size:
+            count = self._levels[0]
+            bucket = self._buckets[count]
+            excess = len(self._counts) - size
+            for key in list(bucket)[:excess]:
+                del self._counts[key]
+                self._leave(key, count)
@@ -1,5 +1,18 @@
 # backend/app/utils/distance.py
+import heapq
 import math
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.storage.records import RecordView
+from app.utils.metrics import metrics
+from app.utils.spatial import GridIndex
+
+EARTH_RADIUS_KM = 6371.0
+
+# Distances are reported rounded to 2 decimals, which shifts them by at most 0.005 km
+ROUNDING_SLACK_KM = 0.006
 
 def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """
@@ -37,40 +50,224 @@ def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     
     return round(distance, 2)
 
-def get_pharmacies_within_radius(
+class PharmacyCoordinates:
+    """
+    Pharmacy coordinates as contiguous radian arrays
+
+    Built once when pharmacies are loaded so distance queries do not touch
+    the per-pharmacy dicts or convert degrees on every request.
+    """
+
+    def __init__(self, latitudes: Sequence[float], longitudes: Sequence[float]):
+        self.lat_rad = np.radians(np.ascontiguousarray(latitudes, dtype=np.float64))
+        self.lon_rad = np.radians(np.ascontiguousarray(longitudes, dtype=np.float64))
+        self.cos_lat = np.cos(self.lat_rad)
+
+    @classmethod
+    def from_pharmacies(cls, pharmacies: list) -> "PharmacyCoordinates":
+        return cls(
+            [p['location']['latitude'] for p in pharmacies],
+            [p['location']['longitude'] for p in pharmacies]
+        )
+
+    def __len__(self) -> int:
+        return len(self.lat_rad)
+
+def haversine_distances(
+    lat: float,
+    lon: float,
+    coordinates: PharmacyCoordinates,
+    positions: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Unrounded distances in km from one origin to many points in a single pass
+    
+    Args:
+        lat: Origin latitude in degrees
+        lon: Origin longitude in degrees
+        coordinates: Precomputed radian arrays of the points
+        positions: Optional subset of point positions to compute
+    
+    Returns:
+        Array of distances, aligned with `positions` (or all points)
+    """
+    lat_rad = coordinates.lat_rad
+    lon_rad = coordinates.lon_rad
+    cos_lat = coordinates.cos_lat
+    if positions is not None:
+        lat_rad = lat_rad[positions]
+        lon_rad = lon_rad[positions]
+        cos_lat = cos_lat[positions]
+    
+    origin_lat = math.radians(lat)
+    origin_lon = math.radians(lon)
+    
+    a = (np.sin((lat_rad - origin_lat) / 2) ** 2 +
+         math.cos(origin_lat) * cos_lat *
+         np.sin((lon_rad - origin_lon) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+def haversine_matrix(
+    origin_lats: Sequence[float],
+    origin_lons: Sequence[float],
+    coordinates: PharmacyCoordinates
+) -> np.ndarray:
+    """
+    Distance matrix in km between many origins and all points
+    
+    Intended for batch/offline jobs; memory is origins x points float64.
+    
+    Returns:
+        Array of shape (len(origin_lats), len(coordinates))
+    """
+    origin_lat = np.radians(np.asarray(origin_lats, dtype=np.float64))[:, np.newaxis]
+    origin_lon = np.radians(np.asarray(origin_lons, dtype=np.float64))[:, np.newaxis]
+    
+    a = (np.sin((coordinates.lat_rad - origin_lat) / 2) ** 2 +
+         np.cos(origin_lat) * coordinates.cos_lat *
+         np.sin((coordinates.lon_rad - origin_lon) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+def _page_with_distances(pharmacies, page: List[Tuple[float, int]]) -> list:
+    """
+    Response dicts for the page's pharmacies with their formatted distance
+
+    A RecordView builds a new dict per access, so only plain lists of
+    shared dicts need copying.
+    """
+    fresh = isinstance(pharmacies, RecordView)
+    result = []
+    for distance, position in page:
+        pharmacy = pharmacies[position] if fresh else pharmacies[position].copy()
+        pharmacy['distance'] = f"{distance} km"
+        result.append(pharmacy)
+    return result
+
+def _nearest_vectorized(
+    coordinates: PharmacyCoordinates,
+    user_lat: float,
+    user_lon: float,
+    radius: float,
+    limit: Optional[int],
+    offset: int,
+    index: Optional[GridIndex]
+) -> Tuple[List[Tuple[float, int]], int]:
+    """(rounded distance, position) pairs for the requested page, plus total matches"""
+    positions = None
+    if index is not None:
+        positions = index.candidates(user_lat, user_lon, radius)
+    distances = haversine_distances(user_lat, user_lon, coordinates, positions)
+    if positions is None:
+        positions = np.arange(len(distances))
+    
+    # Rounding to 2 decimals moves a distance by at most 0.005 km, so only
+    # values close to the radius need the exact scalar check
+    inside = distances <= radius - ROUNDING_SLACK_KM
+    border = np.flatnonzero(~inside & (distances <= radius + ROUNDING_SLACK_KM))
+    for i in border.tolist():
+        if round(float(distances[i]), 2) <= radius:
+            inside[i] = True
+    distances = distances[inside]
+    positions = positions[inside]
+    total = len(distances)
+    
+    # Partial selection: keep only what can round to at most the last
+    # distance on the requested page
+    if limit is not None and offset + limit < total:
+        kth = np.partition(distances, offset + limit - 1)[offset + limit - 1]
+        keep = distances <= kth + 2 * ROUNDING_SLACK_KM
+        distances = distances[keep]
+        positions = positions[keep]
+    
+    found = sorted(zip((round(d, 2) for d in distances.tolist()), positions.tolist()))
+    end = None if limit is None else offset + limit
+    return found[offset:end], total
+
+@metrics.timed("distance")
+def find_nearest_pharmacies(
     pharmacies: list,
     user_lat: float,
     user_lon: float,
-    radius: float = 10.0
-) -> list:
+    radius: float = 10.0,
+    limit: Optional[int] = None,
+    offset: int = 0,
+    index: Optional[GridIndex] = None,
+    coordinates: Optional[PharmacyCoordinates] = None
+) -> Tuple[list, int]:
     """
-    Filter pharmacies within specified radius and sort by distance
+    Page of pharmacies within radius, nearest first
+    
+    Selection works on numeric distances (heap or partition), and only the
+    returned rows become dicts with a formatted distance string. Ties keep
+    the pharmacies' original order.
     
     Args:
-        pharmacies: List of pharmacy dictionaries
+        pharmacies: List of pharmacy dictionaries, or a RecordView such as
+            PharmacyTable
         user_lat: User's latitude
         user_lon: User's longitude
         radius: Search radius in kilometers
+        limit: Maximum number of pharmacies to return (None for all)
+        offset: Number of nearest pharmacies to skip
+        index: Optional GridIndex (or CachedGridIndex) built over
+            `pharmacies`; when given, only the candidates it returns for
+            the radius are checked
+        coordinates: Optional PharmacyCoordinates built over `pharmacies`;
+            when given, distances are computed in one vectorized pass
     
     Returns:
-        List of pharmacies within radius, sorted by distance
+        Tuple of (pharmacies on the page, total pharmacies within radius)
     """
-    result = []
-    
-    for pharmacy in pharmacies:
-        distance = calculate_distance(
-            user_lat,
-            user_lon,
-            pharmacy['location']['latitude'],
-            pharmacy['location']['longitude']
+    if coordinates is not None:
+        page, total = _nearest_vectorized(
+            coordinates, user_lat, user_lon, radius, limit, offset, index
         )
+        return _page_with_distances(pharmacies, page), total
+    
+    if index is not None:
+        candidates = index.candidates(user_lat, user_lon, radius).tolist()
+    else:
+        candidates = range(len(pharmacies))
+    
+    found = []
+    for position in candidates:
+        location = pharmacies[position]['location']
+        distance = calculate_distance(user_lat, user_lon, location['latitude'], location['longitude'])
         
         if distance <= radius:
-            pharmacy_with_distance = pharmacy.copy()
-            pharmacy_with_distance['distance'] = f"{distance} km"
-            result.append(pharmacy_with_distance)
+            found.append((distance, position))
     
-    # Sort by distance
-    result.sort(key=lambda x: float(x['distance'].replace(' km', '')))
+    total = len(found)
+    if limit is None:
+        found.sort()
+        page = found[offset:]
+    else:
+        page = heapq.nsmallest(offset + limit, found)[offset:]
     
-    return result
\ No newline at end of file
+    return _page_with_distances(pharmacies, page), total
+
+def get_pharmacies_within_radius(
+    pharmacies: list,
+    user_lat: float,
+    user_lon: float,
+    radius: float = 10.0,
+    index: Optional[GridIndex] = None,
+    coordinates: Optional[PharmacyCoordinates] = None
+) -> list:
+    """
+    Filter pharmacies within specified radius and sort by distance
+    
+    Args:
+        pharmacies: List of pharmacy dictionaries
+        user_lat: User's latitude
+        user_lon: User's longitude
+        radius: Search radius in kilometers
+        index: Optional GridIndex built over `pharmacies`
+        coordinates: Optional PharmacyCoordinates built over `pharmacies`
+    
+    Returns:
+        List of pharmacies within radius, sorted by distance
+    """
+    return find_nearest_pharmacies(
+        pharmacies, user_lat, user_lon, radius, index=index, coordinates=coordinates
+    )[0]
@@ -0,0 +1,137 @@
+# backend/app/utils/fast_json.py
+import json
+import logging
+import math
+from typing import Any, Dict, List, Sequence, Tuple, Type
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from typing_extensions import NotRequired, TypedDict
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    orjson = None
+import pydantic_core
+
+logger = logging.getLogger(__name__)
+
+
+def dumps(value: Any) -> bytes:
+    """Compact JSON bytes of plain Python data (orjson, else pydantic-core's encoder)"""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return pydantic_core.to_json(value)
+
+
+def _has_non_finite(value: Any) -> bool:
+    if isinstance(value, float):
+        return not math.isfinite(value)
+    if isinstance(value, dict):
+        return any(_has_non_finite(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return any(_has_non_finite(item) for item in value)
+    return False
+
+
+def dumps_indented(value: Any) -> bytes:
+    """
+    JSON laid out like json.dumps(value, indent=2, ensure_ascii=False),
+    UTF-8 encoded
+
+    orjson spells some floats differently (1e20 rather than 1e+20) but
+    they parse back to the same values. Values it would change or reject,
+    NaN and infinities (which it writes as null) and integers beyond 64
+    bits, go through json.dumps instead.
+    """
+    if orjson is not None:
+        try:
+            data = orjson.dumps(value, option=orjson.OPT_INDENT_2)
+        except orjson.JSONEncodeError:
+            pass
+        else:
+            if b"null" not in data or not _has_non_finite(value):
+                return data
+    return json.dumps(value, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def loads(data: Any) -> Any:
+    """Parse JSON from str or bytes (orjson, else the json module)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _record_type(model: Type[BaseModel]) -> type:
+    """TypedDict with a model's fields, nested models included, for validating plain dicts"""
+    fields = {}
+    for name, field in model.model_fields.items():
+        annotation = field.annotation
+        if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            annotation = _record_type(annotation)
+        fields[name] = annotation if field.is_required() else NotRequired[annotation]
+    return TypedDict(f"{model.__name__}Record", fields)
+
+
+class RecordCodec:
+    """
+    Validate plain record dicts against a response model once, then
+    serialize them directly
+
+    validate() runs where records enter the app (catalog loads, imports).
+    Records that passed it already have the model's shape, so the dump
+    methods skip pydantic and hand the dicts to the JSON encoder; optional
+    fields a record lacks are filled with their defaults, which gives the
+    same bytes FastAPI would produce through response_model.
+    """
+
+    def __init__(self, model: Type[BaseModel]):
+        self.model = model
+        self.fields = tuple(model.model_fields)
+        self.defaults = {
+            name: field.default
+            for name, field in model.model_fields.items()
+            if not field.is_required()
+        }
+        self._adapter = TypeAdapter(List[_record_type(model)])
+
+    def check(self, records: Sequence[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Dict[int, str]]:
+        """Validated, coerced copies of the valid records, and an error message per invalid position"""
+        try:
+            return self._adapter.validate_python(records), {}
+        except ValidationError as e:
+            invalid: Dict[int, str] = {}
+            for error in e.errors():
+                if not error["loc"]:
+                    raise
+                field = ".".join(str(part) for part in error["loc"][1:])
+                invalid.setdefault(error["loc"][0], f"{field}: {error['msg']}" if field else error["msg"])
+            valid = self._adapter.validate_python(
+                [record for position, record in enumerate(records) if position not in invalid]
+            )
+            return valid, invalid
+
+    def validate(self, records: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Validated, coerced copies of the records; invalid records are logged and dropped"""
+        valid, invalid = self.check(records)
+        if invalid:
+            logger.warning(
+                "Skipping %s invalid %s records (first error: %s)",
+                len(invalid), self.model.__name__, next(iter(invalid.values()))
+            )
+        return valid
+
+    def conform(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """The record with defaults for any optional fields it lacks"""
+        if len(record) == len(self.fields):
+            return record
+        return {name: record[name] if name in record else self.defaults[name] for name in self.fields}
+
+    def dump_list(self, records: Sequence[Dict[str, Any]]) -> bytes:
+        """Records as one JSON array"""
+        if not self.defaults:
+            return dumps(records if isinstance(records, list) else list(records))
+        return dumps([self.conform(record) for record in records])
+
+    def dump_lines(self, records: Sequence[Dict[str, Any]]) -> bytes:
+        """Records as newline-delimited JSON, one record per line"""
+        return b"".join(dumps(self.conform(record)) + b"\n" for record in records)
@@ -0,0 +1,57 @@
+# backend/app/utils/http_cache.py
+import hashlib
+from typing import Any, List, NamedTuple, Optional
+
+from fastapi import Response, status
+
+from app.utils.fast_json import RecordCodec
+from app.utils.metrics import metrics
+
+
+class CachedBody(NamedTuple):
+    """A pre-serialized JSON response body and its entity tag"""
+    body: bytes
+    etag: str
+    count: int
+
+
+def serialize_records(records: List[Any], codec: RecordCodec) -> CachedBody:
+    """
+    Serialize already validated records as a JSON array
+
+    The body matches what FastAPI would produce through response_model, so
+    it can be stored and replayed until the dataset changes.
+    """
+    with metrics.span("serialize"):
+        body = codec.dump_list(records)
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    return CachedBody(body=body, etag=etag, count=len(records))
+
+
+def serialize_ndjson(records: List[Any], codec: RecordCodec) -> bytes:
+    """Serialize already validated records as newline-delimited JSON, one record per line"""
+    with metrics.span("serialize"):
+        return codec.dump_lines(records)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def cached_json_response(cached: CachedBody, if_none_match: Optional[str]) -> Response:
+    """Return 304 Not Modified when the client's copy is current, else the cached body"""
+    headers = {"ETag": cached.etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, cached.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
@@ -0,0 +1,165 @@
+# backend/app/utils/metrics.py
+import bisect
+import contextlib
+import functools
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from app.config import settings
+
+# Latency buckets in seconds, from sub-millisecond lookups to slow full scans
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+
+class Histogram:
+    """Prometheus-style histogram family keyed by label values"""
+
+    def __init__(self, name: str, documentation: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        # labels -> [per-bucket counts..., +Inf count], sum
+        self._series: Dict[Labels, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: str):
+        key = tuple(sorted(labels.items()))
+        slot = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = ([0] * (len(self.buckets) + 1), [0.0])
+                self._series[key] = series
+            series[0][slot] += 1
+            series[1][0] += value
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            snapshot = [(key, list(counts), total[0]) for key, (counts, total) in self._series.items()]
+        for key, counts, total in snapshot:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                yield f"{self.name}_bucket{format_labels(key + (('le', repr(bound)),))} {cumulative}"
+            cumulative += counts[-1]
+            yield f"{self.name}_bucket{format_labels(key + (('le', '+Inf'),))} {cumulative}"
+            yield f"{self.name}_sum{format_labels(key)} {total}"
+            yield f"{self.name}_count{format_labels(key)} {cumulative}"
+
+
+class Metrics:
+    """
+    Process-wide latency metrics
+
+    Holds per-route request histograms and per-stage histograms (storage
+    calls, file I/O, JSON parsing, distance math, serialization). Other
+    components can add their own lines through register_collector. When
+    disabled, span() and timed() skip all timing.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.requests = Histogram(
+            "http_request_duration_seconds",
+            "HTTP request latency by method, route template and status"
+        )
+        self.stages = Histogram(
+            "app_stage_duration_seconds",
+            "Time spent in instrumented stages of request handling"
+        )
+        self._collectors: List[Callable[[], Iterable[str]]] = []
+        self._null_span = contextlib.nullcontext()
+
+    @contextlib.contextmanager
+    def _span(self, stage: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages.observe(time.perf_counter() - started, stage=stage)
+
+    def span(self, stage: str):
+        """Context manager timing one stage"""
+        if not self.enabled:
+            return self._null_span
+        return self._span(stage)
+
+    def timed(self, stage: str) -> Callable:
+        """Decorator timing every call of a function as one stage"""
+        def decorator(func: Callable) -> Callable:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                started = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.stages.observe(time.perf_counter() - started, stage=stage)
+            return wrapper
+        return decorator
+
+    def register_collector(self, collector: Callable[[], Iterable[str]]):
+        """Add a callable that yields extra Prometheus text lines"""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """All metrics in Prometheus text exposition format"""
+        lines: List[str] = []
+        lines.extend(self.requests.render())
+        lines.extend(self.stages.render())
+        for collector in self._collectors:
+            lines.extend(collector())
+        return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request latency per route template"""
+
+    def __init__(self, app, metrics: Metrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.metrics.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = [500]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status_code[0] = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # Label by route template, not raw path, to keep cardinality bounded
+            route = scope.get("route")
+            self.metrics.requests.observe(
+                time.perf_counter() - started,
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=str(status_code[0])
+            )
+
+
+# Global metrics instance
+metrics = Metrics(enabled=settings.metrics_enabled)
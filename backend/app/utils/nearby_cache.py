@@ -0,0 +1,163 @@
+# backend/app/utils/nearby_cache.py
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, NamedTuple, Tuple
+
+import numpy as np
+
+from app.utils.distance import PharmacyCoordinates, haversine_distances
+from app.utils.spatial import GridIndex, RADIUS_PADDING_KM
+
+# Upper bound on the length of one degree of latitude or longitude
+KM_PER_DEGREE = 111.2
+
+CellKey = Tuple[int, int, int]
+
+
+class _Entry(NamedTuple):
+    generation: int
+    expires_at: float
+    positions: np.ndarray
+
+
+class NearbyCache:
+    """
+    Bounded LRU cache of nearby-search candidate sets, keyed on quantized
+    (lat, lng, radius)
+
+    Queries are snapped to a cell of `cell_deg` degrees and their radius
+    rounded up to a multiple of `radius_step_km`. An entry holds every
+    pharmacy near enough to the cell centre to be within that radius of
+    some point in the cell (triangle inequality). Exact distances for the
+    query point are then computed over this small candidate set only.
+
+    Entries expire after `ttl` seconds. Pharmacy data changes invalidate
+    them all: wrap() is called whenever the spatial index is rebuilt, and
+    entries made for an older index are never returned.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 1024,
+        ttl: float = 300.0,
+        cell_deg: float = 0.01,
+        radius_step_km: float = 1.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.capacity = capacity
+        self.ttl = ttl
+        self.cell_deg = cell_deg
+        self.radius_step_km = radius_step_km
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[CellKey, _Entry]" = OrderedDict()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def wrap(self, index: GridIndex, coordinates: PharmacyCoordinates) -> "CachedGridIndex":
+        """Start caching for a newly built spatial index, dropping entries of the previous one"""
+        with self._lock:
+            self._generation += 1
+            if self._entries:
+                self.invalidations += 1
+                self._entries.clear()
+            return CachedGridIndex(self, index, coordinates, self._generation)
+
+    def key(self, lat: float, lon: float, radius_km: float) -> CellKey:
+        return (
+            math.floor(lat / self.cell_deg),
+            math.floor(lon / self.cell_deg),
+            math.ceil(radius_km / self.radius_step_km - 1e-9)
+        )
+
+    def _get(self, key: CellKey, generation: int):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.generation == generation:
+                if entry.expires_at > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry.positions
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            return None
+
+    def _put(self, key: CellKey, generation: int, positions: np.ndarray):
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[key] = _Entry(generation, self._clock() + self.ttl, positions)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations
+            }
+
+    def collect(self) -> Iterable[str]:
+        """Prometheus lines for metrics.register_collector"""
+        stats = self.stats()
+        yield "# HELP nearby_cache_entries Cached nearby-search candidate sets"
+        yield "# TYPE nearby_cache_entries gauge"
+        yield f"nearby_cache_entries {stats['entries']}"
+        for name, documentation in (
+            ("hits", "Nearby searches served from a cached candidate set"),
+            ("misses", "Nearby searches that had to query the spatial index"),
+            ("evictions", "Candidate sets evicted to stay within capacity"),
+            ("expirations", "Candidate sets dropped after their TTL"),
+            ("invalidations", "Cache flushes caused by pharmacy data changes")
+        ):
+            yield f"# HELP nearby_cache_{name}_total {documentation}"
+            yield f"# TYPE nearby_cache_{name}_total counter"
+            yield f"nearby_cache_{name}_total {stats[name]}"
+
+
+class CachedGridIndex:
+    """GridIndex stand-in whose candidates() go through a NearbyCache"""
+
+    def __init__(self, cache: NearbyCache, index: GridIndex, coordinates: PharmacyCoordinates, generation: int):
+        self.cache = cache
+        self.index = index
+        self.coordinates = coordinates
+        self.generation = generation
+
+    def candidates(self, lat: float, lon: float, radius_km: float) -> np.ndarray:
+        """Ascending positions of a superset of the points within radius_km of (lat, lon)"""
+        # Cells only exist for real coordinates; let the index handle the rest
+        if not (-90.0 <= lat <= 90.0 and math.isfinite(lon) and math.isfinite(radius_km)):
+            return self.index.candidates(lat, lon, radius_km)
+        cache = self.cache
+        key = cache.key(lat, lon, radius_km)
+        positions = cache._get(key, self.generation)
+        if positions is not None:
+            return positions
+
+        # Any point in the cell is within half a cell of the centre on each
+        # axis, so within cell_deg * KM_PER_DEGREE km of it
+        row, col, step = key
+        center_lat = min(90.0, (row + 0.5) * cache.cell_deg)
+        center_lon = (col + 0.5) * cache.cell_deg
+        cover_km = step * cache.radius_step_km + cache.cell_deg * KM_PER_DEGREE + RADIUS_PADDING_KM
+
+        positions = self.index.candidates(center_lat, center_lon, cover_km)
+        distances = haversine_distances(center_lat, center_lon, self.coordinates, positions)
+        positions = positions[distances <= cover_km]
+        positions.flags.writeable = False
+        cache._put(key, self.generation, positions)
+        return positions
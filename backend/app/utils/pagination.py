@@ -0,0 +1,52 @@
+# backend/app/utils/pagination.py
+import base64
+import binascii
+from typing import AsyncIterator, Awaitable, Callable, Optional, Tuple
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+# Records read from storage per chunk when streaming a whole dataset
+STREAM_PAGE_SIZE = 500
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+class InvalidCursorError(ValueError):
+    """Raised for cursors that were not issued by the endpoint they were sent to"""
+
+
+def encode_cursor(dataset: str, position: int) -> str:
+    """
+    Opaque cursor for a position within a dataset
+
+    `dataset` names what is being paged, including any filters, so a
+    cursor only works for the listing that issued it.
+    """
+    return base64.urlsafe_b64encode(f"{dataset}:{position}".encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(dataset: str, cursor: Optional[str]) -> int:
+    """Storage position encoded in a cursor; no cursor means the start"""
+    if not cursor:
+        return 0
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        name, _, position = base64.urlsafe_b64decode(padded).decode("utf-8").rpartition(":")
+        if name == dataset and position.isdigit():
+            return int(position)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        pass
+    raise InvalidCursorError(f"Invalid cursor for {dataset}")
+
+
+async def stream_pages(
+    fetch: Callable[[int], Awaitable[Tuple[bytes, Optional[int]]]],
+    position: int = 0
+) -> AsyncIterator[bytes]:
+    """Yield serialized pages until `fetch` reports there is no next page"""
+    next_position: Optional[int] = position
+    while next_position is not None:
+        chunk, next_position = await fetch(next_position)
+        if chunk:
+            yield chunk
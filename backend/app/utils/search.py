@@ -0,0 +1,258 @@
+# backend/app/utils/search.py
+import bisect
+import re
+from array import array
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.storage.base import normalize_batch_code
+from app.storage.records import MedicineTable
+
+TOKEN_PATTERN = re.compile(r"[0-9a-z]+")
+
+# Fuzzy matches beyond this many edits are not useful as suggestions
+MAX_EDIT_DISTANCE = 2
+
+# Codes converted to a character matrix at a time while building the index
+BUILD_CHUNK = 65536
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-case alphanumeric tokens of a name or company"""
+    return TOKEN_PATTERN.findall(text.casefold())
+
+
+def _char_matrix(codes: Sequence[str], width: int) -> np.ndarray:
+    """Code points of each code, zero-padded to `width` columns"""
+    chars = np.zeros((len(codes), width), dtype=np.uint32)
+    if len(codes) and width:
+        chars[:] = np.array(codes, dtype=f"U{width}").view(np.uint32).reshape(len(codes), width)
+    return chars
+
+
+class MedicineSearchIndex:
+    """
+    Prefix, fuzzy and token search over a medicine catalog
+
+    Normalized batch codes are kept in one sorted list, so a prefix is a
+    contiguous range found with two bisects.
+
+    The same sorted list is walked as a trie for fuzzy matching. Each
+    depth d keeps the start of every run of codes sharing a (d + 1)-long
+    prefix, and the character that run adds, in numpy arrays; codes with
+    a common prefix are one run, so a "MED" prefix is a single node. The
+    walk carries one edit-distance row per surviving node and drops a
+    node once its whole row is past the distance, so only prefixes
+    within k edits of the query are ever visited, however many codes
+    share them.
+
+    Name and company tokens are kept sorted, each with an ascending
+    posting list of catalog positions; all postings are one uint32 array
+    in vocabulary order, so the tokens starting with a term are one
+    contiguous slice of it. Terms are matched from the smallest slice up,
+    and each further term filters the remaining positions with numpy,
+    never a Python set. The index reads the table's columns and never
+    builds a medicine dict.
+    """
+
+    def __init__(self, medicines: MedicineTable):
+        self.medicines = medicines
+
+        keyed: Dict[str, int] = {}
+        for position, batch_code in enumerate(medicines.batch_code):
+            # First record wins, matching exact lookups
+            keyed.setdefault(normalize_batch_code(batch_code), position)
+        self.codes = sorted(keyed)
+        self.code_positions = array("I", (keyed[code] for code in self.codes))
+        self.code_lengths = np.fromiter(map(len, self.codes), dtype=np.int32, count=len(self.codes))
+        self._build_trie()
+
+        # Catalogs repeat the same name and company many times, so group
+        # positions by text and tokenize each distinct pair once
+        groups: Dict[Tuple[str, str], array] = {}
+        for position, text in enumerate(zip(medicines.name, medicines.company)):
+            group = groups.get(text)
+            if group is None:
+                group = groups[text] = array("I")
+            group.append(position)
+
+        postings: Dict[str, array] = {}
+        for (name, company), positions in groups.items():
+            for token in set(tokenize(name)) | set(tokenize(company)):
+                posting = postings.get(token)
+                if posting is None:
+                    posting = postings[token] = array("I")
+                posting.extend(positions)
+        self.vocabulary = sorted(postings)
+        sizes = np.fromiter((len(postings[token]) for token in self.vocabulary), dtype=np.int64, count=len(postings))
+        # Postings of vocabulary[i] are posting_positions[posting_offsets[i]:posting_offsets[i + 1]]
+        self.posting_offsets = np.zeros(len(self.vocabulary) + 1, dtype=np.int64)
+        np.cumsum(sizes, out=self.posting_offsets[1:])
+        self.posting_positions = np.empty(int(self.posting_offsets[-1]), dtype=np.uint32)
+        for i, token in enumerate(self.vocabulary):
+            # Groups are in first-seen order, so a token's positions need sorting
+            self.posting_positions[self.posting_offsets[i]:self.posting_offsets[i + 1]] = np.sort(
+                np.frombuffer(postings.pop(token), dtype=np.uint32)
+            )
+
+    def _build_trie(self):
+        lengths = self.code_lengths.astype(np.int64)
+        width = int(lengths.max()) if len(lengths) else 0
+
+        # Common prefix length of each code with the one before it; the
+        # first code shares nothing
+        shared = np.full(len(self.codes), -1, dtype=np.int64)
+        depth_chunks: List[List[np.ndarray]] = [[] for _ in range(width)]
+        char_chunks: List[List[np.ndarray]] = [[] for _ in range(width)]
+        for start in range(0, len(self.codes), BUILD_CHUNK):
+            end = min(start + BUILD_CHUNK, len(self.codes))
+            first = max(start - 1, 0)
+            chars = _char_matrix(self.codes[first:end], width)
+            differs = chars[1:] != chars[:-1]
+            common = np.where(differs.any(axis=1), differs.argmax(axis=1), width)
+            shared[first + 1:end] = np.minimum(common, np.minimum(lengths[first:end - 1], lengths[first + 1:end]))
+            chunk_shared = shared[start:end]
+            for depth in range(width):
+                # A new run of (depth + 1)-long prefixes, or a code that
+                # ends before it, starts wherever the prefix changes
+                starts = np.flatnonzero(chunk_shared <= depth)
+                depth_chunks[depth].append(starts + start)
+                char_chunks[depth].append(chars[starts + (start - first), depth])
+
+        # Node starts at each depth end with len(codes), so run i spans
+        # node_starts[i] to node_starts[i + 1]
+        self.node_starts = [
+            np.append(np.concatenate(chunks), len(self.codes)).astype(np.int32) for chunks in depth_chunks
+        ]
+        self.node_chars = [np.concatenate(chunks) for chunks in char_chunks]
+
+    def exact(self, batch_code: str) -> Optional[int]:
+        """Catalog position of a batch code, if present"""
+        code = normalize_batch_code(batch_code)
+        i = bisect.bisect_left(self.codes, code)
+        if i < len(self.codes) and self.codes[i] == code:
+            return self.code_positions[i]
+        return None
+
+    def prefix(self, prefix: str, limit: int) -> List[int]:
+        """Positions of codes starting with `prefix`, in code order"""
+        prefix = normalize_batch_code(prefix)
+        if not prefix:
+            return []
+        lo = bisect.bisect_left(self.codes, prefix)
+        # U+10FFFF sorts after every character a code can continue with
+        hi = bisect.bisect_left(self.codes, prefix + "\U0010ffff", lo)
+        return [self.code_positions[i] for i in range(lo, min(hi, lo + limit))]
+
+    def fuzzy(self, batch_code: str, max_distance: int, limit: int) -> List[Tuple[int, int]]:
+        """
+        (edit distance, position) of the closest codes within `max_distance`
+
+        Short queries get a smaller distance, since almost any short code
+        is a couple of edits away from them.
+        """
+        query = normalize_batch_code(batch_code)
+        max_distance = min(max_distance, MAX_EDIT_DISTANCE, (len(query) + 1) // 3)
+        if max_distance < 1 or not self.codes:
+            return []
+
+        query_chars = np.array([ord(char) for char in query], dtype=np.uint32)
+        steps = np.arange(len(query) + 1, dtype=np.int16)
+        # Frontier of trie nodes: the run of codes under each, and the
+        # edit-distance row of its prefix against every query prefix,
+        # capped at max_distance + 1 since only closer entries matter
+        lo = np.zeros(1, dtype=np.int32)
+        hi = np.full(1, len(self.codes), dtype=np.int32)
+        rows = np.minimum(steps, max_distance + 1)[None, :]
+        found, distances = [], []
+        for depth in range(len(self.node_starts) + 1):
+            # A code that is exactly the node's prefix sorts first in its run
+            ends = (self.code_lengths[lo] == depth) & (rows[:, -1] <= max_distance)
+            found.append(lo[ends])
+            distances.append(rows[ends, -1])
+            if depth == len(self.node_starts) or depth >= len(query) + max_distance:
+                break
+
+            node_starts = self.node_starts[depth]
+            first = np.searchsorted(node_starts, lo)
+            counts = np.searchsorted(node_starts, hi) - first
+            parents = np.repeat(np.arange(len(lo)), counts)
+            children = np.arange(len(parents)) - np.repeat(np.cumsum(counts) - counts, counts) + first[parents]
+            child_lo = node_starts[children]
+            longer = self.code_lengths[child_lo] > depth
+            parents, children, child_lo = parents[longer], children[longer], child_lo[longer]
+
+            previous = rows[parents]
+            new = np.empty_like(previous)
+            new[:, 0] = depth + 1
+            mismatch = query_chars[None, :] != self.node_chars[depth][children][:, None]
+            np.minimum(previous[:, 1:] + 1, previous[:, :-1] + mismatch, out=new[:, 1:])
+            new = np.minimum.accumulate(new - steps, axis=1) + steps
+            np.minimum(new, max_distance + 1, out=new)
+
+            close = new.min(axis=1) <= max_distance
+            lo = child_lo[close]
+            hi = node_starts[children[close] + 1]
+            rows = new[close]
+            if not len(lo):
+                break
+
+        found, distances = np.concatenate(found), np.concatenate(distances)
+        best = np.lexsort((found, distances))[:limit]
+        return [
+            (distance, self.code_positions[i])
+            for distance, i in zip(distances[best].tolist(), found[best].tolist())
+        ]
+
+    def _token_range(self, term: str) -> Tuple[int, int]:
+        """Vocabulary range of the tokens starting with a term"""
+        lo = bisect.bisect_left(self.vocabulary, term)
+        return lo, bisect.bisect_left(self.vocabulary, term + "\U0010ffff", lo)
+
+    def _postings(self, lo: int, hi: int) -> np.ndarray:
+        return self.posting_positions[self.posting_offsets[lo]:self.posting_offsets[hi]]
+
+    def _presence(self, lo: int, hi: int) -> np.ndarray:
+        """Mask of the positions with a token in vocabulary[lo:hi]; linear, unlike sorting the postings"""
+        present = np.zeros(len(self.medicines), dtype=bool)
+        present[self._postings(lo, hi)] = True
+        return present
+
+    def _token_matches(self, lo: int, hi: int) -> np.ndarray:
+        """Ascending positions with a token in vocabulary[lo:hi]"""
+        if hi - lo == 1:
+            return self._postings(lo, hi)
+        return np.flatnonzero(self._presence(lo, hi))
+
+    def _has_token(self, lo: int, hi: int, positions: np.ndarray) -> np.ndarray:
+        """Which of the ascending positions have a token in vocabulary[lo:hi]"""
+        if hi - lo == 1:
+            postings = self._postings(lo, hi)
+            slots = np.minimum(np.searchsorted(postings, positions), len(postings) - 1)
+            return postings[slots] == positions
+        return self._presence(lo, hi)[positions]
+
+    def tokens(self, text: str, limit: int) -> List[int]:
+        """
+        Positions of medicines whose name or company has a word starting
+        with every query term, so partially typed words still match
+        """
+        terms = tokenize(text)
+        if not terms:
+            return []
+
+        ranges = []
+        for term in set(terms):
+            lo, hi = self._token_range(term)
+            if lo == hi:
+                return []
+            ranges.append((int(self.posting_offsets[hi] - self.posting_offsets[lo]), lo, hi))
+        ranges.sort()
+
+        matches = self._token_matches(ranges[0][1], ranges[0][2])
+        for _, lo, hi in ranges[1:]:
+            if not len(matches):
+                break
+            matches = matches[self._has_token(lo, hi, matches)]
+        return matches[:limit].tolist()
@@ -0,0 +1,84 @@
+# backend/app/utils/single_flight.py
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Tuple
+
+from app.utils.counters import RankedCounter
+from app.utils.metrics import format_labels
+
+FlightKey = Tuple[str, Tuple[Hashable, ...]]
+
+
+class SingleFlight:
+    """
+    Run identical concurrent calls once and share the result
+
+    The first call for an (operation, arguments) key starts the work as a
+    task; calls with the same key that arrive while it runs await that task
+    instead of starting their own, and all get its result or exception.
+    Nothing is cached: once the task finishes, the next call runs again.
+    Each caller awaits through asyncio.shield, so a disconnecting client
+    does not cancel the work the others are waiting for.
+
+    Counts are kept per operation, and per key for the `tracked_keys` keys
+    coalesced most often, which keeps the metric cardinality bounded. All
+    methods run on the event loop thread.
+    """
+
+    def __init__(self, tracked_keys: int = 1000, top_keys: int = 10):
+        self.tracked_keys = tracked_keys
+        self.top_keys = top_keys
+        self._flights: Dict[FlightKey, asyncio.Future] = {}
+        self._executions: Dict[str, int] = {}
+        self._coalesced: Dict[str, int] = {}
+        self._coalesced_keys = RankedCounter()
+
+    async def run(self, operation: str, key: Tuple[Hashable, ...], call: Callable[[], Awaitable[Any]]) -> Any:
+        """Await call(), or the running call of an identical request"""
+        flight_key = (operation, key)
+        flight = self._flights.get(flight_key)
+        if flight is None or flight.done():
+            flight = asyncio.ensure_future(call())
+            self._flights[flight_key] = flight
+            flight.add_done_callback(lambda done: self._land(flight_key, done))
+            self._executions[operation] = self._executions.get(operation, 0) + 1
+        else:
+            self._coalesced[operation] = self._coalesced.get(operation, 0) + 1
+            self._coalesced_keys.add(flight_key)
+            if len(self._coalesced_keys) > 2 * self.tracked_keys:
+                self._coalesced_keys.trim(self.tracked_keys)
+        return await asyncio.shield(flight)
+
+    def _land(self, flight_key: FlightKey, flight: asyncio.Future):
+        if self._flights.get(flight_key) is flight:
+            del self._flights[flight_key]
+        if not flight.cancelled():
+            # Mark the exception retrieved even if every caller went away
+            flight.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self._flights),
+            "executions": dict(self._executions),
+            "coalesced": dict(self._coalesced),
+            "top_keys": self._coalesced_keys.top(self.top_keys)
+        }
+
+    def collect(self) -> Iterable[str]:
+        """Prometheus lines for metrics.register_collector"""
+        stats = self.stats()
+        yield "# HELP single_flight_in_flight Shared calls currently running"
+        yield "# TYPE single_flight_in_flight gauge"
+        yield f"single_flight_in_flight {stats['in_flight']}"
+        yield "# HELP single_flight_executions_total Calls that ran because no identical call was in flight"
+        yield "# TYPE single_flight_executions_total counter"
+        for operation, count in sorted(stats['executions'].items()):
+            yield f"single_flight_executions_total{format_labels((('operation', operation),))} {count}"
+        yield "# HELP single_flight_coalesced_total Calls served by an identical call already in flight"
+        yield "# TYPE single_flight_coalesced_total counter"
+        for operation, count in sorted(stats['coalesced'].items()):
+            yield f"single_flight_coalesced_total{format_labels((('operation', operation),))} {count}"
+        yield "# HELP single_flight_key_coalesced Coalesced calls of the most coalesced keys"
+        yield "# TYPE single_flight_key_coalesced gauge"
+        for (operation, key), count in stats['top_keys']:
+            labels = (('operation', operation), ('key', ",".join(map(str, key))))
+            yield f"single_flight_key_coalesced{format_labels(labels)} {count}"
@@ -0,0 +1,114 @@
+# backend/app/utils/spatial.py
+import math
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+
+# Distances are rounded to 2 decimals before the radius check, so a point
+# up to 0.005 km beyond the radius still counts. Pad candidate search a bit more.
+RADIUS_PADDING_KM = 0.01
+
+
+class GridIndex:
+    """
+    Fixed-size latitude/longitude grid over a list of points
+
+    Each cell holds the positions of the points that fall inside it, as a
+    sorted numpy array. A radius query returns every point in the cells
+    overlapping the query's bounding box, which is a superset of the points
+    within the radius; callers still compute exact distances for those
+    candidates.
+    """
+
+    def __init__(self, points: Sequence[Tuple[float, float]], cell_size_deg: float = 0.05):
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        self._build(points[:, 0], points[:, 1], cell_size_deg)
+
+    @classmethod
+    def from_columns(cls, latitudes: np.ndarray, longitudes: np.ndarray, cell_size_deg: float = 0.05) -> "GridIndex":
+        """Build the grid from latitude and longitude arrays"""
+        index = cls.__new__(cls)
+        index._build(np.asarray(latitudes, dtype=np.float64), np.asarray(longitudes, dtype=np.float64), cell_size_deg)
+        return index
+
+    def _build(self, latitudes: np.ndarray, longitudes: np.ndarray, cell_size_deg: float):
+        # Snap the cell size so a whole number of cells spans 360 degrees
+        self.lon_cells = max(1, round(360.0 / cell_size_deg))
+        self.cell_size = 360.0 / self.lon_cells
+        self.size = len(latitudes)
+
+        # Same arithmetic as _row/_col, on every point at once
+        rows = np.floor(latitudes / self.cell_size).astype(np.int64)
+        cols = np.floor(np.mod(longitudes + 180.0, 360.0) / self.cell_size).astype(np.int64) % self.lon_cells
+
+        # Stable sort by cell keeps positions ascending within each cell
+        keys = rows * self.lon_cells + cols
+        order = np.argsort(keys, kind="stable").astype(np.intp)
+        cell_keys, starts = np.unique(keys[order], return_index=True)
+        self.cells: Dict[Tuple[int, int], np.ndarray] = {
+            divmod(key, self.lon_cells): positions
+            for key, positions in zip(cell_keys.tolist(), np.split(order, starts[1:]))
+        }
+
+    def _row(self, lat: float) -> int:
+        return math.floor(lat / self.cell_size)
+
+    def _col(self, lon: float) -> int:
+        return math.floor(((lon + 180.0) % 360.0) / self.cell_size) % self.lon_cells
+
+    def candidates(self, lat: float, lon: float, radius_km: float) -> np.ndarray:
+        """
+        Positions of all points that may lie within radius_km of (lat, lon)
+
+        Positions come back as one ascending array, so callers see
+        candidates in the same order as the original list and no Python
+        object is created per candidate.
+        """
+        # No point is a finite distance from a non-finite location, and
+        # every point is within an infinite radius
+        if not (math.isfinite(lat) and math.isfinite(lon)):
+            return np.zeros(0, dtype=np.intp)
+        if not math.isfinite(radius_km):
+            return np.arange(self.size, dtype=np.intp)
+        angular = (radius_km + RADIUS_PADDING_KM) / EARTH_RADIUS_KM
+        lat_rad = math.radians(lat)
+        lat_min = lat_rad - angular
+        lat_max = lat_rad + angular
+
+        # Longitude span of a spherical cap; the cap covers every longitude
+        # when it reaches a pole
+        if lat_min <= -math.pi / 2 or lat_max >= math.pi / 2 or math.sin(angular) >= math.cos(lat_rad):
+            lon_span = None
+        else:
+            lon_span = math.degrees(math.asin(math.sin(angular) / math.cos(lat_rad)))
+
+        row_min = self._row(math.degrees(lat_min))
+        row_max = self._row(math.degrees(lat_max))
+        if lon_span is None or 2 * lon_span >= 360.0 - self.cell_size:
+            cols = None
+        else:
+            start = math.floor((lon - lon_span + 180.0) / self.cell_size)
+            end = math.floor((lon + lon_span + 180.0) / self.cell_size)
+            cols = {col % self.lon_cells for col in range(start, end + 1)}
+
+        box_cells = (row_max - row_min + 1) * (len(cols) if cols is not None else self.lon_cells)
+        found: List[np.ndarray] = []
+        if box_cells > len(self.cells):
+            # Sparse data: walking the occupied cells is cheaper than the box
+            for (row, col), positions in self.cells.items():
+                if row_min <= row <= row_max and (cols is None or col in cols):
+                    found.append(positions)
+        else:
+            for row in range(row_min, row_max + 1):
+                for col in (cols if cols is not None else range(self.lon_cells)):
+                    positions = self.cells.get((row, col))
+                    if positions is not None:
+                        found.append(positions)
+
+        if not found:
+            return np.zeros(0, dtype=np.intp)
+        result = np.concatenate(found)
+        result.sort()
+        return result
@@ -0,0 +1,135 @@
+# backend/app/utils/verify_payloads.py
+"""
+Medicine verification responses prepared ahead of the scans that need them
+
+Everything in a verification result except the echoed code and whether
+the medicine has expired depends only on the medicine, so it is built and
+serialized once per catalog version. A verification is then one key
+lookup plus a few byte concatenations. Expiry is compared as a date
+ordinal against today's, so no date is parsed per request.
+"""
+import functools
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.storage.base import normalize_batch_code
+from app.storage.records import KeyIndex, MedicineTable
+from app.utils.fast_json import dumps
+
+# Expiry ordinal of medicines whose expiry date is not an ISO date; their
+# expired flag is null
+UNKNOWN_EXPIRY = 0
+
+NOT_FOUND_MESSAGE = "Medicine not found in database"
+
+# Serialized medicine data without its closing brace, and its expiry ordinal
+Prepared = Tuple[bytes, int]
+
+_EXPIRED = {True: b',"expired":true}}', False: b',"expired":false}}', None: b',"expired":null}}'}
+
+
+def today_ordinal() -> int:
+    return date.today().toordinal()
+
+
+@functools.lru_cache(maxsize=4096)
+def expiry_fields(expiry_date: str) -> Tuple[str, int]:
+    """Display form ("Mar 2026") and date ordinal of an expiry date; other strings are shown as they are"""
+    try:
+        expiry = datetime.fromisoformat(expiry_date)
+    except (TypeError, ValueError):
+        return expiry_date, UNKNOWN_EXPIRY
+    return expiry.strftime("%b %Y"), expiry.toordinal()
+
+
+def prepare(medicine: Dict[str, Any]) -> Prepared:
+    """The per-medicine part of a verification result, serialized"""
+    expiry, ordinal = expiry_fields(medicine['expiry_date'])
+    data = dumps({
+        "name": medicine['name'],
+        "company": medicine['company'],
+        "expiry": expiry,
+        "status": "Authentic" if medicine['is_authentic'] else "Suspicious",
+        "manufacturing_date": medicine['manufacturing_date']
+    })
+    return data[:-1], ordinal
+
+
+def verify_response(code: str, prepared: Optional[Prepared], today: int) -> bytes:
+    """A MedicineVerifyResponse body for a code and its prepared medicine (None if unknown)"""
+    if prepared is None:
+        return b'{"is_valid":false,"code":' + dumps(code) + b',"message":"' + NOT_FOUND_MESSAGE.encode() + b'","data":null}'
+    data, ordinal = prepared
+    expired = None if ordinal == UNKNOWN_EXPIRY else today > ordinal
+    return b'{"is_valid":true,"code":' + dumps(code) + b',"message":null,"data":' + data + _EXPIRED[expired]
+
+
+def batch_verify_response(results: Sequence[bytes], valid_count: int) -> bytes:
+    """A MedicineBatchVerifyResponse body from serialized results"""
+    return (
+        b'{"count":' + str(len(results)).encode() + b',"valid_count":' + str(valid_count).encode()
+        + b',"results":[' + b",".join(results) + b']}'
+    )
+
+
+class VerifyPayloads:
+    """
+    Prepared verification data of every medicine, looked up by batch code
+
+    The serialized data of all medicines is one bytes buffer with the
+    byte bounds of each, next to an int32 array of expiry ordinals, so a
+    large catalog costs two arrays rather than an object per medicine.
+    Codes are matched like the store matches them (normalized, first
+    medicine wins). A store's own batch-code index over the same medicines
+    can be passed as `index` instead of building another one.
+    """
+
+    def __init__(self, medicines: Sequence[Dict[str, Any]], index: Optional[Any] = None):
+        medicines = MedicineTable.from_records(medicines)
+        if index is None:
+            index = KeyIndex([normalize_batch_code(code) for code in medicines.batch_code])
+        self.index = index
+        self.expiry_ordinals = np.empty(len(medicines), dtype=np.int32)
+        self._bounds = np.empty(len(medicines) + 1, dtype=np.int64)
+        parts = []
+        size = 0
+        for position in range(len(medicines)):
+            data, self.expiry_ordinals[position] = prepare(medicines.record(position))
+            self._bounds[position] = size
+            parts.append(data)
+            size += len(data)
+        self._bounds[len(medicines)] = size
+        self._data = b"".join(parts)
+
+    def __len__(self) -> int:
+        return len(self.expiry_ordinals)
+
+    def _prepared(self, position: Optional[int]) -> Optional[Prepared]:
+        if position is None:
+            return None
+        return (
+            self._data[self._bounds[position]:self._bounds[position + 1]],
+            int(self.expiry_ordinals[position])
+        )
+
+    def find(self, batch_code: str) -> Optional[Prepared]:
+        return self._prepared(self.index.position(normalize_batch_code(batch_code)))
+
+    def find_many(self, batch_codes: Sequence[str]) -> List[Optional[Prepared]]:
+        """Prepared data for many codes in one vectorized lookup, aligned with the input"""
+        positions = self.index.lookup([normalize_batch_code(code) for code in batch_codes])
+        found = np.array([position for position in positions if position is not None], dtype=np.int64)
+        data, bounds = self._data, self._bounds
+        prepared = iter(zip(
+            bounds[found].tolist(), bounds[found + 1].tolist(), self.expiry_ordinals[found].tolist()
+        ))
+        results: List[Optional[Prepared]] = []
+        for position in positions:
+            if position is None:
+                results.append(None)
+            else:
+                start, end, ordinal = next(prepared)
+                results.append((data[start:end], ordinal))
+        return results
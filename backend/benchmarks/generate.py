@@ -0,0 +1,192 @@
+# backend/benchmarks/generate.py
+"""
+Synthetic data generator for benchmarks
+
+Writes medicines.json, pharmacies.json and reports.json in the same
+format as backend/data, at a configurable scale. Pharmacies are clustered
+around real Indian city centres so nearby searches see realistic density.
+
+Usage (from backend/):
+    python -m benchmarks.generate --out /tmp/bench-data --scale 100k
+    python -m benchmarks.generate --out /tmp/bench-data --medicines 1000000 --pharmacies 200000 --reports 50000
+"""
+import argparse
+import json
+import random
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+SCALES = {
+    "1k": 1_000,
+    "10k": 10_000,
+    "100k": 100_000,
+    "1m": 1_000_000,
+    "10m": 10_000_000,
+}
+
+# (name, latitude, longitude, relative weight, spread in degrees)
+CITIES: List[Tuple[str, float, float, float, float]] = [
+    ("Mumbai", 19.0760, 72.8777, 20, 0.12),
+    ("Delhi", 28.6139, 77.2090, 20, 0.15),
+    ("Bengaluru", 12.9716, 77.5946, 14, 0.10),
+    ("Hyderabad", 17.3850, 78.4867, 10, 0.10),
+    ("Chennai", 13.0827, 80.2707, 10, 0.09),
+    ("Kolkata", 22.5726, 88.3639, 10, 0.08),
+    ("Pune", 18.5204, 73.8567, 7, 0.07),
+    ("Ahmedabad", 23.0225, 72.5714, 6, 0.07),
+    ("Jaipur", 26.9124, 75.7873, 4, 0.06),
+    ("Lucknow", 26.8467, 80.9462, 4, 0.06),
+]
+
+COMPANIES = [
+    "Sun Pharma Ltd.", "Cipla Ltd.", "Dr. Reddy's Lab", "Lupin Pharmaceuticals",
+    "Torrent Pharma", "Bayer India", "Alkem Laboratories", "Zydus Lifesciences",
+    "Glenmark Pharmaceuticals", "Mankind Pharma", "Abbott India", "Intas Pharmaceuticals",
+]
+
+DRUGS = [
+    "Paracetamol", "Amoxicillin", "Ibuprofen", "Azithromycin", "Metformin",
+    "Aspirin", "Cetirizine", "Pantoprazole", "Atorvastatin", "Amlodipine",
+    "Losartan", "Omeprazole", "Ciprofloxacin", "Doxycycline", "Montelukast",
+]
+
+STRENGTHS = ["5mg", "10mg", "20mg", "75mg", "250mg", "400mg", "500mg", "650mg", "850mg"]
+
+STREETS = ["Main Street", "Market Road", "Station Road", "Ring Road", "MG Road", "Link Road", "Park Street"]
+
+REPORT_STATUSES = [("pending", 60), ("investigating", 20), ("resolved", 15), ("rejected", 5)]
+
+REPORT_DESCRIPTIONS = [
+    "Packaging looks different from the usual strip",
+    "QR code on the box does not scan correctly",
+    "Tablets are a different colour than before",
+    "Batch number printed on the strip is smudged",
+    "Seal on the bottle was already broken at purchase",
+]
+
+
+def parse_count(value: str) -> int:
+    """Parse a row count such as 5000, 100k or 10m"""
+    value = value.strip().lower()
+    if value in SCALES:
+        return SCALES[value]
+    multiplier = 1
+    if value[-1] in "km":
+        multiplier = 1_000 if value[-1] == "k" else 1_000_000
+        value = value[:-1]
+    return int(float(value) * multiplier)
+
+
+def batch_code(i: int) -> str:
+    """Unique, realistic-looking batch code for row i"""
+    prefix = "".join(chr(ord("A") + (i // 26 ** n) % 26) for n in (2, 1, 0))
+    return f"{prefix}{i:08d}"
+
+
+def generate_medicines(count: int, rng: random.Random) -> Iterator[Dict[str, Any]]:
+    start = date(2023, 1, 1)
+    for i in range(count):
+        manufactured = start + timedelta(days=rng.randrange(0, 900))
+        expiry = manufactured + timedelta(days=rng.choice([365, 540, 730, 1095]))
+        yield {
+            "id": str(i + 1),
+            "batch_code": batch_code(i),
+            "name": f"{rng.choice(DRUGS)} {rng.choice(STRENGTHS)}",
+            "company": rng.choice(COMPANIES),
+            "expiry_date": expiry.isoformat(),
+            "is_authentic": rng.random() > 0.02,
+            "manufacturing_date": manufactured.isoformat()
+        }
+
+
+def generate_pharmacies(count: int, rng: random.Random) -> Iterator[Dict[str, Any]]:
+    weights = [city[3] for city in CITIES]
+    for i in range(count):
+        name, lat, lon, _, spread = rng.choices(CITIES, weights=weights)[0]
+        yield {
+            "id": str(i + 1),
+            "name": f"Pharmacy {i + 1}",
+            "address": f"{rng.randrange(1, 999)} {rng.choice(STREETS)}, {name}",
+            "phone": f"+91 9{rng.randrange(10 ** 8, 10 ** 9):09d}",
+            "location": {
+                "latitude": round(rng.gauss(lat, spread), 6),
+                "longitude": round(rng.gauss(lon, spread), 6)
+            }
+        }
+
+
+def generate_reports(count: int, medicine_count: int, rng: random.Random) -> Iterator[Dict[str, Any]]:
+    statuses = [status for status, _ in REPORT_STATUSES]
+    weights = [weight for _, weight in REPORT_STATUSES]
+    now = datetime(2025, 1, 1)
+    for i in range(count):
+        # A few batches attract most reports; some reports name unknown codes
+        if medicine_count and rng.random() < 0.9:
+            code = batch_code(min(medicine_count - 1, int(rng.paretovariate(1.2)) - 1))
+        else:
+            code = f"FAKE{rng.randrange(10 ** 6):06d}"
+        created = now + timedelta(seconds=i * 37)
+        yield {
+            "id": f"bench-{i:010d}",
+            "batch_code": code,
+            "medicine_name": rng.choice(DRUGS),
+            "description": rng.choice(REPORT_DESCRIPTIONS),
+            "status": rng.choices(statuses, weights=weights)[0],
+            "created_at": created.isoformat(),
+            "updated_at": created.isoformat()
+        }
+
+
+def write_json_array(filepath: Path, records: Iterable[Dict[str, Any]]) -> int:
+    """Stream records into a JSON array file, one record per line"""
+    count = 0
+    with open(filepath, "w", encoding="utf-8") as f:
+        f.write("[")
+        for record in records:
+            f.write(",\n" if count else "\n")
+            f.write(json.dumps(record, ensure_ascii=False))
+            count += 1
+        f.write("\n]\n")
+    return count
+
+
+# Files the app derives from the JSON sources; stale copies would not match
+DERIVED_FILES = (
+    "reports.jsonl", "medicines.bloom", "medicines.snapshot", "pharmacies.snapshot",
+    "medicines.db", "medicines.db-wal", "medicines.db-shm"
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic benchmark data")
+    parser.add_argument("--out", type=Path, required=True, help="Output data directory")
+    parser.add_argument("--scale", default="10k", help="Default row count for every dataset (1k, 10k, 100k, 1m, 10m)")
+    parser.add_argument("--medicines", help="Number of medicines (overrides --scale)")
+    parser.add_argument("--pharmacies", help="Number of pharmacies (overrides --scale)")
+    parser.add_argument("--reports", help="Number of reports (overrides --scale)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    default = parse_count(args.scale)
+    medicines = parse_count(args.medicines) if args.medicines else default
+    pharmacies = parse_count(args.pharmacies) if args.pharmacies else default
+    reports = parse_count(args.reports) if args.reports else default
+
+    args.out.mkdir(parents=True, exist_ok=True)
+    for name in DERIVED_FILES:
+        (args.out / name).unlink(missing_ok=True)
+    for segment in args.out.glob("reports.wal.*"):
+        segment.unlink()
+
+    rng = random.Random(args.seed)
+    counts = {
+        "medicines": write_json_array(args.out / "medicines.json", generate_medicines(medicines, rng)),
+        "pharmacies": write_json_array(args.out / "pharmacies.json", generate_pharmacies(pharmacies, rng)),
+        "reports": write_json_array(args.out / "reports.json", generate_reports(reports, medicines, rng)),
+    }
+    print(json.dumps({"out": str(args.out), **counts}))
+
+
+if __name__ == "__main__":
+    main()
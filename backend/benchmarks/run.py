@@ -0,0 +1,261 @@
+# backend/benchmarks/run.py
+"""
+In-process load test and micro-benchmark runner
+
+Drives the FastAPI app directly through ASGI (no sockets, no HTTP client
+dependency) and reports throughput, latency percentiles and peak RSS per
+endpoint. Results are written as JSON so runs can be compared across
+commits.
+
+Usage (from backend/):
+    python -m benchmarks.generate --out /tmp/bench-data --scale 100k
+    python -m benchmarks.run --data-dir /tmp/bench-data --requests 2000 --output before.json
+    python -m benchmarks.run --data-dir /tmp/bench-data --requests 2000 --output after.json --compare before.json
+
+The runner writes reports into --data-dir, so never point it at the real data.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# A request as (method, path, query string, JSON body)
+Request = Tuple[str, str, str, Optional[Dict[str, Any]]]
+
+
+async def asgi_request(app, method: str, path: str, query: str = "", body: Optional[Dict[str, Any]] = None) -> Tuple[int, bytes]:
+    """Send one request straight into an ASGI app and collect the response"""
+    payload = json.dumps(body).encode("utf-8") if body is not None else b""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode("utf-8"),
+        "query_string": query.encode("utf-8"),
+        "root_path": "",
+        "headers": [
+            (b"host", b"benchmark"),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(payload)).encode("ascii")),
+        ],
+        "client": ("127.0.0.1", 0),
+        "server": ("benchmark", 80),
+    }
+    received = False
+    response: Dict[str, Any] = {"status": 0, "body": []}
+
+    async def receive():
+        nonlocal received
+        if not received:
+            received = True
+            return {"type": "http.request", "body": payload, "more_body": False}
+        # Never disconnect; streaming responses cancel this wait when done
+        await asyncio.Event().wait()
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            response["status"] = message["status"]
+        elif message["type"] == "http.response.body":
+            response["body"].append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return response["status"], b"".join(response["body"])
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[rank]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+async def run_scenario(app, make_request: Callable[[int], Request], requests: int, concurrency: int) -> Dict[str, Any]:
+    """Fire `requests` requests with `concurrency` concurrent clients"""
+    # Untimed warm-up builds lazy indexes and caches
+    started = time.perf_counter()
+    status, _ = await asgi_request(app, *make_request(-1))
+    cold_ms = (time.perf_counter() - started) * 1000
+
+    counter = itertools.count()
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+
+    async def client():
+        while True:
+            i = next(counter)
+            if i >= requests:
+                return
+            request = make_request(i)
+            t0 = time.perf_counter()
+            status, _ = await asgi_request(app, *request)
+            latencies.append((time.perf_counter() - t0) * 1000)
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 4),
+        "throughput_rps": round(requests / elapsed, 2) if elapsed else 0.0,
+        "cold_ms": round(cold_ms, 3),
+        "latency_ms": {
+            "mean": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+            "p50": round(percentile(latencies, 50), 3),
+            "p95": round(percentile(latencies, 95), 3),
+            "p99": round(percentile(latencies, 99), 3),
+            "max": round(latencies[-1], 3) if latencies else 0.0,
+        },
+        "status_codes": statuses,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+
+
+def build_scenarios(db, rng: random.Random, hit_ratio: float) -> Dict[str, Callable[[int], Request]]:
+    """Request factories per benchmarked endpoint"""
+    medicines = db.get_all_medicines()
+    codes = [m["batch_code"] for m in rng.sample(medicines, min(len(medicines), 10_000))] or ["MISSING"]
+    pharmacies = db.get_all_pharmacies()
+    origins = [
+        (p["location"]["latitude"], p["location"]["longitude"])
+        for p in rng.sample(pharmacies, min(len(pharmacies), 1_000))
+    ] or [(19.0760, 72.8777)]
+
+    def pick_code() -> str:
+        if rng.random() < hit_ratio:
+            return rng.choice(codes)
+        return f"UNKNOWN{rng.randrange(10 ** 9):09d}"
+
+    def verify(i: int) -> Request:
+        return ("POST", "/api/v1/medicines/verify", "", {"batch_code": pick_code()})
+
+    def verify_batch(i: int) -> Request:
+        return ("POST", "/api/v1/medicines/verify/batch", "", {"batch_codes": [pick_code() for _ in range(100)]})
+
+    def nearby(i: int) -> Request:
+        lat, lng = rng.choice(origins)
+        return ("GET", "/api/v1/pharmacies/nearby", f"lat={lat}&lng={lng}&radius=5", None)
+
+    def create_report(i: int) -> Request:
+        return ("POST", "/api/v1/reports/", "", {
+            "batch_code": rng.choice(codes),
+            "description": "Benchmark report: packaging looks different"
+        })
+
+    def list_medicines(i: int) -> Request:
+        return ("GET", "/api/v1/medicines/", "", None)
+
+    return {
+        "verify": verify,
+        "verify_batch": verify_batch,
+        "nearby": nearby,
+        "create_report": create_report,
+        "list_medicines": list_medicines,
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(previous: Dict[str, Any], current: Dict[str, Any]):
+    """Print throughput and p99 changes between two result files"""
+    print(f"{'endpoint':<16}{'rps before':>12}{'rps after':>12}{'p99 before':>12}{'p99 after':>12}")
+    for name, result in current["results"].items():
+        before = previous.get("results", {}).get(name)
+        if before is None:
+            continue
+        print(
+            f"{name:<16}"
+            f"{before['throughput_rps']:>12.1f}{result['throughput_rps']:>12.1f}"
+            f"{before['latency_ms']['p99']:>12.3f}{result['latency_ms']['p99']:>12.3f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark API endpoints in-process")
+    parser.add_argument("--data-dir", type=Path, required=True, help="Data directory (from benchmarks.generate)")
+    parser.add_argument("--database-type", default="json", choices=["json", "sqlite"])
+    parser.add_argument("--endpoints", default="verify,verify_batch,nearby,create_report,list_medicines",
+                        help="Comma-separated endpoints to run")
+    parser.add_argument("--requests", type=int, default=1000, help="Requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--hit-ratio", type=float, default=0.8, help="Share of verify requests for known codes")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--log-level", default="ERROR", help="App log level during the run")
+    parser.add_argument("--output", type=Path, help="Write JSON results here")
+    parser.add_argument("--compare", type=Path, help="Previous results file to compare against")
+    args = parser.parse_args()
+
+    # Settings are read at import time, so point the app at the data first
+    os.environ["DATA_DIR"] = str(args.data_dir.resolve())
+    os.environ["DATABASE_TYPE"] = args.database_type
+    from app.database import db
+    from app.main import app
+    logging.getLogger().setLevel(args.log_level.upper())
+
+    scenarios = build_scenarios(db, random.Random(args.seed), args.hit_ratio)
+    selected = [name.strip() for name in args.endpoints.split(",") if name.strip()]
+    unknown = [name for name in selected if name not in scenarios]
+    if unknown:
+        parser.error(f"unknown endpoints: {', '.join(unknown)}")
+
+    results = {}
+    for name in selected:
+        results[name] = asyncio.run(run_scenario(app, scenarios[name], args.requests, args.concurrency))
+        print(json.dumps({name: results[name]}), flush=True)
+
+    output = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database_type": args.database_type,
+            "dataset": {
+                "medicines": len(db.get_all_medicines()),
+                "pharmacies": len(db.get_all_pharmacies()),
+                "reports": len(db.get_all_reports()),
+            },
+        },
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(output, indent=2))
+    if args.compare:
+        compare(json.loads(args.compare.read_text()), output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# backend/tests/conftest.py
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# Settings are read when app.config is first imported; point the app at a
+# scratch copy of the sample data so tests never write to backend/data
+DATA_DIR = Path(tempfile.mkdtemp(prefix="medverify-tests-"))
+for name in ("medicines.json", "pharmacies.json", "reports.json"):
+    shutil.copy(Path(__file__).parent.parent / "data" / name, DATA_DIR / name)
+os.environ["DATA_DIR"] = str(DATA_DIR)
+os.environ["DATABASE_TYPE"] = "json"
+os.environ["ADMIN_API_KEY"] = "test-admin-key"
+
+from app.database import Database  # noqa: E402
+from app.storage.json_store import JSONStorage  # noqa: E402
+from app.storage.sqlite_store import SQLiteStorage  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def client():
+    """A TestClient for the app, over the scratch copy of the sample data"""
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    with TestClient(app) as client:
+        yield client
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(DATA_DIR, ignore_errors=True)
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def storage(request, tmp_path):
+    """An empty store of each backend"""
+    if request.param == "json":
+        store = JSONStorage(tmp_path / "data", use_snapshots=False)
+    else:
+        store = SQLiteStorage(tmp_path / "catalog.db")
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def database(storage):
+    """A Database over an empty store of each backend"""
+    db = Database(storage)
+    yield db
+    if db.report_ingestor is not None:
+        db.report_ingestor.close()
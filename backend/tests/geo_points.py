@@ -0,0 +1,51 @@
+# backend/tests/geo_points.py
+import math
+
+from app.utils.distance import EARTH_RADIUS_KM, PharmacyCoordinates, find_nearest_pharmacies
+
+KM_PER_DEGREE_LAT = math.pi * EARTH_RADIUS_KM / 180.0
+
+
+def pharmacy(position, lat, lon):
+    return {"id": str(position), "name": f"Pharmacy {position}", "location": {"latitude": lat, "longitude": lon}}
+
+
+def pharmacies_at(points):
+    return [pharmacy(position, lat, lon) for position, (lat, lon) in enumerate(points)]
+
+
+def random_points(rng, count, lat_range=(-90.0, 90.0), lon_range=(-180.0, 180.0)):
+    return [(rng.uniform(*lat_range), rng.uniform(*lon_range)) for _ in range(count)]
+
+
+def edge_cases(rng):
+    """Points near the antimeridian and the poles, with duplicated locations for ties"""
+    points = []
+    points += random_points(rng, 300, (-10.0, 10.0), (179.0, 180.0))
+    points += random_points(rng, 300, (-10.0, 10.0), (-180.0, -179.0))
+    points += random_points(rng, 200, (89.0, 90.0))
+    points += random_points(rng, 200, (-90.0, -89.0))
+    points += [(90.0, 0.0), (-90.0, 0.0), (0.0, 180.0), (0.0, -180.0)]
+    points += points[:50]
+    return points
+
+
+def brute_force(pharmacies, lat, lon, radius, limit=None, offset=0):
+    """The scalar reference: calculate_distance over every pharmacy"""
+    page, total = find_nearest_pharmacies(pharmacies, lat, lon, radius, limit=limit, offset=offset)
+    return [(p['id'], p['distance']) for p in page], total
+
+
+def indexed(pharmacies, lat, lon, radius, index, limit=None, offset=0):
+    coordinates = PharmacyCoordinates.from_pharmacies(pharmacies)
+    page, total = find_nearest_pharmacies(
+        pharmacies, lat, lon, radius, limit=limit, offset=offset, index=index, coordinates=coordinates
+    )
+    return [(p['id'], p['distance']) for p in page], total
+
+
+QUERIES = [
+    (0.0, 179.9), (0.0, -179.9), (0.0, 180.0), (5.0, -180.0),
+    (89.99, 0.0), (90.0, 45.0), (-89.95, -120.0), (-90.0, 0.0),
+    (45.0, 10.0)
+]
@@ -0,0 +1,45 @@
+# backend/tests/test_async_database.py
+import asyncio
+import threading
+
+import pytest
+
+from app.database import AsyncDatabase
+
+
+class FakeDatabase:
+    """Stands in for Database; records the threads its methods run on"""
+
+    def __init__(self):
+        self.version = 1
+        self.closed = False
+
+    def current_thread(self, suffix=""):
+        return threading.current_thread().name + suffix
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def async_database():
+    database = AsyncDatabase(FakeDatabase(), max_workers=2)
+    yield database
+    database.close()
+
+
+def test_methods_run_on_the_pool(async_database):
+    name = asyncio.run(async_database.current_thread(suffix="!"))
+    assert name.startswith("db-io") and name.endswith("!")
+
+
+def test_wrappers_are_cached_per_name(async_database):
+    wrapper = async_database.current_thread
+    assert async_database.current_thread is wrapper
+    assert wrapper.__name__ == "current_thread"
+
+
+def test_plain_attributes_pass_through(async_database):
+    assert async_database.version == 1
+    async_database.database.version = 2
+    assert async_database.version == 2
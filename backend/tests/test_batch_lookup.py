@@ -0,0 +1,57 @@
+# backend/tests/test_batch_lookup.py
+import json
+
+from app.storage.records import KeyIndex
+
+
+def medicine(i, batch_code=None):
+    return {
+        "id": str(i),
+        "batch_code": batch_code or f"MED{i:04d}",
+        "name": "Paracetamol 500mg",
+        "company": "Sun Pharma Ltd.",
+        "expiry_date": "2026-12-31",
+        "is_authentic": True,
+        "manufacturing_date": "2024-01-15"
+    }
+
+
+def seed(database, medicines):
+    database.storage.upsert_batches("medicines", [medicines], lambda result: None)
+
+
+def test_lookup_ignores_case_and_whitespace(database):
+    seed(database, [medicine(i) for i in range(50)] + [medicine(50, "Straße-9")])
+    assert database.find_medicine_by_batch_code("MED0007")['id'] == "7"
+    assert database.find_medicine_by_batch_code("  med0007 ")['id'] == "7"
+    assert database.find_medicine_by_batch_code("STRASSE-9")['id'] == "50"
+    assert database.find_medicine_by_batch_code("MED0050") is None
+    assert database.find_medicine_by_batch_code("") is None
+
+
+def test_many_codes_stay_aligned_with_the_input(database):
+    seed(database, [medicine(i) for i in range(20)])
+    codes = ["MED0003", "nope", "med0003", "MED0019", "", "MED0003 "]
+    found = database.find_medicines_by_batch_codes(codes)
+    assert [m['id'] if m else None for m in found] == ["3", None, "3", "19", None, "3"]
+    assert [database.find_medicine_by_batch_code(code) for code in codes] == found
+    assert database.find_medicines_by_batch_codes([]) == []
+
+
+def test_lookup_sees_codes_added_later(database):
+    seed(database, [medicine(i) for i in range(5)])
+    assert database.find_medicine_by_batch_code("MED0100") is None
+
+    upload = "".join(json.dumps(medicine(i)) + "\n" for i in (100, 101)).encode()
+    database.bulk_upsert("medicines", [upload], "ndjson")
+    assert database.find_medicine_by_batch_code("med0100")['id'] == "100"
+    assert [m['id'] for m in database.find_medicines_by_batch_codes(["MED0101", "MED0001"])] == ["101", "1"]
+
+
+def test_key_index_first_position_wins():
+    index = KeyIndex(["b", "a", "b", "c"])
+    assert [index.position(key) for key in ("a", "b", "c", "d", "")] == [1, 0, 3, None, None]
+    # Longer than any stored key
+    assert index.position("a" * 100) is None
+    assert index.lookup(["c", "x", "b"]) == [3, None, 0]
+    assert KeyIndex([]).lookup(["a"]) == [None]
@@ -0,0 +1,74 @@
+# backend/tests/test_benchmarks.py
+import json
+import random
+
+import pytest
+
+from app.storage.json_store import JSONStorage
+from app.storage.records import RECORD_CODECS
+from benchmarks.generate import (
+    batch_code,
+    generate_medicines,
+    generate_pharmacies,
+    generate_reports,
+    parse_count,
+    write_json_array
+)
+from benchmarks.run import percentile
+
+
+@pytest.mark.parametrize("value, count", [("1k", 1000), ("10M", 10_000_000), ("250k", 250_000), ("1.5m", 1_500_000), (" 42 ", 42)])
+def test_parse_count(value, count):
+    assert parse_count(value) == count
+
+
+def test_batch_codes_are_unique():
+    codes = [batch_code(i) for i in range(20000)]
+    assert len(set(codes)) == len(codes)
+
+
+def test_generated_records_are_valid():
+    rng = random.Random(1)
+    datasets = {
+        "medicines": list(generate_medicines(300, rng)),
+        "pharmacies": list(generate_pharmacies(300, rng)),
+        "reports": list(generate_reports(300, 300, rng))
+    }
+    for dataset, records in datasets.items():
+        _, invalid = RECORD_CODECS[dataset].check(records)
+        assert invalid == {}, dataset
+
+    codes = {medicine["batch_code"] for medicine in datasets["medicines"]}
+    known = [report["batch_code"] in codes for report in datasets["reports"]]
+    # Most reports name real, skewed-towards-hot codes
+    assert sum(known) > 200
+    assert len({report["batch_code"] for report in datasets["reports"]}) < 200
+
+
+def test_generation_is_deterministic_per_seed():
+    first = list(generate_pharmacies(50, random.Random(7)))
+    assert first == list(generate_pharmacies(50, random.Random(7)))
+    assert first != list(generate_pharmacies(50, random.Random(8)))
+
+
+def test_written_files_load_in_the_store(tmp_path):
+    rng = random.Random(3)
+    assert write_json_array(tmp_path / "medicines.json", generate_medicines(100, rng)) == 100
+    assert write_json_array(tmp_path / "pharmacies.json", generate_pharmacies(0, rng)) == 0
+    assert json.loads((tmp_path / "pharmacies.json").read_text()) == []
+
+    storage = JSONStorage(tmp_path, use_snapshots=False)
+    try:
+        assert len(storage.get_all_medicines()) == 100
+        assert storage.find_medicine_by_batch_code(batch_code(99))["id"] == "100"
+    finally:
+        storage.close()
+
+
+def test_percentile():
+    values = [float(i) for i in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile(values, 100) == 100.0
+    assert percentile(values, 0) == 1.0
+    assert percentile([], 99) == 0.0
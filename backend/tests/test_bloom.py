@@ -0,0 +1,88 @@
+# backend/tests/test_bloom.py
+import json
+
+from app.storage.base import StorageBackend
+from app.storage.json_store import JSONStorage
+from app.storage.sqlite_store import SQLiteStorage
+from app.utils.bloom import BloomFilter
+
+
+def codes(count, prefix="MED"):
+    return [f"{prefix}{i:07d}" for i in range(count)]
+
+
+def test_no_false_negatives():
+    items = codes(20000)
+    bloom = BloomFilter.from_items(items, capacity=len(items), error_rate=0.001)
+    assert all(item in bloom for item in items)
+    assert bloom.count == len(items)
+
+
+def test_false_positive_rate_near_target():
+    items = codes(20000)
+    bloom = BloomFilter.from_items(items, capacity=len(items), error_rate=0.01)
+    false_positives = sum(item in bloom for item in codes(20000, prefix="ABS"))
+    assert false_positives / 20000 < 0.02
+    assert abs(bloom.false_positive_rate() - 0.01) < 0.005
+
+
+def test_save_and_load(tmp_path):
+    items = codes(1000)
+    bloom = BloomFilter.from_items(items, capacity=2000)
+    path = tmp_path / "codes.bloom"
+    bloom.save(path, "codes:abc")
+
+    loaded = BloomFilter.load(path, "codes:abc")
+    assert loaded is not None
+    assert loaded.bits == bloom.bits
+    assert loaded.stats() == bloom.stats()
+    assert all(item in loaded for item in items)
+
+
+def test_load_rejects_other_data(tmp_path):
+    path = tmp_path / "codes.bloom"
+    assert BloomFilter.load(path, "codes:abc") is None
+
+    BloomFilter.from_items(codes(100), capacity=100).save(path, "codes:abc")
+    assert BloomFilter.load(path, "codes:def") is None
+
+    data = path.read_bytes()
+    path.write_bytes(data[:-1])
+    assert BloomFilter.load(path, "codes:abc") is None
+    path.write_bytes(b"not a filter")
+    assert BloomFilter.load(path, "codes:abc") is None
+
+
+def medicine(position, batch_code):
+    return {
+        "id": str(position),
+        "batch_code": batch_code,
+        "name": "Paracetamol 500mg",
+        "company": "Sun Pharma Ltd.",
+        "expiry_date": "2026-12-31",
+        "is_authentic": True,
+        "manufacturing_date": "2024-01-15"
+    }
+
+
+def test_stores_agree_on_batch_code_digest(tmp_path):
+    """Bloom filters are tagged with this digest, so both stores must compute it alike"""
+    batch_codes = ["MED0002", " med0001", "Straße-1", "STRASSE-2", "med0002", "ÉCLAIR", "z9"]
+    json_dir = tmp_path / "json"
+    json_dir.mkdir()
+    (json_dir / "medicines.json").write_text(
+        json.dumps([medicine(position, code) for position, code in enumerate(batch_codes)])
+    )
+
+    json_store = JSONStorage(json_dir, use_snapshots=False)
+    sqlite_store = SQLiteStorage(tmp_path / "catalog.db", import_from=json_dir)
+    digest = json_store.batch_code_digest()
+    assert sqlite_store.batch_code_digest() == digest
+    assert StorageBackend.batch_code_digest(json_store) == digest
+
+    other_dir = tmp_path / "other"
+    other_dir.mkdir()
+    (other_dir / "medicines.json").write_text(
+        json.dumps([medicine(position, code) for position, code in enumerate(batch_codes[:-1])])
+    )
+    assert JSONStorage(other_dir, use_snapshots=False).batch_code_digest() != digest
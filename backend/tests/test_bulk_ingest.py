@@ -0,0 +1,77 @@
+# backend/tests/test_bulk_ingest.py
+import tracemalloc
+
+from app.utils.bulk_ingest import OverlongLine, iter_lines, parse_upload
+
+
+def split(data, size):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def test_lines_span_chunks():
+    data = '﻿{"name": "Paracétamol"}\n\n{"name": "日本"}\r\nlast'.encode("utf-8")
+    expected = ['{"name": "Paracétamol"}\n', '\n', '{"name": "日本"}\r\n', 'last']
+    # Every chunk size, so lines and multi-byte characters split anywhere
+    for size in range(1, len(data) + 1):
+        assert list(iter_lines(split(data, size))) == expected
+
+
+def test_overlong_lines_are_replaced():
+    data = b"short\n" + b"x" * 25 + b"\nok\n" + b"y" * 11 + b"\n" + b"z" * 30
+    for size in (1, 7, 64, len(data)):
+        lines = list(iter_lines(split(data, size), max_length=10))
+        assert lines == ["short\n", "\n", "ok\n", "\n", "\n"]
+        assert [isinstance(line, OverlongLine) for line in lines] == [False, True, False, True, True]
+
+
+def test_a_body_without_newlines_is_not_buffered():
+    chunk = b"x" * 65536
+
+    def body():
+        for _ in range(400):
+            yield chunk
+
+    tracemalloc.start()
+    try:
+        lines = list(iter_lines(body()))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert len(lines) == 1 and isinstance(lines[0], OverlongLine)
+    # 25MB went through; only about one line's worth was held
+    assert peak < 8 * 1024 * 1024
+
+
+def rows(data, fmt, dataset="medicines", max_length=40):
+    return [
+        (line, record, error)
+        for line, record, error in parse_upload(split(data, 5), fmt, dataset, max_line_length=max_length)
+    ]
+
+
+def test_ndjson_rejects_overlong_rows():
+    data = b'{"id": "1"}\n{"id": "' + b"2" * 60 + b'"}\n[1]\nnot json\n{"id": "3"}\n'
+    parsed = rows(data, "ndjson")
+    assert [(line, record) for line, record, _ in parsed] == [
+        (1, {"id": "1"}), (2, None), (3, None), (4, None), (5, {"id": "3"})
+    ]
+    assert parsed[1][2] == "Line longer than 40 characters"
+
+
+def test_csv_rejects_overlong_rows():
+    data = (
+        b"id,name,latitude,longitude\n"
+        b"1,MedPlus,19.0,72.8\n"
+        b"2," + b"n" * 60 + b",19.1,72.9\n"
+        b'3,"Apollo,\nAndheri",19.2,73.0\n'
+        b"4,Wellness\n"
+    )
+    parsed = rows(data, "csv", "pharmacies")
+    assert parsed == [
+        (2, {"id": "1", "name": "MedPlus", "location": {"latitude": "19.0", "longitude": "72.8"}}, None),
+        (3, None, "Line longer than 40 characters"),
+        (5, {"id": "3", "name": "Apollo,\nAndheri", "location": {"latitude": "19.2", "longitude": "73.0"}}, None),
+        (6, None, "Expected 4 columns, got 2")
+    ]
+    header = b"id," + b"h" * 60 + b"\n1,2\n"
+    assert rows(header, "csv") == [(1, None, "Invalid CSV header: Line longer than 40 characters")]
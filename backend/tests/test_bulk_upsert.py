@@ -0,0 +1,74 @@
+# backend/tests/test_bulk_upsert.py
+import threading
+
+from app.storage.json_store import JSONStorage
+
+
+def medicine(i, name="Paracetamol 500mg"):
+    return {
+        "id": str(i),
+        "batch_code": f"MED{i:06d}",
+        "name": name,
+        "company": "Sun Pharma Ltd.",
+        "expiry_date": "2026-12-31",
+        "is_authentic": True,
+        "manufacturing_date": "2024-01-15"
+    }
+
+
+def pharmacy(i):
+    return {
+        "id": f"P{i}",
+        "name": f"Pharmacy {i}",
+        "address": "123 Main Street",
+        "phone": "+91 98765 43210",
+        "location": {"latitude": 19.0, "longitude": 72.8}
+    }
+
+
+def upsert(storage, dataset, batches):
+    results = []
+    storage.upsert_batches(dataset, batches, results.append)
+    return results
+
+
+def test_upserts_in_every_store(storage):
+    results = upsert(storage, "medicines", [[medicine(i) for i in range(3)], [medicine(1, "Updated"), medicine(3)]])
+    assert sum(r.inserted for r in results) == 4
+    assert sum(r.updated for r in results) == 1
+    assert storage.find_medicine_by_batch_code("med000001")['name'] == "Updated"
+    assert sorted(key for r in results for key in r.new_keys) == [f"med{i:06d}" for i in range(4)]
+
+
+def test_json_commits_in_groups(tmp_path):
+    storage = JSONStorage(tmp_path, use_snapshots=False, bulk_commit_rows=4)
+    try:
+        results = upsert(storage, "medicines", ([medicine(2 * i), medicine(2 * i + 1)] for i in range(5)))
+        commits = [r for r in results if r.version is not None]
+        # Groups of 4, 4 and 2 rows
+        assert [len(r.new_keys) for r in commits] == [4, 4, 2]
+        assert [r.previous_version for r in commits[1:]] == [r.version for r in commits[:-1]]
+        assert len(storage.get_all_medicines()) == 10
+    finally:
+        storage.close()
+
+
+def test_json_upload_does_not_block_writers_between_groups(tmp_path):
+    storage = JSONStorage(tmp_path, use_snapshots=False, bulk_commit_rows=2)
+    other = threading.Thread(target=upsert, args=(storage, "pharmacies", [[pharmacy(1)]]))
+
+    def batches():
+        yield [medicine(0), medicine(1)]
+        # The first group is committed; another writer gets the lock while
+        # the upload waits for its next batch
+        other.start()
+        other.join(timeout=10)
+        assert not other.is_alive()
+        yield [medicine(2), medicine(3)]
+
+    try:
+        upsert(storage, "medicines", batches())
+        assert len(storage.get_all_medicines()) == 4
+        assert storage.find_pharmacy_by_id("P1") is not None
+    finally:
+        storage.close()
@@ -0,0 +1,28 @@
+# backend/tests/test_distance.py
+import random
+
+import numpy as np
+
+from app.utils.distance import PharmacyCoordinates, calculate_distance, haversine_distances, haversine_matrix
+from geo_points import QUERIES, edge_cases, random_points
+
+
+def test_vectorized_distances_match_scalar():
+    rng = random.Random(1)
+    points = random_points(rng, 2000) + edge_cases(rng)
+    coordinates = PharmacyCoordinates([p[0] for p in points], [p[1] for p in points])
+    for lat, lon in QUERIES + random_points(rng, 20):
+        vectorized = haversine_distances(lat, lon, coordinates)
+        scalar = np.array([calculate_distance(lat, lon, p_lat, p_lon) for p_lat, p_lon in points])
+        # calculate_distance rounds to 2 decimals
+        assert np.all(np.abs(vectorized - scalar) <= 0.005 + 1e-9)
+        assert np.array_equal(np.round(vectorized, 2), scalar)
+
+
+def test_distance_matrix_matches_single_origin():
+    rng = random.Random(2)
+    points = edge_cases(rng)
+    coordinates = PharmacyCoordinates([p[0] for p in points], [p[1] for p in points])
+    matrix = haversine_matrix([q[0] for q in QUERIES], [q[1] for q in QUERIES], coordinates)
+    for row, (lat, lon) in zip(matrix, QUERIES):
+        assert np.allclose(row, haversine_distances(lat, lon, coordinates))
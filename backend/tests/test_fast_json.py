@@ -0,0 +1,112 @@
+# backend/tests/test_fast_json.py
+import json
+import math
+
+import pytest
+from starlette.responses import JSONResponse
+
+from app.models import Medicine, Pharmacy, Report
+from app.storage import json_store
+from app.storage.json_store import JSONStorage
+from app.storage.records import RECORD_CODECS
+from app.utils.fast_json import dumps_indented
+
+MEDICINES = [
+    {
+        "id": str(i),
+        "batch_code": f"MED{i:06d}",
+        "name": "Crocin Advance 500mg" if i % 2 else "Paracétamol – “Dolo” 650",
+        "company": "Sun Pharma Ltd.",
+        "expiry_date": "2026-12-31",
+        "is_authentic": bool(i % 3),
+        "manufacturing_date": "2024-01-15"
+    }
+    for i in range(7)
+]
+
+PHARMACIES = [
+    {
+        "id": "1",
+        "name": "MedPlus",
+        "address": "123 Main Street, Andheri",
+        "phone": "+91 98765 43210",
+        "location": {"latitude": 19.0760, "longitude": 72.8777}
+    },
+    {
+        "id": "2",
+        "name": "Apollo फार्मेसी",
+        "address": "456 Market Road",
+        "phone": "+91 98765 43211",
+        "location": {"latitude": -33.5, "longitude": 151},
+        "distance": "2.5 km"
+    }
+]
+
+REPORTS = [
+    {
+        "id": "r1",
+        "batch_code": "MED000001",
+        "medicine_name": "Crocin",
+        "description": "Seal looks tampered",
+        "created_at": "2026-01-01T00:00:00",
+        "updated_at": "2026-01-01T00:00:00"
+    }
+]
+
+
+def response_body(model, records):
+    """What FastAPI sends for the records through response_model"""
+    return JSONResponse([model.model_validate(record).model_dump(mode="json") for record in records]).body
+
+
+@pytest.mark.parametrize("dataset, model, records", [
+    ("medicines", Medicine, MEDICINES),
+    ("pharmacies", Pharmacy, PHARMACIES),
+    ("reports", Report, REPORTS)
+])
+def test_codec_matches_response_model(dataset, model, records):
+    codec = RECORD_CODECS[dataset]
+    records = codec.validate(records)
+    assert codec.dump_list(records) == response_body(model, records)
+    lines = codec.dump_lines(records).splitlines()
+    assert [json.loads(line) for line in lines] == json.loads(response_body(model, records))
+
+
+def test_codec_check_reports_invalid_positions():
+    records = [MEDICINES[0], {**MEDICINES[1], "is_authentic": "maybe"}, {"id": "3"}]
+    valid, invalid = RECORD_CODECS["medicines"].check(records)
+    assert [record['id'] for record in valid] == ["0"]
+    assert sorted(invalid) == [1, 2]
+    assert invalid[1].startswith("is_authentic:")
+
+
+def test_dumps_indented_matches_json_dumps():
+    for value in (MEDICINES, PHARMACIES, [], {}, [{}, [], {"a": []}], "ünïcödé", [1.5, -0.0, 19.076]):
+        assert dumps_indented(value) == json.dumps(value, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def test_dumps_indented_keeps_values_orjson_cannot():
+    for value in ([2 ** 70], [{"x": float("nan")}], [float("inf"), None], [-float("inf")]):
+        assert dumps_indented(value) == json.dumps(value, indent=2, ensure_ascii=False).encode("utf-8")
+    # Spelled differently, parsed the same
+    assert json.loads(dumps_indented([1e20, 1e-7])) == [1e20, 1e-7]
+
+
+@pytest.mark.parametrize("count", [0, 1, 3, 7])
+def test_write_records_frames_chunks(tmp_path, monkeypatch, count):
+    monkeypatch.setattr(json_store, "WRITE_CHUNK", 3)
+    storage = JSONStorage(tmp_path, use_snapshots=False)
+    try:
+        path = tmp_path / "out.json"
+        storage._write_records(path, MEDICINES[:count])
+        assert path.read_bytes() == json.dumps(MEDICINES[:count], indent=2, ensure_ascii=False).encode("utf-8")
+
+        # A chunk that falls back to json.dumps joins up the same way
+        records = PHARMACIES + [{**PHARMACIES[0], "location": {"latitude": float("nan"), "longitude": 0.0}}]
+        storage._write_records(path, records * 2)
+        written = json.loads(path.read_bytes())
+        assert len(written) == 6
+        assert math.isnan(written[2]['location']['latitude'])
+        assert written[:2] == written[3:5] == PHARMACIES
+    finally:
+        storage.close()
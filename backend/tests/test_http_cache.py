@@ -0,0 +1,60 @@
+# backend/tests/test_http_cache.py
+import json
+
+import pytest
+
+from app.utils.http_cache import etag_matches
+
+LISTINGS = ["/api/v1/medicines/", "/api/v1/pharmacies/", "/api/v1/reports/"]
+
+
+def test_etag_matching():
+    etag = '"abc"'
+    assert etag_matches('"abc"', etag)
+    assert etag_matches('W/"abc"', etag)
+    assert etag_matches('"x", W/"abc" ', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches("", etag)
+    assert not etag_matches('"abcd"', etag)
+    assert not etag_matches("abc", etag)
+
+
+@pytest.mark.parametrize("path", LISTINGS)
+def test_listing_answers_304_while_unchanged(client, path):
+    first = client.get(path)
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "no-cache"
+
+    again = client.get(path)
+    assert again.headers["etag"] == etag
+    assert again.content == first.content
+
+    not_modified = client.get(path, headers={"If-None-Match": f'W/{etag}'})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["etag"] == etag
+
+    assert client.get(path, headers={"If-None-Match": '"stale"'}).status_code == 200
+
+
+def test_listing_etag_changes_with_the_data(client):
+    before = client.get("/api/v1/reports/")
+    created = client.post("/api/v1/reports/", json={
+        "batch_code": "MED123456",
+        "description": "Packaging looks tampered with"
+    })
+    assert created.status_code == 200
+
+    after = client.get("/api/v1/reports/", headers={"If-None-Match": before.headers["etag"]})
+    assert after.status_code == 200
+    assert after.headers["etag"] != before.headers["etag"]
+    ids = [report["id"] for report in json.loads(after.content)]
+    assert ids[-1] == created.json()["report_id"]
+
+
+def test_pages_carry_etags(client):
+    page = client.get("/api/v1/medicines/?limit=2")
+    assert page.status_code == 200
+    assert client.get("/api/v1/medicines/?limit=2", headers={"If-None-Match": page.headers["etag"]}).status_code == 304
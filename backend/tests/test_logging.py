@@ -0,0 +1,82 @@
+# backend/tests/test_logging.py
+import io
+import logging
+import queue
+import threading
+import time
+
+from app import logging_config
+from app.logging_config import BatchingLogWriter, NonBlockingQueueHandler, configure_logging, shutdown_logging
+
+
+def record(message):
+    return logging.LogRecord("app.test", logging.INFO, __file__, 0, message, None, None)
+
+
+class BlockedStream(io.StringIO):
+    """A stream whose writes wait until released, like a stalled pipe"""
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+
+    def write(self, text):
+        self.release.wait()
+        return super().write(text)
+
+
+def test_stop_writes_everything_queued():
+    log_queue = queue.Queue(maxsize=100)
+    stream = io.StringIO()
+    writer = BatchingLogWriter(log_queue, stream, logging.Formatter("%(message)s"), batch_size=16)
+    for i in range(100):
+        log_queue.put(record(f"line {i}"))
+    writer.start()
+    writer.stop(timeout=5)
+    assert not writer.is_alive()
+    assert stream.getvalue().splitlines() == [f"line {i}" for i in range(100)]
+
+
+def test_stop_returns_when_the_queue_stays_full():
+    log_queue = queue.Queue(maxsize=4)
+    stream = BlockedStream()
+    writer = BatchingLogWriter(log_queue, stream, logging.Formatter("%(message)s"), flush_interval=0.01)
+    writer.start()
+    log_queue.put(record("stuck"))
+    time.sleep(0.05)
+    while not log_queue.full():
+        log_queue.put_nowait(record("queued"))
+
+    started = time.monotonic()
+    writer.stop(timeout=0.3)
+    assert time.monotonic() - started < 1.0
+    assert writer.is_alive()
+
+    # Once the stream moves again the writer drains the queue and exits
+    stream.release.set()
+    writer.join(5)
+    assert not writer.is_alive()
+    assert stream.getvalue().splitlines()[0] == "stuck"
+
+
+def test_configure_keeps_other_handlers(caplog):
+    root = logging.getLogger()
+    level = root.level
+    other = logging.StreamHandler(io.StringIO())
+    root.addHandler(other)
+    try:
+        configure_logging()
+        configure_logging()
+        ours = [handler for handler in root.handlers if isinstance(handler, NonBlockingQueueHandler)]
+        assert ours == [logging_config._handler]
+        assert other in root.handlers
+
+        # pytest's capture handler still sees records
+        logging.getLogger("app.test").warning("still captured")
+        assert "still captured" in caplog.text
+    finally:
+        root.removeHandler(other)
+        root.removeHandler(logging_config._handler)
+        logging_config._handler = None
+        shutdown_logging()
+        root.setLevel(level)
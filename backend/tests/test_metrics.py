@@ -0,0 +1,77 @@
+# backend/tests/test_metrics.py
+import pytest
+
+from app.utils.metrics import Histogram, Metrics
+
+
+def samples(lines):
+    """Sample lines as {name with labels: value}"""
+    return {
+        line.rsplit(" ", 1)[0]: float(line.rsplit(" ", 1)[1])
+        for line in lines if not line.startswith("#")
+    }
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, route="/a")
+    histogram.observe(0.2, route="/b")
+
+    lines = list(histogram.render())
+    assert lines[:2] == ["# HELP latency_seconds Latency", "# TYPE latency_seconds histogram"]
+    values = samples(lines)
+    # A value on a bound counts in that bucket (le is inclusive)
+    assert values['latency_seconds_bucket{route="/a",le="0.1"}'] == 2
+    assert values['latency_seconds_bucket{route="/a",le="1.0"}'] == 3
+    assert values['latency_seconds_bucket{route="/a",le="+Inf"}'] == 4
+    assert values['latency_seconds_count{route="/a"}'] == 4
+    assert values['latency_seconds_sum{route="/a"}'] == pytest.approx(3.65)
+    assert values['latency_seconds_count{route="/b"}'] == 1
+
+
+def test_label_values_are_escaped():
+    histogram = Histogram("h", "doc", buckets=(1.0,))
+    histogram.observe(0.5, path='a"b\\c\nd')
+    assert 'h_count{path="a\\"b\\\\c\\nd"} 1' in list(histogram.render())
+
+
+def test_spans_timed_calls_and_collectors():
+    metrics = Metrics()
+
+    @metrics.timed("db.lookup")
+    def lookup(value):
+        return value * 2
+
+    with metrics.span("parse"):
+        pass
+    assert lookup(21) == 42
+    metrics.register_collector(lambda: ["extra_total 7"])
+
+    values = samples(metrics.render().splitlines())
+    assert values['app_stage_duration_seconds_count{stage="parse"}'] == 1
+    assert values['app_stage_duration_seconds_count{stage="db.lookup"}'] == 1
+    assert values["extra_total"] == 7
+
+
+def test_disabled_metrics_record_nothing():
+    metrics = Metrics(enabled=False)
+    timed = metrics.timed("db.lookup")(lambda: "ok")
+    with metrics.span("parse"):
+        pass
+    assert timed() == "ok"
+    assert samples(metrics.render().splitlines()) == {}
+
+
+def test_metrics_endpoint_labels_requests_by_route_template(client):
+    client.get("/api/v1/medicines/MED123456")
+    client.get("/api/v1/medicines/NO-SUCH-CODE")
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+
+    values = samples(response.text.splitlines())
+    route = 'method="GET",route="/api/v1/medicines/{batch_code}"'
+    assert values[f'http_request_duration_seconds_count{{{route},status="200"}}'] >= 1
+    assert values[f'http_request_duration_seconds_count{{{route},status="404"}}'] >= 1
+    assert not any("NO-SUCH-CODE" in name for name in values)
@@ -0,0 +1,40 @@
+# backend/tests/test_nearby.py
+import random
+
+from app.utils.spatial import GridIndex
+from geo_points import KM_PER_DEGREE_LAT, QUERIES, brute_force, edge_cases, indexed, pharmacies_at, random_points
+
+
+def test_indexed_nearby_matches_brute_force():
+    rng = random.Random(3)
+    pharmacies = pharmacies_at(edge_cases(rng) + random_points(rng, 1000, (40.0, 50.0), (5.0, 15.0)))
+    index = GridIndex([(p['location']['latitude'], p['location']['longitude']) for p in pharmacies])
+
+    for lat, lon in QUERIES:
+        for radius in (0.1, 5.0, 100.0, 600.0):
+            assert indexed(pharmacies, lat, lon, radius, index) == brute_force(pharmacies, lat, lon, radius)
+            for limit, offset in ((1, 0), (5, 0), (5, 3), (20, 10)):
+                assert indexed(pharmacies, lat, lon, radius, index, limit, offset) == \
+                    brute_force(pharmacies, lat, lon, radius, limit, offset)
+
+
+def test_radius_edge_and_ties():
+    """Points whose distance rounds to exactly the radius count; ties keep catalog order"""
+    lat, lon, radius = 10.0, 20.0, 5.0
+    points = []
+    for step in range(-12, 13):
+        offset_km = radius + step * 0.001
+        points.append((lat + offset_km / KM_PER_DEGREE_LAT, lon))
+        points.append((lat - offset_km / KM_PER_DEGREE_LAT, lon))
+    points += points[::3]
+    pharmacies = pharmacies_at(points)
+    index = GridIndex(points, cell_size_deg=0.01)
+
+    expected = brute_force(pharmacies, lat, lon, radius)
+    assert any(distance == f"{radius} km" for _, distance in expected[0])
+    assert indexed(pharmacies, lat, lon, radius, index) == expected
+    assert indexed(pharmacies, lat, lon, radius, None) == expected
+    for limit in range(1, len(points), 7):
+        for offset in (0, 1, 4):
+            assert indexed(pharmacies, lat, lon, radius, index, limit, offset) == \
+                brute_force(pharmacies, lat, lon, radius, limit, offset)
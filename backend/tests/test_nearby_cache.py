@@ -0,0 +1,71 @@
+# backend/tests/test_nearby_cache.py
+import random
+
+from app.utils.distance import PharmacyCoordinates
+from app.utils.nearby_cache import NearbyCache
+from app.utils.spatial import GridIndex
+from geo_points import QUERIES, brute_force, edge_cases, indexed, pharmacies_at, random_points
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def cached_index(pharmacies, cache):
+    coordinates = PharmacyCoordinates.from_pharmacies(pharmacies)
+    index = GridIndex([(p['location']['latitude'], p['location']['longitude']) for p in pharmacies])
+    return cache.wrap(index, coordinates)
+
+
+def test_cached_nearby_matches_brute_force():
+    rng = random.Random(3)
+    pharmacies = pharmacies_at(edge_cases(rng) + random_points(rng, 1000, (40.0, 50.0), (5.0, 15.0)))
+    cache = NearbyCache(cell_deg=0.5)
+    index = cached_index(pharmacies, cache)
+
+    # Nearby queries share a cell, so later ones are served from the cache
+    queries = QUERIES + [(lat + 0.01, lon) for lat, lon in QUERIES if lat < 89.0]
+    for lat, lon in queries:
+        for radius in (0.1, 5.0, 100.0, 600.0):
+            assert indexed(pharmacies, lat, lon, radius, index) == brute_force(pharmacies, lat, lon, radius)
+            for limit, offset in ((1, 0), (5, 3)):
+                assert indexed(pharmacies, lat, lon, radius, index, limit, offset) == \
+                    brute_force(pharmacies, lat, lon, radius, limit, offset)
+    assert cache.stats()['hits'] > 0
+
+
+def test_entries_expire_and_evict():
+    clock = FakeClock()
+    cache = NearbyCache(capacity=2, ttl=10.0, clock=clock)
+    index = cached_index(pharmacies_at([(10.0, 20.0), (10.001, 20.0)]), cache)
+
+    index.candidates(10.0, 20.0, 1.0)
+    index.candidates(10.0, 20.0, 1.0)
+    assert cache.stats()['hits'] == 1
+
+    clock.now = 11.0
+    index.candidates(10.0, 20.0, 1.0)
+    assert cache.stats()['expirations'] == 1
+
+    index.candidates(30.0, 20.0, 1.0)
+    index.candidates(50.0, 20.0, 1.0)
+    stats = cache.stats()
+    assert stats['entries'] == 2
+    assert stats['evictions'] == 1
+
+
+def test_rebuilt_index_invalidates_entries():
+    cache = NearbyCache()
+    old = cached_index(pharmacies_at([(10.0, 20.0)]), cache)
+    assert old.candidates(10.0, 20.0, 1.0).tolist() == [0]
+
+    new = cached_index(pharmacies_at([(50.0, 50.0), (10.0, 20.0)]), cache)
+    assert cache.stats()['invalidations'] == 1
+    assert new.candidates(10.0, 20.0, 1.0).tolist() == [1]
+    # The old index can no longer fill the cache
+    old.candidates(50.0, 50.0, 1.0)
+    assert cache.stats()['entries'] == 1
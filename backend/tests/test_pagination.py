@@ -0,0 +1,116 @@
+# backend/tests/test_pagination.py
+import asyncio
+import json
+
+import pytest
+
+from app.utils.pagination import InvalidCursorError, decode_cursor, encode_cursor, stream_pages
+
+
+def medicine(i):
+    return {
+        "id": str(i),
+        "batch_code": f"PAGE{i:04d}",
+        "name": "Paracetamol 500mg",
+        "company": "Sun Pharma Ltd.",
+        "expiry_date": "2026-12-31",
+        "is_authentic": True,
+        "manufacturing_date": "2024-01-15"
+    }
+
+
+def follow_pages(fetch):
+    """Every record reached by following next positions from the start"""
+    records, position = [], 0
+    while position is not None:
+        page, position = fetch(position)
+        records.extend(page)
+    return records
+
+
+def test_cursor_roundtrip():
+    for position in (0, 1, 499, 10 ** 12):
+        cursor = encode_cursor("medicines", position)
+        assert "=" not in cursor
+        assert decode_cursor("medicines", cursor) == position
+    assert decode_cursor("medicines", None) == 0
+    assert decode_cursor("medicines", "") == 0
+
+
+@pytest.mark.parametrize("cursor", [
+    encode_cursor("pharmacies", 5),
+    encode_cursor("reports?status=pending&batch_code=", 5),
+    "not a cursor!",
+    encode_cursor("medicines", 5)[:-2] + "@@",
+])
+def test_cursor_from_elsewhere_is_rejected(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("medicines", cursor)
+
+
+def test_stream_pages_stops_after_the_last_page():
+    pages = {0: (b"a", 2), 2: (b"", 4), 4: (b"b", None)}
+    calls = []
+
+    async def fetch(position):
+        calls.append(position)
+        return pages[position]
+
+    async def collect():
+        return [chunk async for chunk in stream_pages(fetch)]
+
+    assert asyncio.run(collect()) == [b"a", b"b"]
+    assert calls == [0, 2, 4]
+
+
+@pytest.mark.parametrize("limit", [1, 5, 23, 100])
+def test_storage_pages_cover_the_dataset_in_order(storage, limit):
+    storage.upsert_batches("medicines", [[medicine(i) for i in range(23)]], lambda result: None)
+    paged = follow_pages(lambda position: storage.get_page("medicines", position, limit))
+    assert [dict(m) for m in paged] == [dict(m) for m in storage.get_all_medicines()]
+
+
+def test_empty_dataset_has_one_empty_page(storage):
+    assert storage.get_page("reports", 0, 10) == ([], None)
+
+
+def test_api_pages_and_stream_match_the_listing(client):
+    listing = client.get("/api/v1/medicines/").json()
+
+    paged, cursor = [], None
+    while True:
+        response = client.get("/api/v1/medicines/", params={"limit": 2, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        paged.extend(response.json())
+        cursor = response.headers.get("x-next-cursor")
+        if cursor is None:
+            break
+    assert paged == listing
+
+    streamed = client.get("/api/v1/medicines/?stream=true")
+    assert streamed.headers["content-type"].startswith("application/x-ndjson")
+    assert [json.loads(line) for line in streamed.text.splitlines()] == listing
+
+
+def test_api_rejects_cursors_of_other_listings(client):
+    cursor = client.get("/api/v1/medicines/?limit=1").headers["x-next-cursor"]
+    assert client.get("/api/v1/reports/", params={"limit": 1, "cursor": cursor}).status_code == 400
+    assert client.get("/api/v1/reports/", params={"status": "pending", "cursor": encode_cursor("reports", 0)}).status_code == 400
+    assert client.get("/api/v1/medicines/", params={"cursor": "garbage"}).status_code == 400
+
+
+def test_api_filtered_reports_page_and_stream(client):
+    for i in range(3):
+        client.post("/api/v1/reports/", json={"batch_code": "PAGED-1", "description": f"Paging test report {i}"})
+    expected = client.get("/api/v1/reports/", params={"batch_code": "paged-1"}).json()
+    assert len(expected) >= 3
+
+    first = client.get("/api/v1/reports/", params={"batch_code": "paged-1", "limit": 2})
+    rest = client.get("/api/v1/reports/", params={
+        "batch_code": "paged-1", "limit": 1000, "cursor": first.headers["x-next-cursor"]
+    })
+    assert "x-next-cursor" not in rest.headers
+    assert first.json() + rest.json() == expected
+
+    streamed = client.get("/api/v1/reports/", params={"batch_code": "paged-1", "stream": "true"})
+    assert [json.loads(line) for line in streamed.text.splitlines()] == expected
@@ -0,0 +1,87 @@
+# backend/tests/test_records.py
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+from app.storage.records import KeyIndex, MedicineTable, PharmacyTable
+
+SAMPLE_DATA = Path(__file__).parent.parent / "data"
+
+
+def sample(name):
+    return json.loads((SAMPLE_DATA / f"{name}.json").read_text())
+
+
+@pytest.mark.parametrize("table_type, name", [(MedicineTable, "medicines"), (PharmacyTable, "pharmacies")])
+def test_tables_rebuild_the_records(table_type, name):
+    records = sample(name)
+    table = table_type(records)
+    assert len(table) == len(records)
+    assert list(table) == records
+    assert table[-1] == records[-1]
+    assert table[1:3] == records[1:3]
+    assert table_type.from_records(table) is table
+    with pytest.raises(IndexError):
+        table[len(records)]
+
+
+def test_returned_records_are_independent():
+    table = MedicineTable(sample("medicines"))
+    record = table[0]
+    record["name"] = "Changed"
+    assert table[0]["name"] != "Changed"
+
+
+def test_repeated_strings_are_shared():
+    medicines = sample("medicines")
+    # Separate str objects with equal values, as json.loads produces
+    copies = [dict(m, company="".join(["Sun ", "Pharma"])) for m in medicines]
+    table = MedicineTable(copies)
+    assert all(company is table.company[0] for company in table.company)
+
+
+def test_copy_assign_and_extend_leave_the_original_alone():
+    medicines = sample("medicines")
+    table = MedicineTable(medicines)
+    changed = table.copy()
+    replacement = dict(medicines[0], name="Replaced", is_authentic=False)
+    added = dict(medicines[1], id="99", batch_code="NEW-1")
+    changed.assign(0, replacement)
+    changed.extend([added])
+
+    assert list(table) == medicines
+    assert changed[0] == replacement
+    assert list(changed) == [replacement] + medicines[1:] + [added]
+
+
+def test_pharmacy_coordinates_follow_changes():
+    pharmacies = sample("pharmacies")
+    table = PharmacyTable(pharmacies)
+    changed = table.copy()
+    moved = dict(pharmacies[0], location={"latitude": -1.5, "longitude": 2.25})
+    changed.assign(0, moved)
+    changed.extend([dict(pharmacies[1], id="new")])
+
+    assert table.latitude[0] == pharmacies[0]["location"]["latitude"]
+    assert (changed.latitude[0], changed.longitude[0]) == (-1.5, 2.25)
+    assert len(changed.latitude) == len(pharmacies) + 1
+    assert changed[-1]["location"] == pharmacies[1]["location"]
+
+
+def test_key_index_inserted_matches_a_rebuild():
+    rng = random.Random(20)
+    keys = [f"k{rng.randrange(500)}" for _ in range(300)]
+    index = KeyIndex(keys)
+    new = [f"new-{i}-{'x' * rng.randrange(40)}" for i in range(50)]
+    merged = index.inserted(new, range(len(keys), len(keys) + len(new)))
+
+    rebuilt = KeyIndex(keys + new)
+    assert merged.keys.tolist() == rebuilt.keys.tolist()
+    assert merged.positions.tolist() == rebuilt.positions.tolist()
+    assert merged.lookup(keys[:5] + new[:5]) == rebuilt.lookup(keys[:5] + new[:5])
+    # The original index is unchanged and stays usable for readers
+    assert len(index) == len(set(keys))
+    assert index.position(new[0]) is None
+    assert index.inserted([], []) is index
@@ -0,0 +1,130 @@
+# backend/tests/test_report_log.py
+import json
+import threading
+
+from app.storage.report_log import ReportLog
+
+
+def report(report_id, batch_code="MED123456", status="pending"):
+    return {
+        "id": report_id,
+        "batch_code": batch_code,
+        "medicine_name": "Paracetamol 500mg",
+        "description": "Damaged seal",
+        "status": status,
+        "created_at": "2026-01-01T00:00:00",
+        "updated_at": "2026-01-01T00:00:00"
+    }
+
+
+def open_log(tmp_path, compact_every=1000):
+    return ReportLog(tmp_path / "reports.json", tmp_path / "reports.log", compact_every=compact_every)
+
+
+def ids(reports):
+    return [r['id'] for r in reports]
+
+
+def test_replays_writes_of_another_instance(tmp_path):
+    writer = open_log(tmp_path)
+    reader = open_log(tmp_path)
+    writer.create(report("r1"))
+    writer.create_many([report("r2", "med000001"), report("r3")])
+    writer.update("r1", {"status": "resolved"})
+
+    assert ids(reader.all()) == ["r1", "r2", "r3"]
+    assert reader.get("r1")['status'] == "resolved"
+    assert ids(reader.find(status="pending")) == ["r2", "r3"]
+    assert ids(reader.find(batch_code="MED000001")) == ["r2"]
+    assert reader.stats()['by_status'] == {"resolved": 1, "pending": 2}
+    # Every write was appended as one event, and the snapshot is untouched
+    assert len((tmp_path / "reports.log").read_bytes().splitlines()) == 4
+    assert json.loads((tmp_path / "reports.json").read_text()) == []
+
+
+def test_partial_trailing_line_waits_until_complete(tmp_path):
+    log = open_log(tmp_path)
+    log.create(report("r1"))
+    line = json.dumps({"op": "create", "report": report("r2")}).encode("utf-8")
+    with open(tmp_path / "reports.log", "ab") as f:
+        f.write(line[:20])
+    assert ids(log.all()) == ["r1"]
+
+    with open(tmp_path / "reports.log", "ab") as f:
+        f.write(line[20:] + b"\n")
+    assert ids(log.all()) == ["r1", "r2"]
+
+
+def test_compaction_folds_the_log_into_the_snapshot(tmp_path):
+    log = open_log(tmp_path, compact_every=3)
+    reader = open_log(tmp_path)
+    log.create(report("r1"))
+    log.create(report("r2"))
+    assert ids(reader.all()) == ["r1", "r2"]
+
+    log.update("r1", {"status": "resolved"})
+    assert (tmp_path / "reports.log").read_bytes() == b""
+    snapshot = json.loads((tmp_path / "reports.json").read_text())
+    assert [(r['id'], r['status']) for r in snapshot] == [("r1", "resolved"), ("r2", "pending")]
+
+    # A reader part way through the old log rebuilds from the new snapshot
+    log.create(report("r3"))
+    assert [(r['id'], r['status']) for r in reader.all()] == [
+        ("r1", "resolved"), ("r2", "pending"), ("r3", "pending")
+    ]
+    assert reader.stats()['top_batches'] == [{"batch_code": "MED123456", "count": 3}]
+    assert ids(open_log(tmp_path).all()) == ["r1", "r2", "r3"]
+
+
+def test_replaying_events_again_is_harmless(tmp_path):
+    log = open_log(tmp_path)
+    log.create(report("r1"))
+    log.update("r1", {"status": "resolved"})
+    # As after a crash between writing the snapshot and truncating the log
+    events = (tmp_path / "reports.log").read_bytes()
+    log.compact()
+    (tmp_path / "reports.log").write_bytes(events)
+
+    reopened = open_log(tmp_path)
+    assert [(r['id'], r['status']) for r in reopened.all()] == [("r1", "resolved")]
+    assert reopened.stats()['total'] == 1
+
+
+def test_readers_get_copies(tmp_path):
+    log = open_log(tmp_path)
+    log.create(report("r1"))
+    for found in (log.get("r1"), log.all()[0], log.find(status="pending")[0], log.page(0, 1)[0][0]):
+        found['status'] = "changed"
+    assert log.get("r1")['status'] == "pending"
+
+    held = log.get("r1")
+    log.update("r1", {"status": "resolved"})
+    assert held['status'] == "pending"
+    assert log.get("r1")['status'] == "resolved"
+
+
+def test_reads_during_concurrent_writes(tmp_path):
+    writer = open_log(tmp_path, compact_every=50)
+    reader = open_log(tmp_path)
+    errors = []
+
+    def read():
+        try:
+            for _ in range(200):
+                for found in reader.all():
+                    assert found['id'].startswith("r")
+                reader.page(0, 10)
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=read) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for i in range(300):
+        writer.create(report(f"r{i}", status="pending" if i % 2 else "resolved"))
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(reader.all()) == 300
+    assert reader.stats()['by_status'] == {"resolved": 150, "pending": 150}
@@ -0,0 +1,196 @@
+# backend/tests/test_report_wal.py
+import json
+import os
+import threading
+
+import pytest
+
+from app.storage import report_wal
+from app.storage.report_wal import ReportIngestor
+from app.storage.shared_state import try_lock_file
+
+
+def report(report_id, batch_code="MED123456", description="Damaged seal"):
+    return {
+        "id": report_id,
+        "batch_code": batch_code,
+        "medicine_name": "Paracetamol 500mg",
+        "description": description,
+        "status": "pending",
+        "created_at": "2026-01-01T00:00:00",
+        "updated_at": "2026-01-01T00:00:00"
+    }
+
+
+def write_segment(wal_file, owner, sequence, reports, torn=b""):
+    path = wal_file.with_name(f"{wal_file.name}.{owner}.{sequence:08d}")
+    lines = b"".join(json.dumps(r).encode("utf-8") + b"\n" for r in reports)
+    path.write_bytes(lines + torn)
+    return path
+
+
+class RefusingStorage:
+    """Refuses reports described as "refuse", and everything while down"""
+
+    def __init__(self, storage):
+        self.storage = storage
+        self.down = False
+
+    def insert_reports(self, reports):
+        if self.down:
+            raise OSError("No space left on device")
+        if any(r['description'] == "refuse" for r in reports):
+            raise ValueError("refused")
+        self.storage.insert_reports(reports)
+
+    def find_report_by_id(self, report_id):
+        return self.storage.find_report_by_id(report_id)
+
+
+def leftovers(wal_file):
+    return sorted(path.name for path in wal_file.parent.glob(wal_file.name + ".*"))
+
+
+def test_replays_segments_of_a_dead_process(storage, tmp_path):
+    wal_file = tmp_path / "reports.wal"
+    storage.insert_reports([report("r3")])
+    write_segment(wal_file, "deadbeef0001", 1, [report("r1"), report("r2")])
+    # r1 again with a later change, r3 already committed, and a torn line
+    # that was never acknowledged
+    write_segment(
+        wal_file, "deadbeef0001", 2,
+        [report("r1", description="Updated"), report("r3")],
+        torn=b'{"id": "r4", "batch_co'
+    )
+    wal_file.with_name(f"{wal_file.name}.deadbeef0001.lock").touch()
+
+    ingestor = ReportIngestor(storage, wal_file)
+    try:
+        reports = {r['id']: r for r in storage.get_all_reports()}
+        assert sorted(reports) == ["r1", "r2", "r3"]
+        assert reports['r1']['description'] == "Updated"
+        assert not any("deadbeef0001" in name for name in leftovers(wal_file))
+    finally:
+        ingestor.close()
+
+
+def test_leaves_segments_of_a_live_process(storage, tmp_path):
+    wal_file = tmp_path / "reports.wal"
+    write_segment(wal_file, "0123456789ab", 1, [report("r1")])
+    fd = try_lock_file(wal_file.with_name(f"{wal_file.name}.0123456789ab.lock"))
+    assert fd is not None
+    try:
+        ingestor = ReportIngestor(storage, wal_file)
+        ingestor.close()
+        assert storage.get_all_reports() == []
+        assert f"{wal_file.name}.0123456789ab.00000001" in leftovers(wal_file)
+    finally:
+        os.close(fd)
+
+    # Once the owner is gone, the next start recovers its reports
+    ingestor = ReportIngestor(storage, wal_file)
+    ingestor.close()
+    assert [r['id'] for r in storage.get_all_reports()] == ["r1"]
+    assert leftovers(wal_file) == []
+
+
+def test_acknowledged_reports_survive_a_crash(storage, tmp_path):
+    wal_file = tmp_path / "reports.wal"
+    # A long commit interval keeps the reports pending, as if the process
+    # died before its next group commit
+    crashed = ReportIngestor(storage, wal_file, commit_interval=3600, commit_batch_size=10 ** 6)
+    for i in range(5):
+        crashed.submit(report(f"r{i}"))
+    assert storage.get_all_reports() == []
+    # Simulate the crash: the process's lock is released without a close()
+    crashed._stopping = True
+    crashed._wakeup.set()
+    crashed._thread.join()
+    os.close(crashed._fd)
+    os.close(crashed._owner_fd)
+
+    recovered = ReportIngestor(storage, wal_file)
+    recovered.close()
+    assert sorted(r['id'] for r in storage.get_all_reports()) == [f"r{i}" for i in range(5)]
+    assert leftovers(wal_file) == []
+
+
+def test_concurrent_submits_are_committed_once(storage, tmp_path):
+    wal_file = tmp_path / "reports.wal"
+    ingestor = ReportIngestor(storage, wal_file, commit_interval=0.01, commit_batch_size=16)
+
+    def submit_many(worker):
+        for i in range(25):
+            ingestor.submit(report(f"w{worker}-{i}"))
+
+    threads = [threading.Thread(target=submit_many, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    ingestor.close()
+
+    ids = [r['id'] for r in storage.get_all_reports()]
+    assert len(ids) == len(set(ids)) == 200
+    assert ingestor.stats()['pending'] == 0
+    assert leftovers(wal_file) == []
+
+
+def test_inserting_reports_again_is_a_no_op(storage):
+    storage.insert_reports([report("r1"), report("r2")])
+    storage.insert_reports([report("r2", description="Changed"), report("r3")])
+    reports = storage.get_all_reports()
+    assert [r['id'] for r in reports] == ["r1", "r2", "r3"]
+    assert reports[1]['description'] == "Damaged seal"
+    assert storage.get_report_stats()['total'] == 3
+
+
+def test_refused_reports_do_not_block_the_rest(storage, tmp_path):
+    wal_file = tmp_path / "reports.wal"
+    ingestor = ReportIngestor(RefusingStorage(storage), wal_file, commit_interval=3600)
+    try:
+        for report_id in ("r1", "r2", "r3"):
+            ingestor.submit(report(report_id, description="refuse" if report_id == "r2" else "Damaged seal"))
+        ingestor.flush()
+        assert [r['id'] for r in storage.get_all_reports()] == ["r1", "r3"]
+        assert ingestor.stats() == {"pending": 0, "commits": 1, "committed": 2, "rejected": 1}
+
+        rejected = [json.loads(line) for line in ingestor.rejected_file.read_bytes().splitlines()]
+        assert [(r['report']['id'], r['error']) for r in rejected] == [("r2", "refused")]
+
+        # Later reports commit as usual
+        ingestor.submit(report("r4"))
+        ingestor.flush()
+        assert [r['id'] for r in storage.get_all_reports()] == ["r1", "r3", "r4"]
+    finally:
+        ingestor.close()
+
+
+def test_store_failures_keep_the_batch(storage, tmp_path):
+    wal_file = tmp_path / "reports.wal"
+    refusing = RefusingStorage(storage)
+    ingestor = ReportIngestor(refusing, wal_file, commit_interval=3600)
+    ingestor.submit(report("r1"))
+    refusing.down = True
+    with pytest.raises(OSError):
+        ingestor.flush()
+    assert ingestor.stats()['pending'] == 1
+
+    # close() still releases the segment and the owner lock
+    with pytest.raises(OSError):
+        ingestor.close()
+    owner_lock = wal_file.with_name(f"{wal_file.name}.{ingestor.owner}.lock")
+    fd = try_lock_file(owner_lock)
+    assert fd is not None
+    os.close(fd)
+
+    recovered = ReportIngestor(storage, wal_file)
+    recovered.close()
+    assert [r['id'] for r in storage.get_all_reports()] == ["r1"]
+    assert leftovers(wal_file) == []
+
+
+def test_owner_lock_must_be_free(storage, tmp_path, monkeypatch):
+    monkeypatch.setattr(report_wal, "try_lock_file", lambda path: None)
+    with pytest.raises(RuntimeError):
+        ReportIngestor(storage, tmp_path / "reports.wal")
@@ -0,0 +1,52 @@
+# backend/tests/test_reports.py
+
+# Codes that differ only in case or surrounding whitespace, beyond ASCII
+BATCH_CODES = [" Straße-1", "STRASSE-1", "straße-1 ", "ÉCLAIR", "éclair", "MED1"]
+
+
+def report(report_id, batch_code, status="pending"):
+    return {
+        "id": report_id,
+        "batch_code": batch_code,
+        "medicine_name": "Paracetamol 500mg",
+        "description": "Damaged seal",
+        "status": status,
+        "created_at": "2026-01-01T00:00:00",
+        "updated_at": "2026-01-01T00:00:00"
+    }
+
+
+def reports():
+    return [report(f"r{i}", code) for i, code in enumerate(BATCH_CODES)]
+
+
+def found_ids(storage, **filters):
+    return [r['id'] for r in storage.find_reports(**filters)]
+
+
+def test_batch_codes_match_beyond_ascii(storage):
+    storage.insert_reports(reports())
+    assert found_ids(storage, batch_code="strasse-1") == ["r0", "r1", "r2"]
+    assert found_ids(storage, batch_code=" STRASSE-1 ") == ["r0", "r1", "r2"]
+    assert found_ids(storage, batch_code="Éclair") == ["r3", "r4"]
+    assert found_ids(storage, batch_code="med1", status="pending") == ["r5"]
+    assert found_ids(storage, batch_code="med1", status="resolved") == []
+    assert found_ids(storage, batch_code="strasse") == []
+
+    # Counted per normalized code, shown as first reported
+    assert storage.get_report_stats()['top_batches'] == [
+        {"batch_code": " Straße-1", "count": 3},
+        {"batch_code": "ÉCLAIR", "count": 2},
+        {"batch_code": "MED1", "count": 1}
+    ]
+
+
+def test_changing_a_batch_code_moves_its_count(storage):
+    storage.insert_reports(reports())
+    storage.update_report("r0", {"batch_code": "MED1 "})
+    storage.update_report("r1", {"batch_code": "strasse-1"})
+
+    assert found_ids(storage, batch_code="med1") == ["r0", "r5"]
+    assert found_ids(storage, batch_code="STRASSE-1") == ["r1", "r2"]
+    counts = {row['batch_code']: row['count'] for row in storage.get_report_stats()['top_batches']}
+    assert counts == {" Straße-1": 2, "ÉCLAIR": 2, "MED1": 2}
@@ -0,0 +1,141 @@
+# backend/tests/test_search.py
+import random
+
+import pytest
+
+from app.storage.base import normalize_batch_code
+from app.storage.records import MedicineTable
+from app.utils.search import MAX_EDIT_DISTANCE, MedicineSearchIndex
+
+
+def medicine(position, batch_code, name="Paracetamol 500mg", company="Sun Pharma Ltd."):
+    return {
+        "id": str(position),
+        "batch_code": batch_code,
+        "name": name,
+        "company": company,
+        "expiry_date": "2026-12-31",
+        "is_authentic": True,
+        "manufacturing_date": "2024-01-15"
+    }
+
+
+def build(codes, names=None):
+    names = names or ["Paracetamol 500mg"] * len(codes)
+    return MedicineSearchIndex(MedicineTable.from_records([
+        medicine(position, code, name) for position, (code, name) in enumerate(zip(codes, names))
+    ]))
+
+
+def levenshtein(a, b):
+    row = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        new_row = [i]
+        for j, char_b in enumerate(b, 1):
+            new_row.append(min(new_row[j - 1] + 1, row[j] + 1, row[j - 1] + (char_a != char_b)))
+        row = new_row
+    return row[-1]
+
+
+def brute_force_fuzzy(codes, query, max_distance, limit):
+    """(distance, position) of the closest normalized codes, first record per code, ties in code order"""
+    first = {}
+    for position, code in enumerate(codes):
+        first.setdefault(normalize_batch_code(code), position)
+    query = normalize_batch_code(query)
+    max_distance = min(max_distance, MAX_EDIT_DISTANCE, (len(query) + 1) // 3)
+    if max_distance < 1:
+        return []
+    matches = sorted(
+        (distance, code) for code in first
+        for distance in [levenshtein(query, code)] if distance <= max_distance
+    )
+    return [(distance, first[code]) for distance, code in matches[:limit]]
+
+
+@pytest.mark.parametrize("alphabet", ["ab", "MED0123456789", "xyzÉß0"])
+def test_fuzzy_matches_brute_force(alphabet):
+    rng = random.Random(alphabet)
+    for _ in range(8):
+        codes = [
+            "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 9)))
+            for _ in range(rng.randint(1, 200))
+        ]
+        # Case variants normalize to the same code; the first record wins
+        codes += [code.upper() for code in codes[:5]]
+        index = build(codes)
+        for _ in range(12):
+            query = rng.choice([
+                rng.choice(codes),
+                "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 10)))
+            ])
+            for max_distance in (1, 2):
+                for limit in (3, 50):
+                    assert index.fuzzy(query, max_distance, limit) == \
+                        brute_force_fuzzy(codes, query, max_distance, limit)
+
+
+def test_fuzzy_shared_prefix_catalog():
+    codes = [f"MED{i:04d}" for i in range(5000)]
+    index = build(codes)
+    for query in ["MED0O12", "MED0123", "MED012", "NED0123", "MED01234", "med199q"]:
+        assert index.fuzzy(query, 2, 10) == brute_force_fuzzy(codes, query, 2, 10)
+
+
+def test_fuzzy_short_queries_and_empty_catalog():
+    index = build(["AB", "ABC", "XYZ"])
+    assert index.fuzzy("A", 2, 10) == []
+    assert index.fuzzy("", 2, 10) == []
+    assert index.fuzzy("AX", 2, 10) == [(1, 0)]
+    assert build([]).fuzzy("MED123", 2, 10) == []
+
+
+def test_exact_and_prefix():
+    codes = ["MED123", "med124", "MED2", "OTHER", " med123 "]
+    index = build(codes)
+    assert index.exact("MED123") == 0
+    assert index.exact(" Med124") == 1
+    assert index.exact("MED12") is None
+    assert index.prefix("med12", 10) == [0, 1]
+    assert index.prefix("MED", 2) == [0, 1]
+    assert index.prefix("ZZZ", 10) == []
+    assert index.prefix("", 10) == []
+    assert index.prefix("   ", 10) == []
+
+
+def test_tokens():
+    index = build(
+        ["A1", "A2", "A3"],
+        ["Paracetamol 500mg", "Amoxicillin 250mg", "Paracetamol Syrup"]
+    )
+    assert index.tokens("para", 10) == [0, 2]
+    assert index.tokens("para syr", 10) == [2]
+    assert index.tokens("sun", 10) == [0, 1, 2]
+    assert index.tokens("250", 10) == [1]
+    assert index.tokens("ibuprofen", 10) == []
+    assert index.tokens("  ", 10) == []
+
+
+def test_tokens_match_brute_force():
+    rng = random.Random(5)
+    words = ["para", "paracetamol", "pan", "panadol", "amox", "amoxicillin", "500mg", "50mg", "syrup", "sun"]
+    names = [" ".join(rng.sample(words, rng.randint(1, 3))) for _ in range(40)]
+    companies = ["Sun Pharma", "Cipla", "Pan Labs"]
+    table = MedicineTable.from_records([
+        medicine(position, f"C{position}", rng.choice(names), rng.choice(companies)) for position in range(3000)
+    ])
+    index = MedicineSearchIndex(table)
+
+    def brute_force(query, limit):
+        terms = query.split()
+        return [
+            position for position in range(len(table))
+            if all(
+                any(word.startswith(term) for word in f"{table.name[position]} {table.company[position]}".casefold().split())
+                for term in terms
+            )
+        ][:limit]
+
+    for query in ("p", "pa", "para", "pan 5", "50 s", "amox sun", "c", "labs pan", "sun p 500", "x", "p zz"):
+        for limit in (1, 10, 5000):
+            assert index.tokens(query, limit) == brute_force(query, limit), query
@@ -0,0 +1,125 @@
+# backend/tests/test_shared_state.py
+import multiprocessing
+import os
+import threading
+
+import pytest
+
+from app.storage.shared_state import (
+    GenerationCounters,
+    InterProcessLock,
+    atomic_write_bytes,
+    fcntl,
+    try_lock_file
+)
+
+needs_fork = pytest.mark.skipif(
+    fcntl is None or "fork" not in multiprocessing.get_all_start_methods(),
+    reason="cross-process locking needs flock() and fork"
+)
+
+WORKERS = 4
+ROUNDS = 200
+
+
+def increment_under_lock(lock_path, counter_path):
+    """Read-modify-write a counter file; only correct if the lock excludes other processes"""
+    lock = InterProcessLock(lock_path)
+    for _ in range(ROUNDS):
+        with lock:
+            with lock:  # re-entrant within a thread
+                value = int(counter_path.read_text() or 0)
+                counter_path.write_text(str(value + 1))
+    lock.close()
+
+
+def bump_generations(path):
+    counters = GenerationCounters(path, ["medicines", "reports"])
+    for _ in range(ROUNDS):
+        counters.bump("reports")
+    counters.close()
+
+
+def run_processes(target, *args):
+    context = multiprocessing.get_context("fork")
+    processes = [context.Process(target=target, args=args) for _ in range(WORKERS)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(30)
+        assert process.exitcode == 0
+
+
+@needs_fork
+def test_lock_excludes_other_processes(tmp_path):
+    counter = tmp_path / "counter"
+    counter.write_text("0")
+    run_processes(increment_under_lock, tmp_path / "counter.lock", counter)
+    assert int(counter.read_text()) == WORKERS * ROUNDS
+
+
+def test_lock_excludes_other_threads(tmp_path):
+    counter = tmp_path / "counter"
+    counter.write_text("0")
+    threads = [
+        threading.Thread(target=increment_under_lock, args=(tmp_path / "counter.lock", counter))
+        for _ in range(WORKERS)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert int(counter.read_text()) == WORKERS * ROUNDS
+
+
+@needs_fork
+def test_generations_are_shared_between_processes(tmp_path):
+    path = tmp_path / "generations"
+    counters = GenerationCounters(path, ["medicines", "reports"])
+    try:
+        assert counters.get("reports") == 0
+        run_processes(bump_generations, path)
+        # Seen through this process's own mapping, without reopening
+        assert counters.get("reports") == WORKERS * ROUNDS
+        assert counters.get("medicines") == 0
+        assert counters.bump("medicines") == 1
+    finally:
+        counters.close()
+
+
+def test_generations_survive_reopening(tmp_path):
+    path = tmp_path / "generations"
+    counters = GenerationCounters(path, ["medicines"])
+    counters.bump("medicines")
+    counters.close()
+    reopened = GenerationCounters(path, ["medicines"])
+    assert reopened.get("medicines") == 1
+    reopened.close()
+
+
+def test_too_many_counters(tmp_path):
+    with pytest.raises(ValueError):
+        GenerationCounters(tmp_path / "generations", [str(i) for i in range(1000)])
+
+
+@pytest.mark.skipif(fcntl is None, reason="needs flock()")
+def test_try_lock_file_does_not_block(tmp_path):
+    path = tmp_path / "owner.lock"
+    fd = try_lock_file(path)
+    assert fd is not None
+    try:
+        # flock() locks belong to the open file, so a second open conflicts
+        assert try_lock_file(path) is None
+    finally:
+        os.close(fd)
+    second = try_lock_file(path)
+    assert second is not None
+    os.close(second)
+
+
+def test_atomic_write_leaves_no_temporary_files(tmp_path):
+    path = tmp_path / "data.json"
+    atomic_write_bytes(path, b"[1]")
+    atomic_write_bytes(path, b"[1, 2]")
+    assert path.read_bytes() == b"[1, 2]"
+    assert [p.name for p in tmp_path.iterdir()] == ["data.json"]
@@ -0,0 +1,144 @@
+# backend/tests/test_single_flight.py
+import asyncio
+import threading
+
+import pytest
+
+from app.database import AsyncDatabase
+from app.utils.single_flight import SingleFlight
+
+
+class Gate:
+    """An async call that counts its runs and waits until opened"""
+
+    def __init__(self, result="done", error=None):
+        self.opened = asyncio.Event()
+        self.runs = 0
+        self.result = result
+        self.error = error
+
+    async def __call__(self):
+        self.runs += 1
+        await self.opened.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_identical_calls_share_one_run():
+    async def scenario():
+        flights = SingleFlight()
+        gate = Gate()
+        callers = [asyncio.create_task(flights.run("verify", ("MED1",), gate)) for _ in range(5)]
+        other = asyncio.create_task(flights.run("verify", ("MED2",), gate))
+        await settle()
+        assert flights.stats()["in_flight"] == 2
+        gate.opened.set()
+        assert await asyncio.gather(*callers, other) == ["done"] * 6
+        assert gate.runs == 2
+
+        stats = flights.stats()
+        assert stats == {
+            "in_flight": 0,
+            "executions": {"verify": 2},
+            "coalesced": {"verify": 4},
+            "top_keys": [(("verify", ("MED1",)), 4)]
+        }
+
+        # Nothing is cached once the call has finished
+        assert await flights.run("verify", ("MED1",), gate) == "done"
+        assert gate.runs == 3
+
+    asyncio.run(scenario())
+
+
+def test_errors_reach_every_waiting_caller():
+    async def scenario():
+        flights = SingleFlight()
+        gate = Gate(error=RuntimeError("store down"))
+        callers = [asyncio.create_task(flights.run("verify", ("MED1",), gate)) for _ in range(3)]
+        await settle()
+        gate.opened.set()
+        results = await asyncio.gather(*callers, return_exceptions=True)
+        assert [str(result) for result in results] == ["store down"] * 3
+        assert gate.runs == 1
+
+    asyncio.run(scenario())
+
+
+def test_a_cancelled_caller_does_not_cancel_the_others():
+    async def scenario():
+        flights = SingleFlight()
+        gate = Gate()
+        leaving = asyncio.create_task(flights.run("verify", ("MED1",), gate))
+        staying = asyncio.create_task(flights.run("verify", ("MED1",), gate))
+        await settle()
+        leaving.cancel()
+        await settle()
+        gate.opened.set()
+        assert await staying == "done"
+        with pytest.raises(asyncio.CancelledError):
+            await leaving
+        assert gate.runs == 1
+
+    asyncio.run(scenario())
+
+
+def test_collect_reports_bounded_labels():
+    async def scenario():
+        flights = SingleFlight(tracked_keys=2, top_keys=1)
+        gate = Gate()
+        gate.opened.set()
+        for code in ("A", "B", "C"):
+            first = asyncio.create_task(flights.run("verify", (code,), gate))
+            second = asyncio.create_task(flights.run("verify", (code,), gate))
+            await asyncio.gather(first, second)
+        return list(flights.collect())
+
+    lines = asyncio.run(scenario())
+    assert 'single_flight_executions_total{operation="verify"} 3' in lines
+    assert 'single_flight_coalesced_total{operation="verify"} 3' in lines
+    assert len([line for line in lines if line.startswith("single_flight_key_coalesced{")]) == 1
+
+
+class SlowDatabase:
+    """Stands in for Database; verify blocks until released"""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.calls = 0
+
+    def verify_batch_code(self, batch_code):
+        self.calls += 1
+        self.release.wait(5)
+        return True, batch_code.encode()
+
+    def close(self):
+        pass
+
+
+def test_async_database_coalesces_identical_calls():
+    database = SlowDatabase()
+    async_database = AsyncDatabase(database, max_workers=4)
+    async_database.single_flight = SingleFlight()
+
+    async def scenario():
+        callers = [
+            asyncio.create_task(async_database.coalesce("verify_batch_code", code))
+            for code in ("MED1", "MED1", "MED1", "MED2")
+        ]
+        await settle()
+        database.release.set()
+        return await asyncio.gather(*callers)
+
+    try:
+        results = asyncio.run(scenario())
+    finally:
+        async_database.close()
+    assert results == [(True, b"MED1")] * 3 + [(True, b"MED2")]
+    assert database.calls == 2
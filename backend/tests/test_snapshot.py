@@ -0,0 +1,153 @@
+# backend/tests/test_snapshot.py
+import json
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from app.storage.base import normalize_batch_code
+from app.storage.json_store import JSONStorage
+from app.storage.records import MedicineTable, PharmacyTable
+from app.storage.snapshot import MAGIC, CatalogSnapshot, snapshot_path, write_snapshot
+
+SAMPLE_DATA = Path(__file__).parent.parent / "data"
+SIGNATURE = (1_700_000_000_000_000_000, 4096)
+
+
+def medicine(i, batch_code, name="Paracetamol 500mg"):
+    return {
+        "id": str(i),
+        "batch_code": batch_code,
+        "name": name,
+        "company": "Sun Pharma Ltd.",
+        "expiry_date": "2026-12-31",
+        "is_authentic": i % 2 == 0,
+        "manufacturing_date": "2024-01-15"
+    }
+
+
+MEDICINES = [
+    medicine(0, "MED1"),
+    medicine(1, " Straße-Ω ", "Ibuprofen \"Forte\" ✓"),
+    medicine(2, "med1", "Duplicate key"),
+    medicine(3, "A-VERY-LONG-BATCH-CODE-0123456789"),
+    medicine(4, "ZZ")
+]
+
+
+def snapshot_of(tmp_path, dataset, records, signature=SIGNATURE):
+    source = tmp_path / f"{dataset}.json"
+    write_snapshot(source, dataset, records, signature)
+    return source
+
+
+def test_medicines_roundtrip(tmp_path):
+    source = snapshot_of(tmp_path, "medicines", MedicineTable(MEDICINES))
+    snapshot = CatalogSnapshot.open(source, "medicines", SIGNATURE)
+    assert snapshot is not None
+
+    assert len(snapshot.records) == len(MEDICINES)
+    assert [snapshot.records[i] for i in range(len(MEDICINES))] == MEDICINES
+    assert snapshot.records[-1] == MEDICINES[-1]
+    assert isinstance(snapshot.records.all(), MedicineTable)
+    assert list(snapshot.records.all()) == MEDICINES
+    # Indexing after all() is served by the table
+    assert snapshot.records[1] == MEDICINES[1]
+
+    # Keys are normalized batch codes; the first record wins for a repeated key
+    assert snapshot.position("med1") == 0
+    assert snapshot.position(normalize_batch_code(" Straße-Ω ")) == 1
+    assert snapshot.position(normalize_batch_code(MEDICINES[3]["batch_code"])) == 3
+    assert snapshot.position("a" * 100) is None
+    assert snapshot.lookup(["zz", "nope", "med1", ""]) == [4, None, 0, None]
+
+
+def test_pharmacy_columns(tmp_path):
+    pharmacies = json.loads((SAMPLE_DATA / "pharmacies.json").read_text())
+    source = snapshot_of(tmp_path, "pharmacies", PharmacyTable(pharmacies))
+    snapshot = CatalogSnapshot.open(source, "pharmacies", SIGNATURE)
+
+    assert list(snapshot.records.all()) == pharmacies
+    np.testing.assert_array_equal(snapshot.column("latitude"), [p["location"]["latitude"] for p in pharmacies])
+    np.testing.assert_array_equal(snapshot.column("longitude"), [p["location"]["longitude"] for p in pharmacies])
+    assert snapshot.position(pharmacies[2]["id"]) == 2
+
+
+def test_empty_catalog(tmp_path):
+    source = snapshot_of(tmp_path, "medicines", MedicineTable([]))
+    snapshot = CatalogSnapshot.open(source, "medicines", SIGNATURE)
+    assert len(snapshot.records) == 0
+    assert list(snapshot.records.all()) == []
+    assert snapshot.position("med1") is None
+    assert snapshot.lookup(["med1"]) == [None]
+
+
+def test_stale_missing_or_corrupt_snapshots_are_ignored(tmp_path):
+    source = snapshot_of(tmp_path, "medicines", MedicineTable(MEDICINES))
+    path = snapshot_path(source)
+    data = path.read_bytes()
+    assert data.startswith(MAGIC)
+
+    assert CatalogSnapshot.open(source, "medicines", None) is None
+    assert CatalogSnapshot.open(source, "medicines", (SIGNATURE[0] + 1, SIGNATURE[1])) is None
+    assert CatalogSnapshot.open(tmp_path / "other.json", "medicines", SIGNATURE) is None
+
+    corruptions = [b"", data[:20], b"BADMAGIC" + data[8:], data[:len(data) // 2]]
+    for corrupt in corruptions:
+        path.write_bytes(corrupt)
+        assert CatalogSnapshot.open(source, "medicines", SIGNATURE) is None
+
+
+def test_store_serves_from_a_snapshot_after_restart(tmp_path):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    for name in ("medicines.json", "pharmacies.json"):
+        shutil.copy(SAMPLE_DATA / name, data_dir / name)
+
+    cold = JSONStorage(data_dir, use_snapshots=True)
+    medicines = list(cold.get_all_medicines())
+    pharmacies = list(cold.get_all_pharmacies())
+    cold.close()  # waits for the background snapshot builds
+    assert snapshot_path(data_dir / "medicines.json").exists()
+    assert snapshot_path(data_dir / "pharmacies.json").exists()
+
+    # Same size and mtime but unparseable: only the snapshot can serve it now
+    source = data_dir / "medicines.json"
+    stat = source.stat()
+    source.write_bytes(b" " * stat.st_size)
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    warm = JSONStorage(data_dir, use_snapshots=True)
+    try:
+        assert isinstance(warm.get_all_medicines(), MedicineTable)
+        assert list(warm.get_all_medicines()) == medicines
+        assert list(warm.get_all_pharmacies()) == pharmacies
+        code = medicines[3]["batch_code"].lower()
+        assert warm.find_medicine_by_batch_code(code) == medicines[3]
+    finally:
+        warm.close()
+
+
+@pytest.mark.parametrize("dataset", ["medicines", "pharmacies"])
+def test_snapshot_is_ignored_once_the_json_changes(tmp_path, dataset):
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    shutil.copy(SAMPLE_DATA / f"{dataset}.json", data_dir / f"{dataset}.json")
+    store = JSONStorage(data_dir, use_snapshots=True)
+    store.get_page(dataset, 0, 1)
+    store.close()
+    source = data_dir / f"{dataset}.json"
+    assert snapshot_path(source).exists()
+
+    records = json.loads(source.read_text())[:2]
+    source.write_text(json.dumps(records))
+    stat = source.stat()
+    assert CatalogSnapshot.open(source, dataset, (stat.st_mtime_ns, stat.st_size)) is None
+
+    store = JSONStorage(data_dir, use_snapshots=True)
+    try:
+        assert [dict(record) for record in store.get_page(dataset, 0, 10)[0]] == records
+    finally:
+        store.close()
@@ -0,0 +1,25 @@
+# backend/tests/test_spatial.py
+import random
+
+from app.utils.distance import calculate_distance
+from app.utils.spatial import GridIndex
+from geo_points import QUERIES, edge_cases, random_points
+
+
+def test_grid_candidates_cover_radius():
+    rng = random.Random(4)
+    points = edge_cases(rng) + random_points(rng, 2000)
+    index = GridIndex(points, cell_size_deg=0.25)
+    for lat, lon in QUERIES + random_points(rng, 10):
+        for radius in (1.0, 50.0, 500.0):
+            candidates = set(index.candidates(lat, lon, radius).tolist())
+            for position, (p_lat, p_lon) in enumerate(points):
+                if calculate_distance(lat, lon, p_lat, p_lon) <= radius:
+                    assert position in candidates
+
+
+def test_grid_candidates_non_finite():
+    index = GridIndex([(0.0, 0.0), (1.0, 1.0)])
+    assert len(index.candidates(float("nan"), 0.0, 10.0)) == 0
+    assert len(index.candidates(0.0, float("inf"), 10.0)) == 0
+    assert index.candidates(0.0, 0.0, float("inf")).tolist() == [0, 1]
@@ -0,0 +1,88 @@
+# backend/tests/test_sqlite_store.py
+import shutil
+import sqlite3
+import threading
+from pathlib import Path
+
+import pytest
+
+from app.storage.json_store import JSONStorage
+from app.storage.sqlite_store import SQLiteStorage
+
+SAMPLE_DATA = Path(__file__).parent.parent / "data"
+
+
+@pytest.fixture
+def stores(tmp_path):
+    """A JSON store and an SQLite store seeded from the same sample data"""
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    for name in ("medicines.json", "pharmacies.json", "reports.json"):
+        shutil.copy(SAMPLE_DATA / name, data_dir / name)
+    json_store = JSONStorage(data_dir, use_snapshots=False)
+    sqlite_store = SQLiteStorage(tmp_path / "catalog.db", import_from=data_dir)
+    yield json_store, sqlite_store
+    json_store.close()
+    sqlite_store.close()
+
+
+def records(rows):
+    return [dict(row) for row in rows]
+
+
+def test_sqlite_matches_json_after_import(stores):
+    json_store, sqlite_store = stores
+    assert records(sqlite_store.get_all_medicines()) == records(json_store.get_all_medicines())
+    assert records(sqlite_store.get_all_pharmacies()) == records(json_store.get_all_pharmacies())
+    assert sqlite_store.get_all_reports() == json_store.get_all_reports()
+
+    for medicine in json_store.get_all_medicines():
+        code = f"  {medicine['batch_code'].lower()} "
+        assert sqlite_store.find_medicine_by_batch_code(code) == json_store.find_medicine_by_batch_code(code)
+    assert sqlite_store.find_medicine_by_batch_code("NO-SUCH-CODE") is None
+    pharmacy_id = json_store.get_all_pharmacies()[0]['id']
+    assert sqlite_store.find_pharmacy_by_id(pharmacy_id) == json_store.find_pharmacy_by_id(pharmacy_id)
+    assert sqlite_store.batch_code_digest() == json_store.batch_code_digest()
+
+
+def test_report_writes_match_json(stores):
+    report = {
+        "id": "parity-1",
+        "batch_code": "MED123456",
+        "medicine_name": "Paracetamol 500mg",
+        "description": "Seal broken",
+        "status": "pending",
+        "created_at": "2026-01-01T00:00:00",
+        "updated_at": "2026-01-01T00:00:00"
+    }
+    for store in stores:
+        assert store.insert_report(dict(report)) == report
+        store.insert_reports([dict(report)])
+        updated = store.update_report("parity-1", {"status": "resolved", "updated_at": "2026-01-02T00:00:00"})
+        assert updated == {**report, "status": "resolved", "updated_at": "2026-01-02T00:00:00"}
+        assert store.update_report("missing", {"status": "resolved"}) is None
+
+    json_store, sqlite_store = stores
+    assert sqlite_store.get_all_reports() == json_store.get_all_reports()
+    assert sqlite_store.find_reports(status="resolved") == json_store.find_reports(status="resolved")
+    assert sqlite_store.get_report_stats() == json_store.get_report_stats()
+
+
+def test_close_closes_every_threads_connection(tmp_path):
+    store = SQLiteStorage(tmp_path / "catalog.db")
+    connections = []
+
+    def open_connection():
+        connections.append(store._connect())
+
+    threads = [threading.Thread(target=open_connection) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    connections.append(store._connect())
+
+    store.close()
+    for conn in connections:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
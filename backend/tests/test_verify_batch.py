@@ -0,0 +1,41 @@
+# backend/tests/test_verify_batch.py
+import json
+
+from app.models import MedicineBatchVerifyResponse, MedicineVerifyResponse
+
+CODES = ["MED123456", " med789012 ", "NOPE-1", "MED123456", "MED777888"]
+
+
+def test_batch_results_follow_request_order(client):
+    response = client.post("/api/v1/medicines/verify/batch", json={"batch_codes": CODES})
+    assert response.status_code == 200
+    body = MedicineBatchVerifyResponse.model_validate(response.json())
+    assert body.count == 5
+    assert body.valid_count == 4
+    assert [result.code for result in body.results] == [code.strip() for code in CODES]
+    assert [result.is_valid for result in body.results] == [True, True, False, True, True]
+    assert body.results[2].data is None
+
+
+def test_batch_results_match_single_verify(client):
+    response = client.post("/api/v1/medicines/verify/batch", json={"batch_codes": CODES})
+    for code, result in zip(CODES, response.json()["results"]):
+        single = client.post("/api/v1/medicines/verify", json={"batch_code": code})
+        assert result == single.json()
+
+
+def test_streamed_results_are_one_line_per_code(client):
+    response = client.post("/api/v1/medicines/verify/batch?stream=true", json={"batch_codes": CODES})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    batch = client.post("/api/v1/medicines/verify/batch", json={"batch_codes": CODES}).json()
+    assert lines == batch["results"]
+    for line in lines:
+        MedicineVerifyResponse.model_validate(line)
+
+
+def test_batch_size_is_bounded(client):
+    assert client.post("/api/v1/medicines/verify/batch", json={"batch_codes": []}).status_code == 422
+    too_many = {"batch_codes": ["MED123456"] * 10001}
+    assert client.post("/api/v1/medicines/verify/batch", json=too_many).status_code == 422
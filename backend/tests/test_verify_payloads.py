@@ -0,0 +1,104 @@
+# backend/tests/test_verify_payloads.py
+from datetime import date, datetime
+
+from starlette.responses import JSONResponse
+
+from app.models import MedicineBatchVerifyResponse, MedicineVerifyResponse
+from app import database as database_module
+from app.storage.json_store import JSONStorage
+from app.utils.verify_payloads import VerifyPayloads, batch_verify_response, verify_response
+
+TODAY = date(2026, 6, 15).toordinal()
+
+MEDICINES = [
+    {"id": "1", "batch_code": "MED001", "name": "Paracétamol 500mg", "company": "Sun Pharma Ltd.",
+     "expiry_date": "2026-12-31", "is_authentic": True, "manufacturing_date": "2024-01-15"},
+    {"id": "2", "batch_code": "med-002 ", "name": "Amoxicillin \"Forte\"", "company": "Cipla",
+     "expiry_date": "2025-03-01", "is_authentic": False, "manufacturing_date": "2023-03-01"},
+    {"id": "3", "batch_code": "MED003", "name": "Cetirizine", "company": "Dr. Reddy's",
+     "expiry_date": "soon", "is_authentic": True, "manufacturing_date": "2024-02-01"},
+    {"id": "4", "batch_code": "MED001", "name": "Duplicate", "company": "Cipla",
+     "expiry_date": "2027-01-01", "is_authentic": True, "manufacturing_date": "2024-01-01"}
+]
+
+CODES = ["MED001", " med001 ", "MED-002", "MED003", "MED404", "Ünknown"]
+
+
+def expected_response(code):
+    """The response the route used to build through MedicineVerifyResponse"""
+    key = code.strip().casefold()
+    medicine = next((m for m in MEDICINES if m['batch_code'].strip().casefold() == key), None)
+    if medicine is None:
+        return MedicineVerifyResponse(is_valid=False, code=code, message="Medicine not found in database")
+    try:
+        expiry_date = datetime.fromisoformat(medicine['expiry_date'])
+        expiry, expired = expiry_date.strftime("%b %Y"), TODAY > expiry_date.toordinal()
+    except ValueError:
+        expiry, expired = medicine['expiry_date'], None
+    return MedicineVerifyResponse(
+        is_valid=True,
+        code=code,
+        data={
+            "name": medicine['name'],
+            "company": medicine['company'],
+            "expiry": expiry,
+            "status": "Authentic" if medicine['is_authentic'] else "Suspicious",
+            "manufacturing_date": medicine['manufacturing_date'],
+            "expired": expired
+        }
+    )
+
+
+def rendered(response):
+    return JSONResponse(response.model_dump(mode="json")).body
+
+
+def test_payload_bytes_match_the_response_model():
+    payloads = VerifyPayloads(MEDICINES)
+    for code in CODES:
+        assert verify_response(code, payloads.find(code), TODAY) == rendered(expected_response(code))
+
+    prepared = payloads.find_many(CODES)
+    results = [verify_response(code, item, TODAY) for code, item in zip(CODES, prepared)]
+    expected = MedicineBatchVerifyResponse(
+        count=len(CODES),
+        valid_count=4,
+        results=[expected_response(code) for code in CODES]
+    )
+    assert batch_verify_response(results, 4) == rendered(expected)
+
+
+def test_payloads_can_share_the_store_index(tmp_path):
+    storage = JSONStorage(tmp_path, use_snapshots=False)
+    try:
+        storage.upsert_batches("medicines", [MEDICINES[:3]], lambda result: None)
+        medicines, index = storage.get_medicines_with_index()
+        shared = VerifyPayloads(medicines, index)
+        assert shared.index is index
+        own = VerifyPayloads(medicines)
+        assert shared.find_many(CODES) == own.find_many(CODES)
+        assert [shared.find(code) for code in CODES] == [own.find(code) for code in CODES]
+    finally:
+        storage.close()
+
+
+def test_unknown_codes_are_answered_by_the_filter(database, monkeypatch):
+    # Without the duplicate, which an upsert would apply as an update
+    database.storage.upsert_batches("medicines", [MEDICINES[:3]], lambda result: None)
+    monkeypatch.setattr(database_module, "today_ordinal", lambda: TODAY)
+    looked_up = []
+    find, find_many = VerifyPayloads.find, VerifyPayloads.find_many
+    monkeypatch.setattr(VerifyPayloads, "find", lambda self, code: looked_up.append(code) or find(self, code))
+    monkeypatch.setattr(
+        VerifyPayloads, "find_many", lambda self, codes: looked_up.extend(codes) or find_many(self, codes)
+    )
+
+    assert database.verify_batch_code("MED404") == (False, rendered(expected_response("MED404")))
+    assert looked_up == []
+    assert database.verify_batch_code("MED001") == (True, rendered(expected_response("MED001")))
+
+    looked_up.clear()
+    count, results = database.verify_batch_codes(CODES)
+    assert count == 4
+    assert results == [rendered(expected_response(code)) for code in CODES]
+    assert "MED404" not in looked_up
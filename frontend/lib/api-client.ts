@@ -9,6 +9,7 @@ interface MedicineData {
   name: string;
   company: string;
   expiry: string;
+  expired: boolean | null;
   status: string;
   manufacturing_date?: string;
 }
@@ -20,6 +21,24 @@ interface VerifyMedicineResponse {
   data?: MedicineData;
 }
 
+interface BatchVerifyResponse {
+  count: number;
+  valid_count: number;
+  results: VerifyMedicineResponse[];
+}
+
+interface MedicineSearchHit {
+  match: 'exact' | 'prefix' | 'fuzzy' | 'text';
+  distance?: number;
+  medicine: any;
+}
+
+interface MedicineSearchResponse {
+  query: string;
+  count: number;
+  results: MedicineSearchHit[];
+}
+
 interface PharmacyLocation {
   latitude: number;
   longitude: number;
@@ -37,6 +56,7 @@ interface Pharmacy {
 interface PharmacyListResponse {
   success: boolean;
   count: number;
+  total?: number;
   pharmacies: Pharmacy[];
 }
 
@@ -62,6 +82,17 @@ interface Report {
   updated_at: string;
 }
 
+interface ReportFilters {
+  status?: string;
+  batch_code?: string;
+}
+
+interface ReportStats {
+  total: number;
+  by_status: Record<string, number>;
+  top_batches: { batch_code: string; count: number }[];
+}
+
 class ApiClient {
   private baseURL: string;
 
@@ -102,6 +133,18 @@ class ApiClient {
     });
   }
 
+  async verifyMedicinesBatch(batchCodes: string[]): Promise<BatchVerifyResponse> {
+    return this.request<BatchVerifyResponse>('/medicines/verify/batch', {
+      method: 'POST',
+      body: JSON.stringify({ batch_codes: batchCodes }),
+    });
+  }
+
+  async searchMedicines(query: string, limit: number = 10): Promise<MedicineSearchResponse> {
+    const params = new URLSearchParams({ q: query, limit: limit.toString() });
+    return this.request<MedicineSearchResponse>(`/medicines/search?${params}`);
+  }
+
   async getAllMedicines(): Promise<any[]> {
     return this.request<any[]>('/medicines');
   }
@@ -114,10 +157,13 @@ class ApiClient {
   async getNearbyPharmacies(
     lat: number = 19.0760,
     lng: number = 72.8777,
-    radius: number = 10
+    radius: number = 10,
+    limit?: number,
+    offset: number = 0
   ): Promise<PharmacyListResponse> {
+    const paging = limit ? `&limit=${limit}&offset=${offset}` : '';
     return this.request<PharmacyListResponse>(
-      `/pharmacies/nearby?lat=${lat}&lng=${lng}&radius=${radius}`
+      `/pharmacies/nearby?lat=${lat}&lng=${lng}&radius=${radius}${paging}`
     );
   }
 
@@ -137,8 +183,16 @@ class ApiClient {
     });
   }
 
-  async getAllReports(): Promise<Report[]> {
-    return this.request<Report[]>('/reports');
+  async getAllReports(filters: ReportFilters = {}): Promise<Report[]> {
+    const params = new URLSearchParams();
+    if (filters.status) params.set('status', filters.status);
+    if (filters.batch_code) params.set('batch_code', filters.batch_code);
+    const query = params.toString();
+    return this.request<Report[]>(query ? `/reports?${query}` : '/reports');
+  }
+
+  async getReportStats(top: number = 10): Promise<ReportStats> {
+    return this.request<ReportStats>(`/reports/stats?top=${top}`);
   }
 
   async getReportById(reportId: string): Promise<Report> {